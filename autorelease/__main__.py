@@ -16,7 +16,10 @@ import argparse
 import os
 import sys
 
-from autorelease import tag, trigger
+from autorelease import common, reporter
+
+# The command modules import releasetool and google.auth, so each command
+# only imports the modules it runs.
 
 # TODO(busunkim): Fetch magictoken from KMS once KMS setup is complete.
 _KEYSTORE_GITHUB_TOKEN_LOCATION = "73713_yoshi-automation-github-key"
@@ -50,14 +53,95 @@ def main():
     parser.add_argument("--release", default=None)
     parser.add_argument("--lang", default=None)
     parser.add_argument("command")
+    parser.add_argument(
+        "reports",
+        nargs="*",
+        help="Shard reports to combine, for the merge-reports command.",
+    )
+    parser.add_argument(
+        "--http-cache-dir",
+        default=os.environ.get("AUTORELEASE_HTTP_CACHE_DIR"),
+        help="Directory for caching GitHub responses between runs.",
+    )
     parser.add_argument("--multi-scm-name")
+    parser.add_argument(
+        "--language-cache",
+        default=os.environ.get("AUTORELEASE_LANGUAGE_CACHE"),
+        help="JSON file for caching repository languages between runs.",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=os.environ.get("AUTORELEASE_STATE_FILE"),
+        help="JSON file recording scan progress, for incremental runs.",
+    )
+    parser.add_argument(
+        "--refresh-language-cache",
+        action="store_true",
+        help="Ignore cached repository languages and fetch them again.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Number of pull requests to process concurrently. The tag command "
+            "still processes pull requests for the same repository serially."
+        ),
+    )
+    parser.add_argument(
+        "--shard",
+        type=common.Shard.parse,
+        default=os.environ.get("AUTORELEASE_SHARD"),
+        help=(
+            "Only process repositories in this shard, written as index/count, "
+            "such as 0/4. Combine the shard reports with merge-reports."
+        ),
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=None,
+        help="For the serve command, accept GitHub webhooks on this port.",
+    )
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument(
+        "--webhook-secret",
+        default=os.environ.get("AUTORELEASE_WEBHOOK_SECRET"),
+        help="Secret that webhook deliveries must be signed with. Required with "
+        "--port.",
+    )
+    parser.add_argument(
+        "--event-file",
+        help="For the serve command, JSON lines file to read events from.",
+    )
+    parser.add_argument(
+        "--reconcile-interval",
+        type=float,
+        default=3600.0,
+        help="Seconds between full scans in the serve command.",
+    )
 
     args = parser.parse_args()
+    if args.reports and args.command != "merge-reports":
+        parser.error(f"unrecognized arguments: {' '.join(args.reports)}")
 
     args.github_token = _determine_github_token(args.github_token)
+    language_cache = common.LanguageCache(
+        args.language_cache, refresh=args.refresh_language_cache
+    )
 
     if args.command == "tag":
-        report = tag.main(args.github_token, args.kokoro_credentials)
+        from autorelease import tag
+
+        report = tag.main(
+            args.github_token,
+            args.kokoro_credentials,
+            workers=args.workers,
+            cache_dir=args.http_cache_dir,
+            language_cache=language_cache,
+            state_file=args.state_file,
+            shard=args.shard,
+        )
 
         if args.report:
             report.write(args.report)
@@ -67,7 +151,17 @@ def main():
         else:
             return
     elif args.command == "trigger":
-        report = trigger.main(args.github_token, args.kokoro_credentials)
+        from autorelease import trigger
+
+        report = trigger.main(
+            args.github_token,
+            args.kokoro_credentials,
+            workers=args.workers,
+            cache_dir=args.http_cache_dir,
+            language_cache=language_cache,
+            state_file=args.state_file,
+            shard=args.shard,
+        )
 
         if args.report:
             report.write(args.report)
@@ -77,6 +171,8 @@ def main():
         else:
             return
     elif args.command == "trigger-single":
+        from autorelease import trigger
+
         if args.release:
             if not args.lang:
                 raise Exception("missing required arg --lang")
@@ -86,6 +182,7 @@ def main():
                 args.release,
                 trigger.to_pysafe_language_name(args.lang),
                 args.multi_scm_name,
+                cache_dir=args.http_cache_dir,
             )
         if not args.pull:
             raise Exception("missing required arg --pull")
@@ -95,11 +192,48 @@ def main():
                 args.kokoro_credentials,
                 args.pull,
                 multi_scm_name=args.multi_scm_name,
+                cache_dir=args.http_cache_dir,
+                language_cache=language_cache,
             )
 
         if args.report:
             report.write(args.report)
 
+        if report.failures:
+            sys.exit(2)
+        else:
+            return
+    elif args.command == "serve":
+        from autorelease import daemon
+
+        if args.port is None and not args.event_file:
+            raise Exception("missing required arg --port or --event-file")
+        if args.port is not None and not args.webhook_secret:
+            raise Exception("--port requires --webhook-secret")
+        service = daemon.Daemon(
+            args.github_token,
+            args.kokoro_credentials,
+            reconcile_interval=args.reconcile_interval,
+            cache_dir=args.http_cache_dir,
+            language_cache=language_cache,
+            state_file=args.state_file,
+            report_dir=args.report,
+        )
+        daemon.serve(
+            service,
+            host=args.host,
+            port=args.port,
+            secret=args.webhook_secret,
+            event_file=args.event_file,
+        )
+    elif args.command == "merge-reports":
+        if not args.report:
+            raise Exception("missing required arg --report")
+        shard_reports = [reporter.Reporter.load(path) for path in args.reports]
+        name = shard_reports[0].name if shard_reports else "autorelease"
+        report = reporter.Reporter.merge(name, shard_reports)
+        report.write(args.report)
+
         if report.failures:
             sys.exit(2)
         else:
@@ -12,12 +12,22 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import json
+import os
 import re
+import tempfile
+import threading
+import time
 
-from typing import Dict, Any, Callable
+from typing import Dict, Any, Callable, List, Optional
+from autorelease import reporter
 from autorelease.github import GitHub
 
+# Repository languages almost never change, so persisted entries are reused
+# for a week before asking GitHub again.
+_LANGUAGE_CACHE_TTL: int = 7 * 24 * 60 * 60
+
 
 def _determine_language(
     fetch_repos_json: Callable[[], str], repo_full_name: str
@@ -58,7 +68,75 @@ _SILVER_LANGUAGE_NAMES = {
 }
 
 
-def guess_language(gh: GitHub, repo_full_name: str) -> str:
+class LanguageCache:
+    """Remembers GitHub's language breakdown of repositories.
+
+    Entries are memoized for the life of the process and, when a path is
+    given, persisted to a JSON file so that later runs can reuse them until
+    they are older than `ttl` seconds. With `refresh`, persisted entries are
+    ignored and replaced.
+    """
+
+    def __init__(
+        self, path: str = None, ttl: int = _LANGUAGE_CACHE_TTL, refresh: bool = False
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memo: Dict[str, Dict[str, int]] = {}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+        if path and not refresh and os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as fh:
+                    self._entries = json.load(fh)
+            except ValueError:
+                # A corrupt cache is just a cold cache.
+                self._entries = {}
+
+    def _lookup(self, repo_full_name: str) -> Optional[Dict[str, int]]:
+        with self._lock:
+            if repo_full_name in self._memo:
+                return self._memo[repo_full_name]
+
+            entry = self._entries.get(repo_full_name)
+            if entry and entry["fetched_at"] + self.ttl > time.time():
+                self._memo[repo_full_name] = entry["languages"]
+                return entry["languages"]
+
+        return None
+
+    def get_languages(self, gh: GitHub, repo_full_name: str) -> Dict[str, int]:
+        languages = self._lookup(repo_full_name)
+        if languages is not None:
+            return languages
+
+        languages = gh.get_languages(repo_full_name)
+        with self._lock:
+            self._memo[repo_full_name] = languages
+            self._entries[repo_full_name] = {
+                "languages": languages,
+                "fetched_at": time.time(),
+            }
+        return languages
+
+    def save(self) -> None:
+        """Writes the cache to its path, if it has one."""
+        if not self.path:
+            return
+
+        with self._lock:
+            contents = json.dumps(self._entries, indent=2, sort_keys=True)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as fh:
+            fh.write(contents)
+        os.replace(temp_path, self.path)
+
+
+def guess_language(gh: GitHub, repo_full_name: str, cache: LanguageCache = None) -> str:
     special_cases = {
         # 1 special case inherited from the original determine_language() code.
         "googleapis/synthtool": "python_tool",
@@ -95,7 +173,10 @@ def guess_language(gh: GitHub, repo_full_name: str) -> str:
         return x.pop()  # Found the language name in the repo name
 
     # Fetch how many lines of each language are found in the repo.
-    languages = gh.get_languages(repo_full_name)
+    if cache:
+        languages = cache.get_languages(gh, repo_full_name)
+    else:
+        languages = gh.get_languages(repo_full_name)
     ranks = [
         (count, lang)
         for (lang, count) in languages.items()
@@ -108,3 +189,74 @@ def guess_language(gh: GitHub, repo_full_name: str) -> str:
         return _SILVER_LANGUAGE_NAMES[ranks[0][1]]
     else:
         raise Exception("Unable to determine repository language.")
+
+
+def load_pulls(
+    gh: GitHub, issues: List[dict], result: reporter.Result
+) -> Dict[str, dict]:
+    """Bulk loads the pull requests behind the given issues.
+
+    Returns a map of pull request API url to pull request. Failures are
+    printed to the result but are not fatal, since each pull request can
+    still be fetched on its own.
+    """
+    urls = [issue["pull_request"].get("url") for issue in issues]
+    urls = [url for url in urls if url]
+    if not urls:
+        return {}
+
+    try:
+        return gh.get_pulls(urls)
+    except Exception as exc:
+        result.print(f"Unable to bulk load pull requests: {exc!r}")
+        return {}
+
+
+def get_pull(gh: GitHub, issue: dict, pulls: Dict[str, dict] = None) -> dict:
+    """Returns the pull request for an issue, preferring a bulk loaded copy."""
+    url = issue["pull_request"]["url"]
+    if pulls and url in pulls:
+        return pulls[url]
+    return gh.get_url(url)
+
+
+def issue_repository(issue: dict) -> str:
+    """Returns the `owner/repo` a pull request issue belongs to."""
+    match = re.match(r".*github.com/([^/]+/[^/]+)", issue["pull_request"]["html_url"])
+    if match:
+        return match[1]
+    return issue["pull_request"]["html_url"]
+
+
+class Shard:
+    """One of `count` disjoint slices of the pull requests found by a scan.
+
+    Pull requests are assigned by a stable hash of their repository's full
+    name, so every process agrees on the split without coordinating, and all
+    pull requests for a repository land in the same shard.
+    """
+
+    def __init__(self, index: int, count: int) -> None:
+        if count < 1 or not 0 <= index < count:
+            raise ValueError(f"Invalid shard {index}/{count}.")
+        self.index = index
+        self.count = count
+
+    @classmethod
+    def parse(cls, spec: str) -> "Shard":
+        """Parses a shard written as `index/count`, such as `0/4`."""
+        match = re.match(r"^(\d+)/(\d+)$", spec.strip())
+        if not match:
+            raise ValueError(f"Invalid shard {spec!r}, expected index/count.")
+        return cls(int(match[1]), int(match[2]))
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    def includes(self, repo_full_name: str) -> bool:
+        digest = hashlib.sha1(repo_full_name.lower().encode("utf-8")).digest()
+        return int.from_bytes(digest[:8], "big") % self.count == self.index
+
+    def select(self, issues: List[dict]) -> List[dict]:
+        """Returns the issues that belong to this shard, keeping their order."""
+        return [issue for issue in issues if self.includes(issue_repository(issue))]
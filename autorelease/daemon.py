@@ -0,0 +1,317 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module runs autorelease as a long-running service.
+
+Instead of scanning the organizations from scratch on every run, the service
+keeps its GitHub client and Kokoro session warm and processes pull request
+events as they arrive, either as GitHub webhook deliveries to a local HTTP
+endpoint or as lines appended to a JSON queue file. Full tag and trigger
+scans still run periodically, to catch anything the events missed.
+"""
+
+import hashlib
+import hmac
+import http.server
+import json
+import os
+import queue
+import re
+import threading
+import time
+from typing import Optional
+
+from autorelease import common, github, kokoro, reporter, tag, trigger
+
+_PENDING_LABEL = "autorelease: pending"
+_TAGGED_LABEL = "autorelease: tagged"
+
+# Marks a reconciliation scan in the event queue.
+_RECONCILE = object()
+
+_REPOSITORY = re.compile(r"^[\w.-]+/[\w.-]+$")
+
+
+def _issue_from_pull(pull: dict) -> dict:
+    """Builds the search API issue for a pull request from a webhook payload."""
+    return {
+        "title": pull["title"],
+        "number": pull["number"],
+        "closed_at": pull.get("closed_at"),
+        "pull_request": {"url": pull["url"], "html_url": pull["html_url"]},
+    }
+
+
+class Daemon:
+    """Processes pull request events one at a time, with periodic full scans.
+
+    Events and scans all run on the thread that calls `run`, so a repository's
+    releases are never tagged concurrently.
+    """
+
+    def __init__(
+        self,
+        github_token: str,
+        kokoro_credentials: str,
+        reconcile_interval: float = 3600.0,
+        cache_dir: str = None,
+        language_cache: common.LanguageCache = None,
+        state_file: str = None,
+        report_dir: str = None,
+    ) -> None:
+        self.github_token = github_token
+        self.kokoro_credentials = kokoro_credentials
+        self.reconcile_interval = reconcile_interval
+        self.language_cache = language_cache or common.LanguageCache()
+        self.state_file = state_file
+        self.report_dir = report_dir
+        # TODO(busunkim): Use proxy once KMS setup is complete.
+        self.gh = github.GitHub(github_token, use_proxy=False, cache_dir=cache_dir)
+        if kokoro_credentials:
+            self.kokoro_session = kokoro.make_authorized_session(kokoro_credentials)
+        else:
+            self.kokoro_session = kokoro.make_adc_session()
+        self._queue: queue.Queue = queue.Queue()
+        self._stopped = threading.Event()
+
+    def submit(self, event: str, payload: dict) -> None:
+        """Queues a GitHub webhook event, such as `pull_request`."""
+        self._queue.put((event, payload))
+
+    def request_reconcile(self) -> None:
+        """Queues a full tag and trigger scan."""
+        self._queue.put(_RECONCILE)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._queue.put(None)
+
+    def handle_event(self, event: str, payload: dict) -> Optional[reporter.Result]:
+        """Processes one event, returning its result if it was acted on.
+
+        The payload only decides whether an event is worth looking at. The
+        pull request itself is fetched from GitHub, so a forged payload can't
+        get anything tagged or released.
+        """
+        if event != "pull_request":
+            return None
+
+        action = payload.get("action")
+        if action == "labeled":
+            added = (payload.get("label") or {}).get("name")
+            if added not in (_PENDING_LABEL, _TAGGED_LABEL):
+                return None
+        elif action != "closed":
+            return None
+
+        event_pull = payload.get("pull_request") or {}
+        repository = ((event_pull.get("base") or {}).get("repo") or {}).get(
+            "full_name", ""
+        )
+        number = event_pull.get("number")
+        if not _REPOSITORY.match(repository) or not isinstance(number, int):
+            return None
+        # The url is built rather than taken from the payload, so the GitHub
+        # token is never sent anywhere but GitHub.
+        url = f"{self.gh.GITHUB_ROOT}/repos/{repository}/pulls/{number}"
+        pull = self.gh.get_url(url)
+
+        if pull.get("state") != "closed" or not pull.get("merged_at"):
+            return None
+
+        owner = pull["base"]["repo"]["owner"]["login"]
+        labels = [label["name"] for label in pull.get("labels", [])]
+        issue = _issue_from_pull(pull)
+        pulls = {pull["url"]: pull}
+        result = reporter.Result(pull["title"])
+
+        if _PENDING_LABEL in labels and owner in tag.ORGANIZATIONS_TO_SCAN:
+            tag.process_issue_and_record(
+                self.kokoro_session,
+                self.gh,
+                issue,
+                result,
+                language_cache=self.language_cache,
+                pulls=pulls,
+            )
+        elif _TAGGED_LABEL in labels and owner in trigger.ORGANIZATIONS_TO_SCAN:
+            trigger.process_pull_request(
+                self.kokoro_session,
+                self.gh,
+                issue,
+                result,
+                language_cache=self.language_cache,
+                pulls=pulls,
+            )
+        else:
+            return None
+
+        self.language_cache.save()
+        return result
+
+    def reconcile(self) -> None:
+        """Runs the regular tag and trigger scans with the warm clients."""
+        for name, module in [("tag", tag), ("trigger", trigger)]:
+            report = module.main(
+                self.github_token,
+                self.kokoro_credentials,
+                language_cache=self.language_cache,
+                state_file=self.state_file,
+                gh=self.gh,
+                kokoro_session=self.kokoro_session,
+            )
+            if self.report_dir:
+                os.makedirs(self.report_dir, exist_ok=True)
+                report.write(os.path.join(self.report_dir, f"{name}.xml"))
+
+    def run(self) -> None:
+        """Processes events until `stop` is called."""
+        next_reconcile = time.monotonic()
+        while not self._stopped.is_set():
+            timeout = next_reconcile - time.monotonic()
+            if timeout <= 0:
+                # Don't let a steady stream of events postpone the scan.
+                item = _RECONCILE
+            else:
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    continue
+
+            if item is None:
+                continue
+
+            try:
+                if item is _RECONCILE:
+                    self.reconcile()
+                    next_reconcile = time.monotonic() + self.reconcile_interval
+                else:
+                    self.handle_event(*item)
+            # A bad event must not take the service down.
+            except Exception as exc:
+                print(f"Error processing event: {exc!r}")
+
+
+class _WebhookHandler(http.server.BaseHTTPRequestHandler):
+    server: "WebhookServer"
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+
+        expected = "sha256=" + (
+            hmac.new(
+                self.server.secret.encode("utf-8"), body, hashlib.sha256
+            ).hexdigest()
+        )
+        signature = self.headers.get("X-Hub-Signature-256", "")
+        if not hmac.compare_digest(expected, signature):
+            self.send_error(401, "Bad signature")
+            return
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self.send_error(400, "Expected a JSON payload")
+            return
+
+        self.server.daemon.submit(self.headers.get("X-GitHub-Event", ""), payload)
+        self.send_response(202)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class WebhookServer(http.server.ThreadingHTTPServer):
+    """Accepts GitHub webhook deliveries and queues them on a Daemon.
+
+    Deliveries must be signed with the secret, otherwise anyone who can reach
+    the port could have releases made.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, daemon: Daemon, host: str = "localhost", port: int = 8080, secret=None
+    ) -> None:
+        if not secret:
+            raise ValueError("A webhook secret is required to accept webhooks.")
+        super().__init__((host, port), _WebhookHandler)
+        self.daemon = daemon
+        self.secret = secret
+
+
+def follow_event_file(daemon: Daemon, path: str, poll_interval: float = 1.0) -> None:
+    """Queues the events appended to a file until the daemon stops.
+
+    Each line is a JSON object like `{"event": "pull_request", "payload": {}}`.
+    Lines already in the file when the daemon starts are processed too.
+    """
+    offset = 0
+    partial = b""
+    while not daemon._stopped.is_set():
+        if os.path.exists(path):
+            with open(path, "rb") as fh:
+                if os.fstat(fh.fileno()).st_size < offset:
+                    # The file was truncated or replaced, start over.
+                    offset = 0
+                    partial = b""
+                fh.seek(offset)
+                data = fh.read()
+                offset = fh.tell()
+
+            lines = (partial + data).split(b"\n")
+            partial = lines.pop()
+            for line in lines:
+                if not line.strip():
+                    continue
+                try:
+                    item = json.loads(line)
+                    daemon.submit(item["event"], item["payload"])
+                except (ValueError, KeyError) as exc:
+                    print(f"Ignoring malformed event: {exc!r}")
+
+        daemon._stopped.wait(poll_interval)
+
+
+def serve(
+    daemon: Daemon,
+    host: str = "localhost",
+    port: int = None,
+    secret: str = None,
+    event_file: str = None,
+) -> None:
+    """Runs the daemon with the requested event sources until interrupted."""
+    threads = []
+    server = None
+    if port is not None:
+        server = WebhookServer(daemon, host, port, secret)
+        threads.append(threading.Thread(target=server.serve_forever, daemon=True))
+    if event_file:
+        threads.append(
+            threading.Thread(
+                target=follow_event_file, args=(daemon, event_file), daemon=True
+            )
+        )
+
+    for thread in threads:
+        thread.start()
+    try:
+        daemon.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        daemon.stop()
+        if server:
+            server.shutdown()
+            server.server_close()
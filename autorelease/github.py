@@ -13,13 +13,18 @@
 # limitations under the License.
 
 import base64
+import concurrent.futures
+import json
 import logging
 import os
-from typing import Dict, List, Sequence, Generator
+import re
+from typing import Callable, Dict, List, Optional, Sequence, Generator
 
 import requests
 from urllib3.util.retry import Retry
-from urllib.parse import quote
+from urllib.parse import parse_qs, quote, urlencode, urlparse
+
+from releasetool import http_cache, rate_limit
 
 _GITHUB_ROOT: str = "https://api.github.com"
 _MAGIC_GITHUB_PROXY_ROOT: str = (
@@ -27,6 +32,81 @@ _MAGIC_GITHUB_PROXY_ROOT: str = (
 )
 
 
+# GraphQL allows up to 100 aliased pull request lookups per query.
+_GRAPHQL_PULLS_PER_QUERY: int = 100
+
+_GRAPHQL_PULL_FIELDS: str = """
+fragment PullFields on PullRequest {
+  number
+  title
+  body
+  url
+  mergedAt
+  mergeCommit { oid }
+  headRefName
+  baseRefName
+  labels(first: 100) { nodes { name } }
+  baseRepository { name nameWithOwner owner { login } }
+}
+"""
+
+
+def _pull_from_graphql(api_url: str, node: dict) -> dict:
+    """Reshapes a GraphQL pull request into the REST representation."""
+    repository = node["baseRepository"]
+    return {
+        "url": api_url,
+        "html_url": node["url"],
+        "number": node["number"],
+        "title": node["title"],
+        "body": node["body"],
+        "merged_at": node["mergedAt"],
+        "merge_commit_sha": (node["mergeCommit"] or {}).get("oid"),
+        "labels": [{"name": label["name"]} for label in node["labels"]["nodes"]],
+        "head": {"ref": node["headRefName"]},
+        "base": {
+            "ref": node["baseRefName"],
+            "repo": {
+                "name": repository["name"],
+                "full_name": repository["nameWithOwner"],
+                "owner": {"login": repository["owner"]["login"]},
+            },
+        },
+    }
+
+
+def _page_number(url: str) -> Optional[int]:
+    try:
+        return int(parse_qs(urlparse(url).query)["page"][0])
+    except (KeyError, ValueError):
+        return None
+
+
+def _page_url(url: str, page: int) -> str:
+    """Returns `url` with its page query parameter replaced."""
+    parsed = urlparse(url)
+    query = parse_qs(parsed.query, keep_blank_values=True)
+    query["page"] = [str(page)]
+    return parsed._replace(query=urlencode(query, doseq=True)).geturl()
+
+
+def _last_page(response: requests.Response, items: list) -> Optional[int]:
+    """Works out how many pages a listing has from its first page.
+
+    GitHub links to the last page when there is more than one. Search
+    results also carry `total_count`, which is used if that link is missing.
+    """
+    last_url = response.links.get("last", {}).get("url")
+    if last_url:
+        return _page_number(last_url)
+
+    body = response.json()
+    if isinstance(body, dict) and "total_count" in body and items:
+        return -(-body["total_count"] // len(items))
+
+    return None
+
+
 def _find_devrel_api_key() -> str:
     paths: List[str] = []
     magic_github_proxy_key: str = ""
@@ -57,8 +137,16 @@ def _find_devrel_api_key() -> str:
 
 
 class GitHub:
-    def __init__(self, token: str, use_proxy: bool = False) -> None:
+    def __init__(
+        self,
+        token: str,
+        use_proxy: bool = False,
+        cache_dir: str = None,
+        prefetch_pages: int = 4,
+    ) -> None:
         self.token: str = token
+        self.cache_dir = cache_dir
+        self.prefetch_pages = prefetch_pages
         self.session: requests.Session = requests.Session()
         self.GITHUB_ROOT = _GITHUB_ROOT
         self.session.headers.update(
@@ -73,24 +161,144 @@ class GitHub:
             # To use the proxy, we need an api key for the magic github proxy.
             self.session.params = {"key": _find_devrel_api_key()}
 
+        self.rate_limiter = rate_limit.for_token(token)
+        self._cache = None
+        if cache_dir:
+            self._cache = http_cache.HttpCache(cache_dir)
+        self.session.mount("https://", self._make_adapter())
+
+    def _make_adapter(self, **kwargs) -> requests.adapters.BaseAdapter:
+        """Returns a rate limited transport adapter, consulting the HTTP cache
+        if enabled."""
+        adapter = rate_limit.RateLimitAdapter(
+            self.rate_limiter, requests.adapters.HTTPAdapter(**kwargs)
+        )
+        if self._cache:
+            return http_cache.CachingAdapter(self._cache, adapter)
+        return adapter
+
     def get_url(self, url: str = None, **kwargs) -> dict:
         response = self.session.get(url, **kwargs)
         response.raise_for_status()
         return response.json()
 
-    def list_org_repos(self, org: str, type: str = None) -> Generator[dict, None, None]:
-        url = f"{self.GITHUB_ROOT}/orgs/{org}/repos"
+    def get_pulls(self, urls: Sequence[str]) -> Dict[str, dict]:
+        """Fetches many pull requests with as few GraphQL queries as possible.
 
-        while url:
-            response = self.session.get(url, params={"type": type})
+        Args:
+            urls {Sequence[str]}: REST API urls of pull requests, like
+                https://api.github.com/repos/[owner]/[repo]/pulls/[number]
+
+        Returns:
+            Dict[str, dict]: Map of url to a pull request shaped like the REST
+                API response. Pull requests that could not be loaded, or urls
+                that could not be parsed, are left out.
+        """
+        lookups = []
+        for url in urls:
+            match = re.match(r".*/repos/([^/]+)/([^/]+)/pulls/(\d+)$", url)
+            if match:
+                lookups.append((url, match[1], match[2], int(match[3])))
+
+        pulls: Dict[str, dict] = {}
+        for start in range(0, len(lookups), _GRAPHQL_PULLS_PER_QUERY):
+            end = start + _GRAPHQL_PULLS_PER_QUERY
+            chunk = lookups[start:end]
+            aliases = [
+                f"pr{index}: repository(owner: {json.dumps(owner)}, "
+                f"name: {json.dumps(repo)}) "
+                f"{{ pullRequest(number: {number}) {{ ...PullFields }} }}"
+                for index, (_, owner, repo, number) in enumerate(chunk)
+            ]
+            query = "query {\n" + "\n".join(aliases) + "\n}\n" + _GRAPHQL_PULL_FIELDS
+
+            response = self.session.post(
+                f"{self.GITHUB_ROOT}/graphql", json={"query": query}
+            )
             response.raise_for_status()
-            for item in response.json():
-                yield item
+            # Errors for individual pull requests come back next to partial data.
+            data = response.json().get("data") or {}
 
+            for index, (url, _, _, _) in enumerate(chunk):
+                node = (data.get(f"pr{index}") or {}).get("pullRequest")
+                if node:
+                    pulls[url] = _pull_from_graphql(url, node)
+
+        return pulls
+
+    def _paginate(
+        self,
+        url: str,
+        get_items: Callable[[requests.Response], list],
+        params: dict = None,
+    ) -> Generator[dict, None, None]:
+        """Yields the items of every page of a listing, in order.
+
+        Once the first page tells how many pages there are, up to
+        `prefetch_pages` of the following pages are requested concurrently.
+        Listings that don't say are followed one `next` link at a time.
+        """
+
+        def get_page(page_url: str) -> requests.Response:
+            response = self.session.get(page_url, params=params)
+            response.raise_for_status()
+            if response.status_code >= 400:
+                logging.error(response.text)
+            return response
+
+        response = get_page(url)
+        items = get_items(response)
+        yield from items
+
+        next_url = response.links.get("next", {}).get("url")
+        last_page = _last_page(response, items) if next_url else None
+        next_page = _page_number(next_url) if next_url else None
+
+        if self.prefetch_pages > 1 and last_page and next_page:
+            page_urls = [
+                _page_url(next_url, page) for page in range(next_page, last_page + 1)
+            ]
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.prefetch_pages,
+                thread_name_prefix="autorelease-pages",
+            ) as executor:
+                prefetch = self.prefetch_pages
+                pending = [
+                    executor.submit(get_page, page_url)
+                    for page_url in page_urls[:prefetch]
+                ]
+                queued = page_urls[prefetch:]
+                try:
+                    while pending:
+                        response = pending.pop(0).result()
+                        if queued:
+                            pending.append(executor.submit(get_page, queued.pop(0)))
+                        yield from get_items(response)
+                finally:
+                    # Don't fetch the rest if the caller stops early.
+                    for future in pending:
+                        future.cancel()
+            return
+
+        url = next_url
+        while url:
+            response = get_page(url)
+            yield from get_items(response)
             url = response.links.get("next", {}).get("url")
 
+    def list_org_repos(self, org: str, type: str = None) -> Generator[dict, None, None]:
+        url = f"{self.GITHUB_ROOT}/orgs/{org}/repos"
+        yield from self._paginate(
+            url, lambda response: response.json(), params={"type": type}
+        )
+
     def list_org_issues(
-        self, org: str, state: str = None, labels: str = None, created_after: str = None
+        self,
+        org: str,
+        state: str = None,
+        labels: str = None,
+        created_after: str = None,
+        updated_after: str = None,
     ) -> Generator[dict, None, None]:
         url = f"{self.GITHUB_ROOT}/search/issues?q=org:{quote(org)}+state:{quote(state)}+archived:false"
         if labels:
@@ -99,22 +307,16 @@ class GitHub:
             url += f"+label:{quote(quotedLabels)}"
         if created_after:
             url += f"+created:>{created_after}"
+        if updated_after:
+            url += f"+updated:>{updated_after}"
         print(url)
         # GitHub sometimes returns 5xx errors for this request.
         # Retry after 500, 502 response up to 4 times.
         max_retries = Retry(status=4, status_forcelist=[500, 502])
-        adapter = requests.adapters.HTTPAdapter(max_retries=max_retries)
+        adapter = self._make_adapter(max_retries=max_retries)
         self.session.mount(url, adapter)
 
-        while url:
-            response = self.session.get(url)
-            response.raise_for_status()
-            if response.status_code >= 400:
-                logging.error(response.text)
-            for item in response.json()["items"]:
-                yield item
-
-            url = response.links.get("next", {}).get("url")
+        yield from self._paginate(url, lambda response: response.json()["items"])
 
     def list_pull_requests(self, repository: str, **kwargs) -> Sequence[Dict]:
         url = f"{self.GITHUB_ROOT}/repos/{repository}/pulls"
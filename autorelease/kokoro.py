@@ -15,26 +15,39 @@
 """This module talks to Kokoro via Pub/Sub messages to devrel-prod.googleplex.com."""
 
 import base64
+import concurrent.futures
+import threading
+import time
+from typing import List, Optional, Tuple, TYPE_CHECKING
 
-from google.auth.transport import requests
-from google.oauth2 import service_account
-import google.auth
+# google.auth and the generated Kokoro protos are slow to import, so they are
+# only imported by the functions that need them.
+if TYPE_CHECKING:
+    from google.auth.transport import requests
 
-from protos import kokoro_api_pb2
 
+_PUBSUB_ROOT = "https://pubsub.googleapis.com/v1"
 
 _DEVREL_PROD_KOKORO_TOPIC = (
     "projects/google.com:devrel-library-tracker-prod/topics/kokoro"
 )
 
+# Pub/Sub accepts at most 1000 messages and 10MB per publish request.
+_MAX_BATCH_MESSAGES = 1000
+_MAX_BATCH_BYTES = 9 * 1024 * 1024
 
-def _send_pubsub_message(
-    session: requests.AuthorizedSession, topic: str, data: str
-) -> dict:
-    url = f"https://pubsub.googleapis.com/v1/{topic}:publish"
+
+def _encode_pubsub_message(data: str) -> dict:
     encoded_data = base64.b64encode(data.encode("utf-8"))
+    return {"data": encoded_data.decode("utf-8")}
+
+
+def _send_pubsub_messages(
+    session: "requests.AuthorizedSession", topic: str, messages: List[dict]
+):
+    url = f"{_PUBSUB_ROOT}/{topic}:publish"
 
-    publish_request = {"messages": [{"data": encoded_data.decode("utf-8")}]}
+    publish_request = {"messages": messages}
 
     resp = session.post(url, json=publish_request)
     resp.raise_for_status()
@@ -42,9 +55,105 @@ def _send_pubsub_message(
     return resp
 
 
+def _send_pubsub_message(
+    session: "requests.AuthorizedSession", topic: str, data: str
+) -> dict:
+    return _send_pubsub_messages(session, topic, [_encode_pubsub_message(data)])
+
+
+class BatchPublisher:
+    """Collects Pub/Sub messages and publishes them in bulk.
+
+    A batch is sent once it reaches `max_messages` messages or `max_bytes` of
+    encoded data, or when a message is published more than `max_latency`
+    seconds after the first message of the batch. Call `flush` to send
+    whatever is left.
+
+    `publish` returns a future for each message. It resolves to the Pub/Sub
+    message id, or to the exception that failed its batch.
+    """
+
+    def __init__(
+        self,
+        session: "requests.AuthorizedSession",
+        topic: str = _DEVREL_PROD_KOKORO_TOPIC,
+        max_messages: int = _MAX_BATCH_MESSAGES,
+        max_bytes: int = _MAX_BATCH_BYTES,
+        max_latency: float = 1.0,
+    ) -> None:
+        self.session = session
+        self.topic = topic
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.max_latency = max_latency
+        self._lock = threading.Lock()
+        self._batch: List[Tuple[dict, concurrent.futures.Future]] = []
+        self._batch_bytes = 0
+        self._batch_started: Optional[float] = None
+
+    def publish(self, data: str) -> concurrent.futures.Future:
+        message = _encode_pubsub_message(data)
+        size = len(message["data"])
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        with self._lock:
+            if self._batch and self._batch_bytes + size > self.max_bytes:
+                full_batch = self._take_batch()
+            else:
+                full_batch = []
+
+            if not self._batch:
+                self._batch_started = time.monotonic()
+            self._batch.append((message, future))
+            self._batch_bytes += size
+
+            if (
+                len(self._batch) >= self.max_messages
+                or time.monotonic() - self._batch_started >= self.max_latency
+            ):
+                ready_batch = self._take_batch()
+            else:
+                ready_batch = []
+
+        self._send(full_batch)
+        self._send(ready_batch)
+        return future
+
+    def flush(self) -> None:
+        with self._lock:
+            batch = self._take_batch()
+        self._send(batch)
+
+    def _take_batch(self) -> List[Tuple[dict, concurrent.futures.Future]]:
+        batch = self._batch
+        self._batch = []
+        self._batch_bytes = 0
+        self._batch_started = None
+        return batch
+
+    def _send(self, batch: List[Tuple[dict, concurrent.futures.Future]]) -> None:
+        if not batch:
+            return
+
+        try:
+            resp = _send_pubsub_messages(
+                self.session, self.topic, [message for message, _ in batch]
+            )
+            message_ids = resp.json().get("messageIds", [])
+        except Exception as exc:
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+
+        for index, (_, future) in enumerate(batch):
+            future.set_result(message_ids[index] if index < len(message_ids) else None)
+
+
 def _make_build_request(
     job_name: str, sha: str, env_vars: dict = None, multi_scm_name: str = ""
 ) -> str:
+    from protos import kokoro_api_pb2
+
     request = kokoro_api_pb2.BuildRequest(
         full_job_name=job_name,
     )
@@ -67,7 +176,7 @@ def _make_build_request(
     return str(request)
 
 
-def make_authorized_session(credentials_file: str) -> requests.AuthorizedSession:
+def make_authorized_session(credentials_file: str) -> "requests.AuthorizedSession":
     """Create a scoped, authorized requests session using a service account
 
     Args:
@@ -76,6 +185,9 @@ def make_authorized_session(credentials_file: str) -> requests.AuthorizedSession
     Returns:
         requests.AuthorizedSession: The authorized requests session
     """
+    from google.auth.transport import requests
+    from google.oauth2 import service_account
+
     credentials = service_account.Credentials.from_service_account_file(
         credentials_file, scopes=["https://www.googleapis.com/auth/pubsub"]
     )
@@ -83,7 +195,7 @@ def make_authorized_session(credentials_file: str) -> requests.AuthorizedSession
     return session
 
 
-def make_adc_session() -> requests.AuthorizedSession:
+def make_adc_session() -> "requests.AuthorizedSession":
     """Create a scoped, authorized requests session using ADC
 
     Returns:
@@ -92,6 +204,9 @@ def make_adc_session() -> requests.AuthorizedSession:
     Raises:
         DefaultCredentialsError if no credentials found
     """
+    import google.auth
+    from google.auth.transport import requests
+
     credentials, _ = google.auth.default(
         scopes=["https://www.googleapis.com/auth/pubsub"]
     )
@@ -100,13 +215,23 @@ def make_adc_session() -> requests.AuthorizedSession:
 
 
 def trigger_build(
-    session: requests.AuthorizedSession,
+    session: "requests.AuthorizedSession",
     job_name: str,
     sha: str,
     env_vars: dict = None,
     multi_scm_name: str = "",
-):
+    publisher: BatchPublisher = None,
+) -> Optional[concurrent.futures.Future]:
+    """Requests a Kokoro build.
+
+    If a publisher is given, the build request is queued on it and a future
+    for its publication is returned. Otherwise it is sent immediately.
+    """
     build_request = _make_build_request(
         job_name, sha, env_vars=env_vars, multi_scm_name=multi_scm_name
     )
+    if publisher:
+        return publisher.publish(build_request)
+
     _send_pubsub_message(session, _DEVREL_PROD_KOKORO_TOPIC, build_request)
+    return None
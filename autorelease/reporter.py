@@ -15,14 +15,23 @@
 """This module is used for reporting status via junit XML files that can be
 consumed by Kokoro/Sponge."""
 
+import functools
 import io
 import os
+import xml.etree.ElementTree as ElementTree
 
 import attr
-import jinja2
 
-with open(os.path.join(os.path.dirname(__file__), "report.xml.j2"), "r") as fh:
-    _TEMPLATE = jinja2.Template(fh.read())
+_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), "report.xml.j2")
+
+
+@functools.lru_cache(maxsize=None)
+def _template():
+    """Compiles the report template the first time a report is rendered."""
+    import jinja2
+
+    with open(_TEMPLATE_PATH, "r") as fh:
+        return jinja2.Template(fh.read())
 
 
 @attr.s(auto_attribs=True, slots=True)
@@ -58,8 +67,36 @@ class Reporter:
         self.results.append(result)
 
     def render(self):
-        return _TEMPLATE.render(reporter=self)
+        return _template().render(reporter=self)
 
     def write(self, filename):
         with open(filename, "w") as fh:
             fh.write(self.render())
+
+    @classmethod
+    def load(cls, filename):
+        """Reads a report back from a junit XML file written by `write`."""
+        root = ElementTree.parse(filename).getroot()
+        report = cls(root.get("name"))
+        for suite in root.iter("testsuite"):
+            result = Result(
+                suite.get("name"),
+                error=suite.get("failures") != "0",
+                skipped=suite.get("skipped") != "0",
+            )
+            output = suite.find("testcase/failure")
+            if output is None:
+                output = suite.find("testcase/system-out")
+            if output is not None and output.text:
+                result._output.write(output.text)
+            report.add(result)
+        return report
+
+    @classmethod
+    def merge(cls, name, reports):
+        """Combines the results of several reports, such as one per shard."""
+        merged = cls(name)
+        for report in reports:
+            for result in report.results:
+                merged.add(result)
+        return merged
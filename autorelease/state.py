@@ -0,0 +1,176 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module persists scan progress so that later runs only look at new work."""
+
+import datetime
+import fcntl
+import json
+import os
+import tempfile
+from typing import Callable, Dict, List, Optional, Set
+
+from autorelease import reporter
+
+# Only remember this many processed pull requests per scan.
+_MAX_PROCESSED = 10000
+
+# The search index lags behind pull request updates, so each scan searches
+# from this long before the previous one started. The processed pull requests
+# that turn up again are dropped from the working set.
+_WATERMARK_OVERLAP = datetime.timedelta(minutes=10)
+
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+def now() -> str:
+    """Returns the current time in the format used by the search API."""
+    return datetime.datetime.now(datetime.timezone.utc).strftime(_TIME_FORMAT)
+
+
+def _set_back(timestamp: str) -> str:
+    moment = datetime.datetime.strptime(timestamp, _TIME_FORMAT)
+    return (moment - _WATERMARK_OVERLAP).strftime(_TIME_FORMAT)
+
+
+def _issue_key(issue: dict) -> str:
+    return issue["pull_request"]["html_url"]
+
+
+class ScanState:
+    """The high-water mark and processed pull requests of one kind of scan.
+
+    Several scans, such as `autorelease.tag` and `autorelease.trigger`, can
+    share one state file. Each one keeps its own section, keyed by name.
+    """
+
+    def __init__(self, path: str, name: str) -> None:
+        self.path = path
+        self.name = name
+
+        section: Dict = {}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as fh:
+                section = json.load(fh).get(name, {})
+
+        self.watermark: Optional[str] = section.get("watermark")
+        processed = section.get("processed", {})
+        if isinstance(processed, list):
+            # Older state files didn't record when pull requests were updated.
+            processed = dict.fromkeys(processed)
+        # Maps each processed pull request to its `updated_at` at the time.
+        self._processed: Dict[str, Optional[str]] = processed
+        self._retry: List[dict] = section.get("retry", [])
+        self._retried: Set[str] = set()
+
+    def _already_processed(self, issue: dict) -> bool:
+        key = _issue_key(issue)
+        if key not in self._processed:
+            return False
+        # A pull request updated since, such as by relabeling it to retry a
+        # release, is processed again.
+        processed_at = self._processed[key]
+        updated_at = issue.get("updated_at")
+        return bool(processed_at and updated_at and updated_at <= processed_at)
+
+    def working_set(self, issues: List[dict]) -> List[dict]:
+        """Drops already processed issues and adds the ones that failed last time."""
+        working_set = [issue for issue in issues if not self._already_processed(issue)]
+        seen = {_issue_key(issue) for issue in working_set}
+        self._retried = set()
+        for issue in self._retry:
+            if _issue_key(issue) not in seen:
+                working_set.append(issue)
+                seen.add(_issue_key(issue))
+                self._retried.add(_issue_key(issue))
+        return working_set
+
+    def drop_unlabeled_retries(
+        self, issues: List[dict], label: str, get_pull: Callable[[dict], dict]
+    ) -> List[dict]:
+        """Drops the retried issues whose pull request no longer has `label`,
+        such as when a person removed it to stop the retries.
+
+        Issues the search returned already have the label. The ones added from
+        the retry list are checked with `get_pull`, and kept if that fails.
+        """
+        kept = []
+        for issue in issues:
+            if _issue_key(issue) in self._retried:
+                try:
+                    pull = get_pull(issue)
+                    labels = [item["name"] for item in pull.get("labels", [])]
+                except Exception:
+                    labels = [label]
+                if label not in labels:
+                    continue
+            kept.append(issue)
+        return kept
+
+    def record(self, issues: List[dict], results: List[reporter.Result]) -> None:
+        """Remembers which issues were processed and which ones should be retried."""
+        self._retry = []
+        for issue, result in zip(issues, results):
+            key = _issue_key(issue)
+            self._processed.pop(key, None)
+            if result.error:
+                self._retry.append(
+                    {
+                        "title": issue["title"],
+                        "updated_at": issue.get("updated_at"),
+                        "pull_request": {
+                            "url": issue["pull_request"].get("url"),
+                            "html_url": key,
+                        },
+                    }
+                )
+            else:
+                self._processed[key] = issue.get("updated_at")
+
+    def save(self, scan_started: str = None) -> None:
+        """Writes the state.
+
+        If the start time of a complete scan is given, the high-water mark
+        advances to a little before it, see _WATERMARK_OVERLAP.
+
+        Scans that share the file, such as shards started together, hold a
+        lock while they read it and replace their own section.
+        """
+        if scan_started:
+            self.watermark = _set_back(scan_started)
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with open(f"{self.path}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self._write_section()
+
+    def _write_section(self) -> None:
+        data: Dict = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+
+        processed = dict(list(self._processed.items())[-_MAX_PROCESSED:])
+        data[self.name] = {
+            "watermark": self.watermark,
+            "processed": processed,
+            "retry": self._retry,
+        }
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(handle, "w", encoding="utf-8") as fh:
+            json.dump(data, fh, indent=2)
+        os.replace(temp_path, self.path)
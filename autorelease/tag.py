@@ -14,9 +14,12 @@
 
 """This module handles automatically running releasetool tag against all pending PRs."""
 
+import collections
+import concurrent.futures
 import importlib
+from typing import Dict, List, Tuple
 
-from autorelease import common, github, kokoro, reporter
+from autorelease import common, github, kokoro, reporter, state
 from releasetool.commands.common import TagContext
 import releasetool.github
 
@@ -36,7 +39,9 @@ def run_releasetool_tag(lang: str, gh: github.GitHub, pull: dict) -> TagContext:
     ctx = TagContext()
     ctx.interactive = False
     # TODO(busunkim): Use proxy once KMS setup is complete.
-    ctx.github = releasetool.github.GitHub(gh.token, use_proxy=False)
+    ctx.github = releasetool.github.GitHub(
+        gh.token, use_proxy=False, cache_dir=gh.cache_dir
+    )
     ctx.token = gh.token
     ctx.upstream_repo = pull["base"]["repo"]["full_name"]
     ctx.release_pr = pull
@@ -44,16 +49,21 @@ def run_releasetool_tag(lang: str, gh: github.GitHub, pull: dict) -> TagContext:
 
 
 def process_issue(
-    kokoro_session, gh: github.GitHub, issue: dict, result: reporter.Result
+    kokoro_session,
+    gh: github.GitHub,
+    issue: dict,
+    result: reporter.Result,
+    language_cache: common.LanguageCache = None,
+    pulls: Dict[str, dict] = None,
 ) -> None:
     # Reify the "issue" into a full pull request object from github. This
     # is necessary because github gives us back an issue object, but it
-    # doesn't contain all of the PR info.
-    pull = gh.get_url(issue["pull_request"]["url"])
+    # doesn't contain all of the PR info. It may have been bulk loaded already.
+    pull = common.get_pull(gh, issue, pulls)
     repo_full_name = pull["base"]["repo"]["full_name"]
 
     # Determine language.
-    lang = common.guess_language(gh, repo_full_name)
+    lang = common.guess_language(gh, repo_full_name, cache=language_cache)
 
     # As part of the migration to release-please tagging, cross-reference the
     # language against an allowlist to allow migrating language-by-language.
@@ -94,21 +104,94 @@ def process_issue(
         )
 
 
-def main(github_token: str, kokoro_credentials: str) -> reporter.Reporter:
+def process_issue_and_record(
+    kokoro_session, gh: github.GitHub, issue: dict, result: reporter.Result, **kwargs
+) -> None:
+    """Tags a single pull request, recording any error on `result` rather than
+    raising it."""
+    result.print(f"Processing {issue['title']}: {issue['pull_request']['html_url']}")
+
+    try:
+        process_issue(kokoro_session, gh, issue, result, **kwargs)
+    # Failing any one PR is fine, just record it in the log and continue.
+    except Exception as exc:
+        result.error = True
+        result.print(f"{exc!r}")
+
+
+def _process_repository(
+    kokoro_session,
+    gh: github.GitHub,
+    work: List[Tuple[dict, reporter.Result]],
+    **kwargs,
+) -> None:
+    """Processes the pull requests of a single repository one at a time, in the
+    order they were merged, so that tags and labels never race."""
+    work = sorted(work, key=lambda item: item[0].get("closed_at") or "")
+    for issue, result in work:
+        process_issue_and_record(kokoro_session, gh, issue, result, **kwargs)
+
+
+def main(
+    github_token: str,
+    kokoro_credentials: str,
+    workers: int = 1,
+    cache_dir: str = None,
+    language_cache: common.LanguageCache = None,
+    state_file: str = None,
+    shard: common.Shard = None,
+    gh: github.GitHub = None,
+    kokoro_session=None,
+) -> reporter.Reporter:
+    """Runs releasetool tag for all pending release pull requests.
+
+    Arguments:
+        github_token: API token for authenticating against the GitHub API
+        kokoro_credentials: API token for using the Kokoro API
+        workers: Number of repositories to process concurrently. Pull requests
+            for the same repository are always processed serially, in the
+            order they were merged.
+        cache_dir: Optional. Directory for the conditional GitHub request cache.
+        language_cache: Optional. Cache of repository languages, saved after
+            the run.
+        state_file: Optional. Enables incremental scanning: only issues
+            updated since the last successful scan recorded in this file are
+            listed, and issues that failed are retried.
+        shard: Optional. Only process the pull requests of repositories in
+            this shard. Each shard keeps its own section of the state file.
+        gh: Optional. An existing GitHub client to reuse.
+        kokoro_session: Optional. An existing Kokoro session to reuse.
+    """
     report = reporter.Reporter("autorelease.tag")
-    # TODO(busunkim): Use proxy once KMS setup is complete.
-    gh = github.GitHub(github_token, use_proxy=False)
+    if gh is None:
+        # TODO(busunkim): Use proxy once KMS setup is complete.
+        gh = github.GitHub(github_token, use_proxy=False, cache_dir=cache_dir)
+    if language_cache is None:
+        language_cache = common.LanguageCache()
 
-    if kokoro_credentials:
-        kokoro_session = kokoro.make_authorized_session(kokoro_credentials)
-    else:
-        kokoro_session = kokoro.make_adc_session()
+    if kokoro_session is None:
+        if kokoro_credentials:
+            kokoro_session = kokoro.make_authorized_session(kokoro_credentials)
+        else:
+            kokoro_session = kokoro.make_adc_session()
 
     # First, we need to get a list of all pull requests (GitHub calls these "issues")
     # that are merged ("closed") and have the label "autorelease: pending".
     list_result = reporter.Result("list issues")
+    scan_name = report.name
+    if shard:
+        list_result.name = f"list issues (shard {shard})"
+        scan_name = f"{report.name} (shard {shard})"
     report.add(list_result)
 
+    scan_state = None
+    search_filters = {}
+    if state_file:
+        scan_state = state.ScanState(state_file, scan_name)
+        if scan_state.watermark:
+            search_filters["updated_after"] = scan_state.watermark
+    scan_started = state.now()
+
     all_issues = []
     for org in ORGANIZATIONS_TO_SCAN:
         try:
@@ -118,6 +201,7 @@ def main(github_token: str, kokoro_credentials: str) -> reporter.Reporter:
                 state="closed",
                 # Must be labeled with "autorelease: pending"
                 labels="autorelease: pending",
+                **search_filters,
             )
 
             # Just in case any non-PRs got in here.
@@ -130,24 +214,68 @@ def main(github_token: str, kokoro_credentials: str) -> reporter.Reporter:
             list_result.error = True
             list_result.print(exc)
 
+    if scan_state:
+        all_issues = scan_state.working_set(all_issues)
+
+    if shard:
+        all_issues = shard.select(all_issues)
+
+    pulls = common.load_pulls(gh, all_issues, list_result)
+
+    if scan_state:
+        all_issues = scan_state.drop_unlabeled_retries(
+            all_issues,
+            "autorelease: pending",
+            lambda issue: common.get_pull(gh, issue, pulls),
+        )
+
     # Print out our findings as a checkpoint.
     list_result.print("Working set:")
     for issue in all_issues:
         list_result.print(f" * {issue['title']}: {issue['pull_request']['html_url']}")
 
-    # For each pull request, execute releasetool tag for it.
+    # Create every result up front so the report keeps the working set order
+    # even when repositories finish out of order.
+    results = []
+    work_by_repository = collections.OrderedDict()
     for issue in all_issues:
         result = reporter.Result(f"{issue['title']}")
         report.add(result)
-        result.print(
-            f"Processing {issue['title']}: {issue['pull_request']['html_url']}"
+        results.append(result)
+        work_by_repository.setdefault(common.issue_repository(issue), []).append(
+            (issue, result)
         )
 
-        try:
-            process_issue(kokoro_session, gh, issue, result)
-        # Failing any one PR is fine, just record it in the log and continue.
-        except Exception as exc:
-            result.error = True
-            result.print(f"{exc!r}")
+    # For each pull request, execute releasetool tag for it.
+    if workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    _process_repository,
+                    kokoro_session,
+                    gh,
+                    work,
+                    language_cache=language_cache,
+                    pulls=pulls,
+                )
+                for work in work_by_repository.values()
+            ]
+            concurrent.futures.wait(futures)
+    else:
+        for work in work_by_repository.values():
+            _process_repository(
+                kokoro_session,
+                gh,
+                work,
+                language_cache=language_cache,
+                pulls=pulls,
+            )
+
+    language_cache.save()
+
+    if scan_state:
+        scan_state.record(all_issues, results)
+        # Only advance the high-water mark if the whole search succeeded.
+        scan_state.save(None if list_result.error else scan_started)
 
     return report
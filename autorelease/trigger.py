@@ -14,11 +14,13 @@
 
 """This module handles triggering Kokoro release jobs for merged release pull requests."""
 
+import concurrent.futures
+import functools
 import importlib
 import re
-from typing import Tuple
+from typing import Dict, Tuple
 
-from autorelease import common, github, kokoro, reporter
+from autorelease import common, github, kokoro, reporter, state
 
 LANGUAGE_ALLOWLIST = []
 ORGANIZATIONS_TO_SCAN = ["googleapis", "GoogleCloudPlatform"]
@@ -59,17 +61,23 @@ def trigger_kokoro_build_for_pull_request(
     update_labels: bool = True,
     use_allowlist: bool = True,
     multi_scm_name: str = "",
+    language_cache: common.LanguageCache = None,
+    publisher: kokoro.BatchPublisher = None,
+    pulls: Dict[str, dict] = None,
 ) -> None:
     """Triggers the Kokoro job for a given pull request if possible.
 
     If the pull request is not merged, remove the `autorelease: pending` label
     and mark it as closed. Otherwise, determine the name of the Kokoro job
     name and trigger a build.
+
+    If a publisher is given, the build request is queued on it, and the
+    result and labels are updated once its batch has been published.
     """
     # Reify the "issue" into a full pull request object from github. This
     # is necessary because github gives us back an issue object, but it
-    # doesn't contain all of the PR info.
-    pull = gh.get_url(issue["pull_request"]["url"])
+    # doesn't contain all of the PR info. It may have been bulk loaded already.
+    pull = common.get_pull(gh, issue, pulls)
 
     # Before doing any processing, check to make sure the PR was actually merged.
     # "closed" PRs can be merged or just closed without merging.
@@ -90,7 +98,9 @@ def trigger_kokoro_build_for_pull_request(
         return
 
     # Determine language.
-    lang = common.guess_language(gh, pull["base"]["repo"]["full_name"])
+    lang = common.guess_language(
+        gh, pull["base"]["repo"]["full_name"], cache=language_cache
+    )
 
     # As part of the migration to release-please tagging, cross-reference the
     # language against an allowlist to allow migrating language-by-language.
@@ -119,6 +129,20 @@ def trigger_kokoro_build_for_pull_request(
 
     # Trigger Kokoro release build
     result.print(f"Triggering {kokoro_job_name} using {sha}")
+    if publisher:
+        future = kokoro.trigger_build(
+            kokoro_session,
+            job_name=kokoro_job_name,
+            sha=sha,
+            env_vars={"AUTORELEASE_PR": pull_request_url},
+            multi_scm_name=multi_scm_name,
+            publisher=publisher,
+        )
+        future.add_done_callback(
+            functools.partial(_build_published, gh, pull, result, update_labels)
+        )
+        return
+
     kokoro.trigger_build(
         kokoro_session,
         job_name=kokoro_job_name,
@@ -130,6 +154,24 @@ def trigger_kokoro_build_for_pull_request(
         gh.update_pull_labels(pull, add=["autorelease: triggered"])
 
 
+def _build_published(
+    gh: github.GitHub,
+    pull: dict,
+    result: reporter.Result,
+    update_labels: bool,
+    future: concurrent.futures.Future,
+) -> None:
+    """Records the outcome of a batched build request on the pull request."""
+    try:
+        future.result()
+        if update_labels:
+            gh.update_pull_labels(pull, add=["autorelease: triggered"])
+    # Failing any one PR is fine, just record it in the log and continue.
+    except Exception as exc:
+        result.error = True
+        result.print(f"{exc!r}")
+
+
 def _parse_issue(pull_request_url: str) -> Tuple[str, int]:
     match = re.match(".*github.com/(.*)/pull/(\\d+)", pull_request_url)
     if match:
@@ -143,6 +185,7 @@ def trigger_for_release(
     release_url: str,
     pysafe_lang: str,
     multi_scm_name: str = "",
+    cache_dir: str = None,
 ) -> reporter.Reporter:
     """Trigger a Kokoro job based on a release PR URL.
 
@@ -153,10 +196,11 @@ def trigger_for_release(
         pysafe_lang: The name of the programming language.
         multi_scm_name: Optional. If provided, trigger the Kokoro job as
             a multi_scm job.
+        cache_dir: Optional. Directory for the conditional GitHub request cache.
 
     """
     report = reporter.Reporter("autorelease.trigger")
-    gh = github.GitHub(github_token, use_proxy=False)
+    gh = github.GitHub(github_token, use_proxy=False, cache_dir=cache_dir)
 
     if kokoro_credentials:
         kokoro_session = kokoro.make_authorized_session(kokoro_credentials)
@@ -198,6 +242,8 @@ def trigger_single(
     kokoro_credentials: str,
     pull_request_url: str,
     multi_scm_name: str = "",
+    cache_dir: str = None,
+    language_cache: common.LanguageCache = None,
 ) -> reporter.Reporter:
     """Trigger a Kokoro job based on a release PR URL.
 
@@ -207,11 +253,14 @@ def trigger_single(
         pull_request_url: GitHub URL to the pull request
         multi_scm_name: Optional. If provided, trigger the Kokoro job as
             a multi_scm job.
+        cache_dir: Optional. Directory for the conditional GitHub request cache.
+        language_cache: Optional. Cache of repository languages, saved after
+            the run.
 
     """
     report = reporter.Reporter("autorelease.trigger")
     # TODO(busunkim): Use proxy once KMS setup is complete.
-    gh = github.GitHub(github_token, use_proxy=False)
+    gh = github.GitHub(github_token, use_proxy=False, cache_dir=cache_dir)
 
     if kokoro_credentials:
         kokoro_session = kokoro.make_authorized_session(kokoro_credentials)
@@ -241,30 +290,96 @@ def trigger_single(
             False,
             False,
             multi_scm_name=multi_scm_name,
+            language_cache=language_cache,
         )
     # Failing any one PR is fine, just record it in the log and continue.
     except Exception as exc:
         result.error = True
         result.print(f"{exc!r}")
 
+    if language_cache:
+        language_cache.save()
+
     return report
 
 
-def main(github_token: str, kokoro_credentials: str) -> reporter.Reporter:
-    report = reporter.Reporter("autorelease.trigger")
-    # TODO(busunkim): Use proxy once KMS setup is complete.
-    gh = github.GitHub(github_token, use_proxy=False)
+def process_pull_request(
+    kokoro_session, gh: github.GitHub, issue: dict, result: reporter.Result, **kwargs
+) -> None:
+    """Triggers the release build for a single pull request, recording any
+    error on `result` rather than raising it."""
+    result.print(f"Processing {issue['title']}: {issue['pull_request']['html_url']}")
 
-    if kokoro_credentials:
-        kokoro_session = kokoro.make_authorized_session(kokoro_credentials)
-    else:
-        kokoro_session = kokoro.make_adc_session()
+    try:
+        trigger_kokoro_build_for_pull_request(
+            kokoro_session, gh, issue, result, **kwargs
+        )
+    # Failing any one PR is fine, just record it in the log and continue.
+    except Exception as exc:
+        result.error = True
+        result.print(f"{exc!r}")
+
+
+def main(
+    github_token: str,
+    kokoro_credentials: str,
+    workers: int = 1,
+    cache_dir: str = None,
+    language_cache: common.LanguageCache = None,
+    state_file: str = None,
+    shard: common.Shard = None,
+    gh: github.GitHub = None,
+    kokoro_session=None,
+) -> reporter.Reporter:
+    """Triggers Kokoro release builds for all tagged release pull requests.
+
+    Arguments:
+        github_token: API token for authenticating against the GitHub API
+        kokoro_credentials: API token for using the Kokoro API
+        workers: Number of pull requests to process concurrently. Results are
+            reported in working set order regardless of completion order.
+        cache_dir: Optional. Directory for the conditional GitHub request cache.
+        language_cache: Optional. Cache of repository languages, saved after
+            the run.
+        state_file: Optional. Enables incremental scanning: only issues
+            updated since the last successful scan recorded in this file are
+            listed, and issues that failed are retried.
+        shard: Optional. Only process the pull requests of repositories in
+            this shard. Each shard keeps its own section of the state file.
+        gh: Optional. An existing GitHub client to reuse.
+        kokoro_session: Optional. An existing Kokoro session to reuse.
+    """
+    report = reporter.Reporter("autorelease.trigger")
+    if gh is None:
+        # TODO(busunkim): Use proxy once KMS setup is complete.
+        gh = github.GitHub(github_token, use_proxy=False, cache_dir=cache_dir)
+    if language_cache is None:
+        language_cache = common.LanguageCache()
+
+    if kokoro_session is None:
+        if kokoro_credentials:
+            kokoro_session = kokoro.make_authorized_session(kokoro_credentials)
+        else:
+            kokoro_session = kokoro.make_adc_session()
+    publisher = kokoro.BatchPublisher(kokoro_session)
 
     # First, we need to get a list of all pull requests (GitHub calls these "issues")
     # that are merged ("closed") and have the label "autorelease: tagged".
     list_result = reporter.Result("list issues")
+    scan_name = report.name
+    if shard:
+        list_result.name = f"list issues (shard {shard})"
+        scan_name = f"{report.name} (shard {shard})"
     report.add(list_result)
 
+    scan_state = None
+    search_filters = {}
+    if state_file:
+        scan_state = state.ScanState(state_file, scan_name)
+        if scan_state.watermark:
+            search_filters["updated_after"] = scan_state.watermark
+    scan_started = state.now()
+
     all_issues = []
     for org in ORGANIZATIONS_TO_SCAN:
         try:
@@ -274,6 +389,7 @@ def main(github_token: str, kokoro_credentials: str) -> reporter.Reporter:
                 state="closed",
                 # Must be labeled with "autorelease: pending"
                 labels="autorelease: tagged",
+                **search_filters,
                 # Only look at issues created recently
                 created_after=CREATED_AFTER,
             )
@@ -288,24 +404,70 @@ def main(github_token: str, kokoro_credentials: str) -> reporter.Reporter:
             list_result.error = True
             list_result.print(exc)
 
+    if scan_state:
+        all_issues = scan_state.working_set(all_issues)
+
+    if shard:
+        all_issues = shard.select(all_issues)
+
+    pulls = common.load_pulls(gh, all_issues, list_result)
+
+    if scan_state:
+        all_issues = scan_state.drop_unlabeled_retries(
+            all_issues,
+            "autorelease: tagged",
+            lambda issue: common.get_pull(gh, issue, pulls),
+        )
+
     # Print out our findings as a checkpoint.
     list_result.print("Working set:")
     for issue in all_issues:
         list_result.print(f" * {issue['title']}: {issue['pull_request']['html_url']}")
 
-    # For each pull request, execute releasetool tag for it.
+    # Create every result up front so the report keeps the working set order
+    # even when pull requests finish out of order.
+    results = []
     for issue in all_issues:
         result = reporter.Result(f"{issue['title']}")
         report.add(result)
-        result.print(
-            f"Processing {issue['title']}: {issue['pull_request']['html_url']}"
-        )
+        results.append(result)
+
+    # For each pull request, trigger the Kokoro release build for it.
+    if workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    process_pull_request,
+                    kokoro_session,
+                    gh,
+                    issue,
+                    result,
+                    language_cache=language_cache,
+                    pulls=pulls,
+                    publisher=publisher,
+                )
+                for issue, result in zip(all_issues, results)
+            ]
+            concurrent.futures.wait(futures)
+    else:
+        for issue, result in zip(all_issues, results):
+            process_pull_request(
+                kokoro_session,
+                gh,
+                issue,
+                result,
+                language_cache=language_cache,
+                pulls=pulls,
+                publisher=publisher,
+            )
 
-        try:
-            trigger_kokoro_build_for_pull_request(kokoro_session, gh, issue, result)
-        # Failing any one PR is fine, just record it in the log and continue.
-        except Exception as exc:
-            result.error = True
-            result.print(f"{exc!r}")
+    # Publish any build requests that are still queued.
+    publisher.flush()
+    language_cache.save()
+
+    if scan_state:
+        scan_state.record(all_issues, results)
+        # Only advance the high-water mark if the whole search succeeded.
+        scan_state.save(None if list_result.error else scan_started)
 
     return report
@@ -0,0 +1,175 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures autorelease and releasetool against a synthetic set of orgs.
+
+    python -m benchmarks --orgs 4 --repos-per-org 50 --pulls-per-repo 10
+
+Use `--output` to save the results and `--baseline` to compare a later run
+against them. The process exits with status 2 when a command regresses.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, List
+
+import attr
+
+from benchmarks import harness
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.0f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
+
+
+def _print_measurement(measurement: harness.Measurement) -> None:
+    print(
+        f"{measurement.command}: {measurement.pulls} pulls, "
+        f"{measurement.wall_time:.2f}s, "
+        f"{measurement.total_requests} requests, "
+        f"peak memory {_format_bytes(measurement.peak_memory)}, "
+        f"{measurement.published} published, {measurement.releases} releases"
+    )
+    for route, count in sorted(measurement.requests.items()):
+        print(f"    {route}: {count}")
+
+
+def compare(
+    measurements: List[harness.Measurement], baseline: Dict[str, dict], tolerance: float
+) -> List[str]:
+    """Returns a description of every regression against the baseline."""
+    regressions = []
+    for measurement in measurements:
+        previous = baseline.get(measurement.command)
+        if previous is None:
+            continue
+
+        limit = previous["wall_time"] * (1 + tolerance)
+        if measurement.wall_time > limit:
+            regressions.append(
+                f"{measurement.command}: wall time {measurement.wall_time:.2f}s "
+                f"exceeds {limit:.2f}s"
+            )
+
+        previous_requests = sum(previous["requests"].values())
+        if measurement.total_requests > previous_requests:
+            regressions.append(
+                f"{measurement.command}: {measurement.total_requests} requests, "
+                f"baseline made {previous_requests}"
+            )
+
+        limit = previous["peak_memory"] * (1 + tolerance)
+        if measurement.peak_memory > limit:
+            regressions.append(
+                f"{measurement.command}: peak memory "
+                f"{_format_bytes(measurement.peak_memory)} exceeds "
+                f"{_format_bytes(limit)}"
+            )
+    return regressions
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "commands",
+        nargs="*",
+        help=(
+            "Commands to measure, from "
+            f"{', '.join(sorted(harness.COMMANDS))}. Defaults to all of them."
+        ),
+    )
+    parser.add_argument("--orgs", type=int, default=2)
+    parser.add_argument("--repos-per-org", type=int, default=10)
+    parser.add_argument("--pulls-per-repo", type=int, default=5)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds the fake servers wait before answering each request.",
+    )
+    parser.add_argument(
+        "--core-limit",
+        type=int,
+        default=None,
+        help="Requests allowed per rate limit window for the core API.",
+    )
+    parser.add_argument(
+        "--search-limit",
+        type=int,
+        default=None,
+        help="Requests allowed per rate limit window for the search API.",
+    )
+    parser.add_argument("--rate-limit-window", type=float, default=60.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--output", help="JSON file to write the results to.")
+    parser.add_argument(
+        "--baseline", help="JSON file written by an earlier run to compare against."
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative increase in wall time and peak memory.",
+    )
+
+    args = parser.parse_args(argv)
+    for command in args.commands:
+        if command not in harness.COMMANDS:
+            parser.error(f"unknown command {command}")
+
+    options = harness.Options(
+        orgs=args.orgs,
+        repos_per_org=args.repos_per_org,
+        pulls_per_repo=args.pulls_per_repo,
+        latency=args.latency,
+        core_limit=args.core_limit,
+        search_limit=args.search_limit,
+        rate_limit_window=args.rate_limit_window,
+        workers=args.workers,
+    )
+
+    measurements = []
+    for command in args.commands or sorted(harness.COMMANDS):
+        measurement = harness.run(command, options)
+        _print_measurement(measurement)
+        measurements.append(measurement)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(
+                {
+                    measurement.command: attr.asdict(measurement)
+                    for measurement in measurements
+                },
+                fh,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(measurements, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,496 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An in-process fake of the GitHub REST API and the Pub/Sub publish API.
+
+The server speaks HTTPS with a throwaway self-signed certificate, so the
+clients go through the same transport adapters they use in production.
+Point `REQUESTS_CA_BUNDLE` at `FakeServer.ca_bundle` to trust it.
+"""
+
+import base64
+import collections
+import datetime
+import hashlib
+import http.server
+import json
+import os
+import re
+import ssl
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+_DEFAULT_PER_PAGE = 30
+_MAX_PER_PAGE = 100
+
+
+def _write_certificate(directory: str) -> Tuple[str, str]:
+    """Writes a self-signed certificate for localhost, returns its paths."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(minutes=5))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .add_extension(
+            x509.SubjectAlternativeName(
+                [x509.DNSName("localhost")],
+            ),
+            critical=False,
+        )
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), True)
+        .sign(key, hashes.SHA256())
+    )
+
+    cert_path = os.path.join(directory, "cert.pem")
+    key_path = os.path.join(directory, "key.pem")
+    with open(cert_path, "wb") as fh:
+        fh.write(certificate.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as fh:
+        fh.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+    return cert_path, key_path
+
+
+class _Budget:
+    """A fixed window rate limit, like the ones GitHub applies per resource."""
+
+    def __init__(self, limit: Optional[int], window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset = time.time() + window
+
+    def charge(self) -> Tuple[bool, Dict[str, str]]:
+        if self.limit is None:
+            return True, {}
+        now = time.time()
+        if now >= self.reset:
+            self.remaining = self.limit
+            self.reset = now + self.window
+        allowed = self.remaining > 0
+        if allowed:
+            self.remaining -= 1
+        return allowed, {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(int(self.reset + 0.999)),
+        }
+
+
+class FakeGitHub:
+    """The state of a synthetic set of GitHub organizations.
+
+    Every organization has `repos_per_org` Python repositories, each with
+    `pulls_per_repo` merged release pull requests carrying `label`.
+    """
+
+    def __init__(
+        self,
+        orgs: List[str],
+        repos_per_org: int,
+        pulls_per_repo: int,
+        label: str = "autorelease: pending",
+        latency: float = 0.0,
+        core_limit: int = None,
+        search_limit: int = None,
+        rate_limit_window: float = 60.0,
+    ) -> None:
+        self.orgs = orgs
+        self.latency = latency
+        self.root = ""
+        self.repos: Dict[str, dict] = {}
+        self.pulls: Dict[Tuple[str, int], dict] = {}
+        self.releases: Dict[Tuple[str, str], dict] = {}
+        self.published: List[dict] = []
+        self.requests: collections.Counter = collections.Counter()
+        self._lock = threading.Lock()
+        self._budgets = {
+            "core": _Budget(core_limit, rate_limit_window),
+            "search": _Budget(search_limit, rate_limit_window),
+            "graphql": _Budget(core_limit, rate_limit_window),
+        }
+
+        for org in orgs:
+            for repo_index in range(repos_per_org):
+                name = f"python-repo-{repo_index}"
+                full_name = f"{org}/{name}"
+                self.repos[full_name] = {
+                    "name": name,
+                    "full_name": full_name,
+                    "owner": {"login": org},
+                }
+                for number in range(1, pulls_per_repo + 1):
+                    self.pulls[(full_name, number)] = self._make_pull(
+                        full_name, number, label
+                    )
+
+    def _make_pull(self, full_name: str, number: int, label: str) -> dict:
+        version = f"1.{number}.0"
+        return {
+            "number": number,
+            "title": f"chore(main): release {version}",
+            "body": "",
+            "html_url": f"https://github.com/{full_name}/pull/{number}",
+            "merged_at": "2021-01-01T09:00:00Z",
+            "closed_at": f"2021-01-01T09:{number % 60:02d}:00Z",
+            "updated_at": "2021-01-01T09:00:00Z",
+            "merge_commit_sha": hashlib.sha1(
+                f"{full_name}#{number}".encode("utf-8")
+            ).hexdigest(),
+            "head": {"ref": f"release-please--branches--main--v{version}"},
+            "base": {"ref": "main", "repo": self.repos[full_name]},
+            "labels": [{"name": label}],
+        }
+
+    def _pull_json(self, pull: dict) -> dict:
+        full_name = pull["base"]["repo"]["full_name"]
+        return dict(pull, url=f"{self.root}/repos/{full_name}/pulls/{pull['number']}")
+
+    def changelog(self, full_name: str) -> bytes:
+        sections = []
+        for (repo, number), pull in sorted(self.pulls.items(), reverse=True):
+            if repo == full_name:
+                sections.append(
+                    f"## [1.{number}.0](https://github.com/{repo}/compare) (2021-01-01)\n"
+                    f"\n### Features\n\n* feature number {number} (#{number})\n"
+                )
+        return ("# Changelog\n\n" + "\n".join(sections)).encode("utf-8")
+
+    def charge(self, resource: str) -> Tuple[bool, Dict[str, str]]:
+        with self._lock:
+            allowed, headers = self._budgets[resource].charge()
+        if headers:
+            headers["X-RateLimit-Resource"] = resource
+        return allowed, headers
+
+    def count(self, route: str) -> None:
+        with self._lock:
+            self.requests[route] += 1
+
+    # Routes. Each one returns (status, body, extra headers).
+
+    def search_issues(self, query: Dict[str, List[str]]) -> Tuple[int, dict, dict]:
+        terms = query.get("q", [""])[0]
+        org = re.search(r"org:(\S+)", terms)
+        label = re.search(r'label:"([^"]+)"', terms)
+        issues = []
+        for (full_name, number), pull in sorted(self.pulls.items()):
+            if org and not full_name.startswith(f"{org[1]}/"):
+                continue
+            names = [item["name"] for item in pull["labels"]]
+            if label and label[1] not in names:
+                continue
+            issues.append(
+                {
+                    "title": pull["title"],
+                    "number": number,
+                    "closed_at": pull["closed_at"],
+                    "updated_at": pull["updated_at"],
+                    "pull_request": {
+                        "url": self._pull_json(pull)["url"],
+                        "html_url": pull["html_url"],
+                    },
+                }
+            )
+
+        per_page = min(int(query.get("per_page", [_DEFAULT_PER_PAGE])[0]), 100)
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * per_page
+        end = start + per_page
+        headers = {}
+        links = []
+        last_page = max((len(issues) + per_page - 1) // per_page, 1)
+        if page < last_page:
+            links.append(self._page_link(terms, per_page, page + 1, "next"))
+            links.append(self._page_link(terms, per_page, last_page, "last"))
+        if links:
+            headers["Link"] = ", ".join(links)
+        body = {
+            "total_count": len(issues),
+            "incomplete_results": False,
+            "items": issues[start:end],
+        }
+        return 200, body, headers
+
+    def _page_link(self, terms: str, per_page: int, page: int, rel: str) -> str:
+        return (
+            f"<{self.root}/search/issues?q={terms.replace(' ', '+')}"
+            f'&per_page={per_page}&page={page}>; rel="{rel}"'
+        )
+
+    def org_repos(
+        self, org: str, query: Dict[str, List[str]]
+    ) -> Tuple[int, list, dict]:
+        repos = [repo for repo in self.repos.values() if repo["owner"]["login"] == org]
+        per_page = min(int(query.get("per_page", [_DEFAULT_PER_PAGE])[0]), 100)
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * per_page
+        end = start + per_page
+        headers = {}
+        if end < len(repos):
+            headers["Link"] = (
+                f"<{self.root}/orgs/{org}/repos?per_page={per_page}"
+                f'&page={page + 1}>; rel="next"'
+            )
+        return 200, repos[start:end], headers
+
+    def graphql(self, request: dict) -> Tuple[int, dict, dict]:
+        data = {}
+        for alias, owner, name, number in re.findall(
+            r'(\w+): repository\(owner: "([^"]+)", name: "([^"]+)"\) '
+            r"\{ pullRequest\(number: (\d+)\)",
+            request.get("query", ""),
+        ):
+            pull = self.pulls.get((f"{owner}/{name}", int(number)))
+            if pull is None:
+                data[alias] = None
+                continue
+            repo = pull["base"]["repo"]
+            data[alias] = {
+                "pullRequest": {
+                    "number": pull["number"],
+                    "title": pull["title"],
+                    "body": pull["body"],
+                    "url": pull["html_url"],
+                    "mergedAt": pull["merged_at"],
+                    "mergeCommit": {"oid": pull["merge_commit_sha"]},
+                    "headRefName": pull["head"]["ref"],
+                    "baseRefName": pull["base"]["ref"],
+                    "labels": {"nodes": list(pull["labels"])},
+                    "baseRepository": {
+                        "name": repo["name"],
+                        "nameWithOwner": repo["full_name"],
+                        "owner": {"login": repo["owner"]["login"]},
+                    },
+                }
+            }
+        return 200, {"data": data}, {}
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which with Nagle's algorithm
+    # stalls every keep-alive response until the client's delayed ACK.
+    disable_nagle_algorithm = True
+    server: "FakeServer"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        return json.loads(body) if body else {}
+
+    def _send(self, status: int, body, headers: Dict[str, str] = None) -> None:
+        # Bytes are sent as they are, like the raw media type.
+        if isinstance(body, bytes):
+            payload, content_type = body, "application/vnd.github.raw"
+        else:
+            payload = json.dumps(body).encode("utf-8") if body is not None else b""
+            content_type = "application/json; charset=utf-8"
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _dispatch(self, method: str) -> None:
+        fake = self.server.github
+        request = self._read_json() if method in ("POST", "PUT") else None
+        url = urlparse(self.path)
+        path = unquote(url.path)
+        query = parse_qs(url.query)
+        if fake.latency:
+            time.sleep(fake.latency)
+
+        if path.startswith("/v1/") and path.endswith(":publish"):
+            fake.count("pubsub publish")
+            messages = request.get("messages", [])
+            with fake._lock:
+                fake.published.extend(messages)
+            ids = [str(len(fake.published) - index) for index in range(len(messages))]
+            self._send(200, {"messageIds": ids})
+            return
+
+        resource = "core"
+        if path.startswith("/search/"):
+            resource = "search"
+        elif path == "/graphql":
+            resource = "graphql"
+        allowed, headers = fake.charge(resource)
+        if not allowed:
+            fake.count("rate limited")
+            self._send(403, {"message": "API rate limit exceeded"}, headers)
+            return
+
+        status, body, extra = self._route(fake, method, path, query, request)
+        headers.update(extra)
+        self._send(status, body, headers)
+
+    def _route(self, fake: FakeGitHub, method: str, path: str, query, request):
+        if method == "GET" and path == "/search/issues":
+            fake.count("search issues")
+            return fake.search_issues(query)
+
+        if method == "POST" and path == "/graphql":
+            fake.count("graphql")
+            return fake.graphql(request)
+
+        match = re.match(r"^/orgs/([^/]+)/repos$", path)
+        if method == "GET" and match:
+            fake.count("list repos")
+            return fake.org_repos(match[1], query)
+
+        match = re.match(r"^/repos/([^/]+/[^/]+)(/.*)?$", path)
+        if not match or match[1] not in fake.repos:
+            fake.count("not found")
+            return 404, {"message": "Not Found"}, {}
+        full_name, rest = match[1], match[2] or ""
+
+        match = re.match(r"^/pulls/(\d+)$", rest)
+        if method == "GET" and match:
+            fake.count("get pull")
+            pull = fake.pulls.get((full_name, int(match[1])))
+            if pull is None:
+                return 404, {"message": "Not Found"}, {}
+            return 200, fake._pull_json(pull), {}
+
+        if method == "GET" and rest == "/languages":
+            fake.count("languages")
+            return 200, {"Python": 10000, "Shell": 100}, {}
+
+        match = re.match(r"^/contents/(.+)$", rest)
+        if method == "GET" and match:
+            fake.count("contents")
+            if match[1] != "CHANGELOG.md":
+                return 404, {"message": "Not Found"}, {}
+            content = fake.changelog(full_name)
+            etag = '"' + hashlib.sha1(content).hexdigest() + '"'
+            if self.headers.get("If-None-Match") == etag:
+                return 304, None, {"ETag": etag}
+            if self.headers.get("Accept") == "application/vnd.github.raw":
+                return 200, content, {"ETag": etag}
+            body = {
+                "name": "CHANGELOG.md",
+                "encoding": "base64",
+                "content": base64.b64encode(content).decode("utf-8"),
+            }
+            return 200, body, {"ETag": etag}
+
+        match = re.match(r"^/issues/(\d+)/labels$", rest)
+        if method in ("PUT", "POST") and match:
+            fake.count("labels")
+            pull = fake.pulls.get((full_name, int(match[1])))
+            if pull is None:
+                return 404, {"message": "Not Found"}, {}
+            names = request.get("labels", [])
+            if method == "POST":
+                names = [label["name"] for label in pull["labels"]] + names
+            pull["labels"] = [{"name": name} for name in dict.fromkeys(names)]
+            return 200, pull["labels"], {}
+
+        match = re.match(r"^/issues/(\d+)/comments$", rest)
+        if method == "POST" and match:
+            fake.count("comments")
+            return 201, {"body": request.get("body")}, {}
+
+        if method == "POST" and rest == "/releases":
+            fake.count("create release")
+            release = dict(
+                request,
+                html_url=f"https://github.com/{full_name}/releases/tag/{request['tag_name']}",
+            )
+            fake.releases[(full_name, request["tag_name"])] = release
+            return 201, release, {}
+
+        match = re.match(r"^/releases/tags/(.+)$", rest)
+        if method == "GET" and match:
+            fake.count("get release")
+            release = fake.releases.get((full_name, match[1]))
+            if release is None:
+                return 404, {"message": "Not Found"}, {}
+            return 200, release, {}
+
+        if method == "GET" and rest == "/tags":
+            fake.count("list tags")
+            tags = [
+                {"name": tag, "commit": {"sha": release["target_commitish"]}}
+                for (repo, tag), release in fake.releases.items()
+                if repo == full_name
+            ]
+            return 200, tags, {}
+
+        fake.count("not found")
+        return 404, {"message": "Not Found"}, {}
+
+
+class FakeServer(http.server.ThreadingHTTPServer):
+    """Serves a FakeGitHub over HTTPS on a random local port."""
+
+    daemon_threads = True
+
+    def __init__(self, github: FakeGitHub) -> None:
+        super().__init__(("localhost", 0), _Handler)
+        self.github = github
+        self._directory = tempfile.TemporaryDirectory()
+        cert_path, key_path = _write_certificate(self._directory.name)
+        self.ca_bundle = cert_path
+
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert_path, key_path)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+
+        self.root = f"https://localhost:{self.server_address[1]}"
+        github.root = self.root
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    def __enter__(self) -> "FakeServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.shutdown()
+        self.server_close()
+        self._directory.cleanup()
@@ -0,0 +1,191 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs autorelease and releasetool commands against the fake servers."""
+
+import contextlib
+import io
+import os
+import time
+import tracemalloc
+import uuid
+from typing import Callable, Dict, Tuple
+from unittest import mock
+
+import attr
+import requests
+
+from benchmarks.fake_server import FakeGitHub, FakeServer
+
+
+@attr.s(auto_attribs=True)
+class Options:
+    orgs: int = 2
+    repos_per_org: int = 10
+    pulls_per_repo: int = 5
+    latency: float = 0.0
+    core_limit: int = None
+    search_limit: int = None
+    rate_limit_window: float = 60.0
+    workers: int = 1
+
+
+@attr.s(auto_attribs=True)
+class Measurement:
+    command: str
+    pulls: int
+    wall_time: float
+    peak_memory: int
+    requests: Dict[str, int]
+    published: int
+    releases: int
+    # Releases created without notes, such as when the changelog couldn't
+    # be read.
+    empty_release_notes: int = 0
+
+    @property
+    def total_requests(self) -> int:
+        return sum(self.requests.values())
+
+
+def _autorelease_tag(server: FakeServer, token: str, options: Options) -> None:
+    from autorelease import tag
+
+    with mock.patch("autorelease.tag.LANGUAGE_ALLOWLIST", ["python"]):
+        tag.main(token, "benchmark-credentials", workers=options.workers)
+
+
+def _autorelease_trigger(server: FakeServer, token: str, options: Options) -> None:
+    from autorelease import trigger
+
+    with mock.patch("autorelease.trigger.LANGUAGE_ALLOWLIST", ["python"]):
+        trigger.main(token, "benchmark-credentials", workers=options.workers)
+
+
+def _releasetool_tag(server: FakeServer, token: str, options: Options) -> None:
+    # One `releasetool tag` invocation per release pull request, the way a
+    # release job runs it.
+    import releasetool.github
+    from releasetool.commands.common import TagContext
+    from releasetool.commands.tag import python
+
+    for full_name, number in sorted(server.github.pulls):
+        ctx = TagContext()
+        ctx.interactive = False
+        ctx.github = releasetool.github.GitHub(token)
+        ctx.token = token
+        ctx.upstream_repo = full_name
+        response = ctx.github.session.get(
+            f"{server.root}/repos/{full_name}/pulls/{number}"
+        )
+        response.raise_for_status()
+        ctx.release_pr = response.json()
+        python.tag(ctx)
+
+
+COMMANDS: Dict[str, Callable[[FakeServer, str, Options], None]] = {
+    "autorelease-tag": _autorelease_tag,
+    "autorelease-trigger": _autorelease_trigger,
+    "releasetool-tag": _releasetool_tag,
+}
+
+_LABELS = {
+    "autorelease-tag": "autorelease: pending",
+    "autorelease-trigger": "autorelease: tagged",
+    "releasetool-tag": "autorelease: pending",
+}
+
+
+def _wall_time(call: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def _peak_memory(call: Callable[[], None]) -> int:
+    tracemalloc.start()
+    try:
+        call()
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak_memory
+
+
+def _run_once(
+    command: str, options: Options, measure: Callable[[Callable[[], None]], float]
+) -> Tuple[FakeGitHub, float]:
+    """Runs one command against a freshly generated set of organizations."""
+    orgs = [f"benchmark-org-{index}" for index in range(options.orgs)]
+    github = FakeGitHub(
+        orgs,
+        options.repos_per_org,
+        options.pulls_per_repo,
+        label=_LABELS[command],
+        latency=options.latency,
+        core_limit=options.core_limit,
+        search_limit=options.search_limit,
+        rate_limit_window=options.rate_limit_window,
+    )
+
+    # Rate limiters are shared per token, so use a fresh one for every run.
+    token = f"benchmark-{uuid.uuid4().hex}"
+
+    with FakeServer(github) as server, contextlib.ExitStack() as stack:
+        for target, value in [
+            ("autorelease.github._GITHUB_ROOT", server.root),
+            ("releasetool.github._GITHUB_ROOT", server.root),
+            ("autorelease.kokoro._PUBSUB_ROOT", f"{server.root}/v1"),
+            ("autorelease.tag.ORGANIZATIONS_TO_SCAN", orgs),
+            ("autorelease.trigger.ORGANIZATIONS_TO_SCAN", orgs),
+        ]:
+            stack.enter_context(mock.patch(target, value))
+        stack.enter_context(
+            mock.patch(
+                "autorelease.kokoro.make_authorized_session",
+                lambda credentials: requests.Session(),
+            )
+        )
+        stack.enter_context(
+            mock.patch.dict(os.environ, {"REQUESTS_CA_BUNDLE": server.ca_bundle})
+        )
+        # The commands are chatty, keep their output out of the report.
+        stack.enter_context(contextlib.redirect_stdout(io.StringIO()))
+
+        value = measure(lambda: COMMANDS[command](server, token, options))
+
+    return github, value
+
+
+def run(command: str, options: Options) -> Measurement:
+    """Runs one command twice, once timed and once to find its peak memory.
+
+    Tracing allocations slows the command down, so the wall time is measured
+    in a run without tracemalloc.
+    """
+    github, wall_time = _run_once(command, options, _wall_time)
+    _, peak_memory = _run_once(command, options, _peak_memory)
+
+    return Measurement(
+        command=command,
+        pulls=len(github.pulls),
+        wall_time=wall_time,
+        peak_memory=int(peak_memory),
+        requests=dict(github.requests),
+        published=len(github.published),
+        releases=len(github.releases),
+        empty_release_notes=len(
+            [release for release in github.releases.values() if not release.get("body")]
+        ),
+    )
@@ -0,0 +1,108 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures Java version replacement on a synthetic multi-module tree.
+
+    python -m benchmarks.java_versions --modules 5000 --budget-ms 5000
+
+Every module gets a pom.xml with version markers and a README.md without any.
+The first pass rewrites every pom.xml, the second finds nothing left to change.
+Exits with status 2 when a pass is over budget.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List
+
+from releasetool.commands.start import java
+
+POM = """<project>
+  <artifactId>{module}</artifactId>
+  <version>0.1.0</version><!-- {{x-version-update:{module}:current}} -->
+  <dependencies>
+    <!-- {{x-version-update-start:{parent}:released}} -->
+    <dependency>
+      <artifactId>{parent}</artifactId>
+      <version>0.1.0</version>
+    </dependency>
+    <!-- {{x-version-update-end}} -->
+  </dependencies>
+</project>
+"""
+
+README = """# {module}
+
+Add version 0.1.0 of {module} to your dependencies.
+"""
+
+
+def make_tree(root: str, modules: int) -> List[java.ArtifactVersions]:
+    """Writes the synthetic tree, returning the versions to release."""
+    versions = []
+    for index in range(modules):
+        module = f"google-cloud-module{index}"
+        parent = f"google-cloud-module{index // 10}"
+        directory = os.path.join(root, module)
+        os.makedirs(directory)
+        with open(os.path.join(directory, "pom.xml"), "w") as fh:
+            fh.write(POM.format(module=module, parent=parent))
+        with open(os.path.join(directory, "README.md"), "w") as fh:
+            fh.write(README.format(module=module))
+        versions.append(java.ArtifactVersions(f"{module}:1.0.0:1.0.1-SNAPSHOT"))
+    return versions
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.java_versions")
+    parser.add_argument("--modules", type=int, default=5000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Process pool size, 1 to rewrite in this process.",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail if either pass takes longer than this.",
+    )
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    with tempfile.TemporaryDirectory() as root:
+        versions = make_tree(root, args.modules)
+        targets = java.find_version_files(root)
+        print(f"{len(targets)} candidate files in {args.modules} modules")
+
+        for name in ["rewrite", "unchanged"]:
+            start = time.perf_counter()
+            updated = java.replace_versions_in_files(
+                versions, targets, workers=args.workers
+            )
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{name}: {elapsed:.1f}ms, {len(updated)} files written")
+            if args.budget_ms is not None and elapsed > args.budget_ms:
+                print(f"    over the {args.budget_ms:.1f}ms budget")
+                over_budget = True
+
+    if over_budget:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
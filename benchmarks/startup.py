@@ -0,0 +1,78 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Measures how long the command line entry points take to import.
+
+    python -m benchmarks.startup --budget-ms 150
+
+Uses `python -X importtime`, taking the best of several runs to smooth over
+a cold disk cache. Exits with status 2 when a module is over budget.
+"""
+
+import argparse
+import re
+import subprocess
+import sys
+from typing import List
+
+MODULES = ["releasetool.__main__", "autorelease.__main__"]
+
+
+def import_time(module: str, runs: int = 5) -> float:
+    """Returns the cumulative import time of a module, in milliseconds."""
+    best = None
+    for _ in range(runs):
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        # Lines look like "import time:   123 |   4567 | releasetool.__main__".
+        for line in process.stderr.splitlines():
+            match = re.match(r"import time:\s*\d+\s*\|\s*(\d+)\s*\|\s*(\S+)$", line)
+            if match and match[2] == module:
+                cumulative = int(match[1]) / 1000
+                best = cumulative if best is None else min(best, cumulative)
+    if best is None:
+        raise RuntimeError(f"No import time reported for {module}.")
+    return best
+
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup")
+    parser.add_argument("modules", nargs="*", default=MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=None,
+        help="Fail if any module takes longer than this to import.",
+    )
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    for module in args.modules:
+        elapsed = import_time(module, runs=args.runs)
+        print(f"{module}: {elapsed:.1f}ms")
+        if args.budget_ms is not None and elapsed > args.budget_ms:
+            print(f"    over the {args.budget_ms:.1f}ms budget")
+            over_budget = True
+
+    if over_budget:
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
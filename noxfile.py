@@ -47,3 +47,10 @@ def test(session):
     constraints_file = f"{CURRENT_DIRECTORY}/testing/constraints-{session.python}.txt"
     session.install('-e', '.', "-r", constraints_file)
     session.run('pytest', 'tests', *session.posargs)
+
+
+@nox.session(python=ALL_PYTHON[-1])
+def benchmark(session):
+    session.install("-r", f"{CURRENT_DIRECTORY}/requirements-dev.txt")
+    session.install('-e', '.')
+    session.run('python', '-m', 'benchmarks', *session.posargs)
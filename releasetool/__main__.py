@@ -13,26 +13,15 @@
 # limitations under the License.
 
 import functools
+import importlib
 import os
 
 import click
 
-import releasetool.secrets
-import releasetool.update_check
-import releasetool.commands.publish_reporter
-import releasetool.commands.start.python
-import releasetool.commands.start.python_tool
-import releasetool.commands.start.nodejs
-import releasetool.commands.start.java
-import releasetool.commands.start.ruby
-import releasetool.commands.start.go
-import releasetool.commands.tag.python
-import releasetool.commands.tag.python_tool
-import releasetool.commands.tag.nodejs
-import releasetool.commands.tag.java
-import releasetool.commands.tag.php
-import releasetool.commands.tag.ruby
-import releasetool.commands.tag.dotnet
+# Commands and their language modules are only imported when dispatched, so
+# that commands like publish-reporter-script don't pay for keyring, jwt,
+# cryptography and friends. Keep it that way: test_releasetool_main.py
+# checks which modules a bare import pulls in.
 
 
 class _OptionPromptIfNone(click.Option):
@@ -94,6 +83,17 @@ _language_choices = [
 ]
 
 
+# Languages with a releasetool.commands.start or releasetool.commands.tag module.
+_START_LANGUAGES = ["python", "python-tool", "nodejs", "java", "ruby", "go"]
+_TAG_LANGUAGES = ["python", "python-tool", "nodejs", "java", "php", "ruby", "dotnet"]
+
+
+def _load_language_module(command: str, language: str):
+    """Imports the module implementing a command for a language."""
+    module_name = language.replace("-", "_")
+    return importlib.import_module(f"releasetool.commands.{command}.{module_name}")
+
+
 def _language_option():
     return click.option(
         "--language",
@@ -107,45 +107,27 @@ def _language_option():
 @main.command()
 @_language_option()
 def start(language):
+    import releasetool.update_check
+
     releasetool.update_check.check_for_updates(
         "gcp-releasetool", print=functools.partial(click.secho, fg="magenta")
     )
 
-    if language == "python":
-        return releasetool.commands.start.python.start()
-    if language == "python-tool":
-        return releasetool.commands.start.python_tool.start()
-    if language == "nodejs":
-        return releasetool.commands.start.nodejs.start()
-    if language == "java":
-        return releasetool.commands.start.java.start()
-    if language == "ruby":
-        return releasetool.commands.start.ruby.start()
-    if language == "go":
-        return releasetool.commands.start.go.start()
+    if language in _START_LANGUAGES:
+        return _load_language_module("start", language).start()
 
 
 @main.command()
 @_language_option()
 def tag(language):
-    if language == "python":
-        return releasetool.commands.tag.python.tag()
-    if language == "python-tool":
-        return releasetool.commands.tag.python_tool.tag()
-    if language == "nodejs":
-        return releasetool.commands.tag.nodejs.tag()
-    if language == "java":
-        return releasetool.commands.tag.java.tag()
-    if language == "php":
-        return releasetool.commands.tag.php.tag()
-    if language == "ruby":
-        return releasetool.commands.tag.ruby.tag()
-    if language == "dotnet":
-        return releasetool.commands.tag.dotnet.tag()
+    if language in _TAG_LANGUAGES:
+        return _load_language_module("tag", language).tag()
 
 
 @main.command(name="reset-config")
 def reset_config():
+    import releasetool.secrets
+
     releasetool.secrets.delete_password()
 
 
@@ -162,6 +144,8 @@ def publish_reporter_start(
     installation_id_path: str,
     private_key_path: str,
 ):
+    import releasetool.commands.publish_reporter
+
     if app_id_path:
         github_token = github_jwt_dict(
             app_id_path, installation_id_path, private_key_path
@@ -186,6 +170,8 @@ def publish_reporter_finish(
     installation_id_path: str,
     private_key_path: str,
 ):
+    import releasetool.commands.publish_reporter
+
     if app_id_path:
         github_token = github_jwt_dict(
             app_id_path, installation_id_path, private_key_path
@@ -206,6 +192,8 @@ def github_jwt_dict(app_id_path: str, installation_id_path: str, private_key_pat
 
 @main.command(name="publish-reporter-script")
 def publish_reporter_script():
+    import releasetool.commands.publish_reporter
+
     releasetool.commands.publish_reporter.script()
 
 
@@ -0,0 +1,181 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Finds the release notes for a version in a CHANGELOG.md.
+
+The changelogs releasetool reads come in a few formats, all of which start a
+release with a `##` or `###` heading naming its version:
+
+    ## v0.8.2
+    ## [2.0.0](https://github.com/...) (2019-04-29)
+    ### [4.1.5](https://github.com/...) (2019-05-11)
+    ### 1.2.3 / 2019-05-11
+    ### 1.2.3 (2022-12-08)
+
+A release's notes run until the next `##` heading or the next heading naming
+a version, so `### Features` and `#### Features` stay within a release.
+"""
+
+import codecs
+import collections
+import re
+import threading
+from typing import Dict, Optional, Tuple
+
+import releasetool.github
+
+_HEADING = re.compile(r"^(#{2,3}) (.*)$", re.MULTILINE)
+_VERSION = re.compile(r"v?\[?(\d+\.\d+\.\d+[^\s\])]*)")
+
+# How many parsed changelogs to keep for repeated lookups.
+_CACHE_SIZE = 32
+
+# How much of a changelog to search for a release while downloading it. New
+# releases are at the top, so one found later means reading the whole file.
+_PREFIX_LIMIT = 64 * 1024
+
+
+class ChangelogIndex:
+    """Maps each version in a changelog to where its notes are.
+
+    The index is built with a single pass over the document's headings, and
+    each lookup after that only slices the text.
+    """
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.sections: Dict[str, Tuple[int, int]] = {}
+
+        version = None
+        start = 0
+        for match in _HEADING.finditer(text):
+            found = _VERSION.match(match.group(2))
+            if found is None and len(match.group(1)) != 2:
+                continue
+            if version is not None:
+                self._add(version, start, match.start())
+            version = found.group(1) if found else None
+            start = match.end() + 1
+        if version is not None:
+            self._add(version, start, len(text))
+
+    def _add(self, version: str, start: int, end: int) -> None:
+        # The first section for a version wins, should it appear twice.
+        self.sections.setdefault(version, (start, max(end - start, 0)))
+
+    @staticmethod
+    def _key(version: str) -> str:
+        # Tags carry a "v" that changelog headings may not.
+        return re.sub(r"^v", "", version)
+
+    def is_complete(self, version: str) -> bool:
+        """Returns whether the text holds all of a version's notes, that is,
+        whether another heading follows them. Text appended later, as more of
+        the changelog is read, can't change them."""
+        section = self.sections.get(self._key(version))
+        return section is not None and sum(section) < len(self.text)
+
+    def section(self, version: str) -> Optional[str]:
+        """Returns the notes for a version, or None if it isn't listed."""
+        version = self._key(version)
+        if version not in self.sections:
+            return None
+        offset, length = self.sections[version]
+        end = offset + length
+        return self.text[offset:end].strip()
+
+    def release_notes(self, version: str) -> str:
+        """Returns the notes for a version, or "" if it isn't listed."""
+        return self.section(version) or ""
+
+
+_cache: "collections.OrderedDict[Tuple[str, str, str], ChangelogIndex]" = (
+    collections.OrderedDict()
+)
+# Changelogs are looked up from worker threads. The lock isn't held while
+# fetching, so two threads may fetch the same changelog at once.
+_cache_lock = threading.Lock()
+
+
+def load(
+    github: releasetool.github.GitHub, repository: str, path: str, ref: str
+) -> ChangelogIndex:
+    """Fetches and indexes a changelog, reusing it for later lookups.
+
+    `ref` should be a commit sha, since the cached index is never refreshed.
+    """
+    key = (repository, path, ref)
+    index = _cached(key)
+    if index is not None:
+        return index
+
+    text = github.get_contents(repository, path, ref=ref).decode("utf-8")
+    return _remember(key, ChangelogIndex(text))
+
+
+def _cached(key: Tuple[str, str, str]) -> Optional[ChangelogIndex]:
+    with _cache_lock:
+        if key not in _cache:
+            return None
+        _cache.move_to_end(key)
+        return _cache[key]
+
+
+def _remember(key: Tuple[str, str, str], index: ChangelogIndex) -> ChangelogIndex:
+    with _cache_lock:
+        _cache[key] = index
+        if len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return index
+
+
+def release_notes(
+    github: releasetool.github.GitHub,
+    repository: str,
+    path: str,
+    ref: str,
+    version: str,
+) -> str:
+    """Returns the notes for a version, or "" if the changelog doesn't list it.
+
+    The changelog is streamed and the download stops as soon as the version's
+    notes and the heading after them have arrived, which for a new release is
+    usually within the first few kilobytes. If the version isn't near the top,
+    the whole file is read and indexed as `load` would.
+    """
+    key = (repository, path, ref)
+    index = _cached(key)
+    if index is not None:
+        return index.release_notes(version)
+
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts = []
+    size = 0
+    chunks = github.stream_contents(repository, path, ref=ref)
+    try:
+        for chunk in chunks:
+            parts.append(decoder.decode(chunk))
+            size += len(chunk)
+            if size > _PREFIX_LIMIT:
+                continue
+            text = "".join(parts)
+            # Leave out a partial last line, it may be half of a heading.
+            index = ChangelogIndex(text[: text.rfind("\n") + 1])
+            if index.is_complete(version):
+                return index.release_notes(version)
+    finally:
+        chunks.close()
+
+    parts.append(decoder.decode(b"", final=True))
+    return _remember(key, ChangelogIndex("".join(parts))).release_notes(version)
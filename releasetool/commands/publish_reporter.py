@@ -15,12 +15,12 @@
 """Used by publish CI jobs to report status back to GitHub."""
 
 import os
-import importlib
+import importlib.resources
 import re
 from typing import cast, Tuple, Union
-from requests import HTTPError
 
-import releasetool.github
+# requests and releasetool.github are imported by the functions that talk to
+# GitHub, since publish-reporter-script only needs to print a file.
 
 
 def figure_out_github_token(github_token: str) -> str:
@@ -75,6 +75,10 @@ def extract_pr_details(pr) -> Tuple[str, str, str]:
 
 def start(github_token_raw: Union[str, dict], pr: str) -> None:
     """Reports the start of a publication job to GitHub."""
+    from requests import HTTPError
+
+    import releasetool.github
+
     # If we are passed a dictionary for github_token, assume we are
     # retrieveing a JWT, and do not use magic proxy:
     use_proxy = True
@@ -123,6 +127,10 @@ def finish(
     github_token_raw: Union[str, dict], pr: str, status: bool, details: str
 ) -> None:
     """Reports the completion of a publication job to GitHub."""
+    from requests import HTTPError
+
+    import releasetool.github
+
     # If we are passed a dictionary for github_token, assume we are
     # retrieveing a JWT, and do not use magic proxy:
     use_proxy = True
@@ -90,11 +90,14 @@ def relative_module_name(modname) -> str:
 def determine_last_release(ctx: Context) -> None:
     click.secho("> Figuring out what the last release was.", fg="cyan")
     if ctx.relative_module_name is None:
-        prefix = "v"
+        prefix = ""
     else:
-        prefix = ctx.relative_module_name + "/v"
-    tags = releasetool.git.list_tags()
-    candidates = [tag for tag in tags if tag.startswith(prefix)]
+        prefix = ctx.relative_module_name + "/"
+    candidates = [
+        tag
+        for tag in releasetool.git.tag_versions(prefix)
+        if tag.startswith(prefix + "v")
+    ]
 
     if candidates:
         ctx.last_release_committish = candidates[0]
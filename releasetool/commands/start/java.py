@@ -12,11 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import copy
 import getpass
+import mmap
 import os
+import subprocess
 import textwrap
-from typing import List, Optional
+from typing import Dict, List, Match, Optional
 
 import attr
 import click
@@ -29,10 +32,17 @@ import releasetool.secrets
 import releasetool.commands.common
 
 VERSION_REGEX = re.compile(r"(\d+)\.(\d+)\.(\d+)(-\w+)?(-\w+)?")
-VERSION_UPDATE_MARKER = re.compile(r"\{x-version-update:([^:]+):([^}]+)\}")
-VERSION_UPDATE_START_MARKER = re.compile(r"\{x-version-update-start:([^:]+):([^}]+)\}")
-VERSION_UPDATE_END_MARKER = re.compile(r"\{x-version-update-end\}")
-RELEASE_TAG_REGEX = re.compile(r"v?(\d+)\.(\d+)\.(\d+)")
+# Matches {x-version-update:module:type}, {x-version-update-start:module:type}
+# and {x-version-update-end}, telling them apart by group name.
+VERSION_UPDATE_MARKERS = re.compile(
+    r"\{x-version-update(?:"
+    r"(?P<line>:([^:]+):([^}]+))|"
+    r"(?P<start>-start:([^:]+):([^}]+))|"
+    r"(?P<end>-end)"
+    r")\}"
+)
+_MARKER_TEXT = "x-version-update"
+_MARKER_BYTES = _MARKER_TEXT.encode("ascii")
 VERSION_REPLACEMENT_FILENAMES = {
     "README.md": True,
     "pom.xml": True,
@@ -40,6 +50,10 @@ VERSION_REPLACEMENT_FILENAMES = {
     "dependencies.properties": True,
     "GoogleUtils.java": True,
 }
+# Directories never searched for version markers outside of a git checkout.
+IGNORED_DIRECTORIES = {".git", ".gradle", ".idea", "node_modules", "target"}
+# Below this many files, starting a process pool costs more than it saves.
+_PARALLEL_THRESHOLD = 32
 
 
 class Version:
@@ -196,70 +210,152 @@ def update_versions(ctx: Context) -> None:
                 f.write("{}\n".format(versions))
 
 
-def replace_versions(ctx: Context) -> None:
+def find_version_files(where: str = ".") -> List[str]:
+    """Lists the files that may carry version markers.
+
+    Files come from git, so build output and anything else git ignores are
+    never read. Outside of a git checkout the tree is walked instead, skipping
+    the usual build and dependency directories.
+    """
+    try:
+        candidates = releasetool.git.ls_files(where)
+    except (OSError, subprocess.CalledProcessError):
+        candidates = []
+        for root, dirs, files in os.walk(where):
+            dirs[:] = [name for name in dirs if name not in IGNORED_DIRECTORIES]
+            candidates.extend(os.path.join(root, filename) for filename in files)
+
+    return [
+        path
+        for path in candidates
+        if os.path.basename(path) in VERSION_REPLACEMENT_FILENAMES
+        and os.path.isfile(path)
+    ]
+
+
+def replace_versions(ctx: Context, workers: int = None) -> None:
     """Replaces version strings in source and build files"""
     if click.confirm("Update versions in source and build files?", default=True):
-        updated_files = []
-        for root, _, files in os.walk("."):
-            for filename in files:
-                filepath = root + os.sep + filename
-                if filename in VERSION_REPLACEMENT_FILENAMES:
-                    replace_version_in_file(ctx.versions, filepath)
-                    updated_files.append(filepath)
-        ctx.updated_files = updated_files
-
-
-def replace_version_in_file(versions: List[ArtifactVersions], target: str):
-    """Replaces all annotated versions in a single file"""
-    newlines = []
-    version_map = {}
-    for av in versions:
-        version_map[av.module] = av
-
-    repl_open, repl_thisline = False, False
-    with open(target) as f:
-        # do something
-        for line in f:
+        ctx.updated_files = replace_versions_in_files(
+            ctx.versions, find_version_files(), workers=workers
+        )
+
+
+def replace_versions_in_files(
+    versions: List[ArtifactVersions], targets: List[str], workers: int = None
+) -> List[str]:
+    """Replaces annotated versions in many files, returning the changed ones.
+
+    Large multi-module repositories have hundreds of candidate files, so they
+    are spread across a process pool. A handful are done in this process.
+    """
+    rewriter = VersionRewriter(versions)
+    if len(targets) < _PARALLEL_THRESHOLD or workers == 1:
+        changed = [rewriter.rewrite_file(target) for target in targets]
+    else:
+        workers = workers or os.cpu_count() or 1
+        chunksize = max(1, len(targets) // (workers * 4))
+        # Hand each worker the rewriter once, rather than with every task.
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=workers, initializer=_set_worker_rewriter, initargs=(rewriter,)
+        ) as executor:
+            changed = list(
+                executor.map(_worker_rewrite_file, targets, chunksize=chunksize)
+            )
+    return [target for target, was_changed in zip(targets, changed) if was_changed]
+
+
+_worker_rewriter: Optional["VersionRewriter"] = None
+
+
+def _set_worker_rewriter(rewriter: "VersionRewriter") -> None:
+    global _worker_rewriter
+    _worker_rewriter = rewriter
+
+
+def _worker_rewrite_file(target: str) -> bool:
+    return _worker_rewriter.rewrite_file(target)
+
+
+class VersionRewriter:
+    """Rewrites the versions annotated with `x-version-update` markers.
+
+    The versions are formatted once, up front, so that many files can be
+    rewritten with the same instance, and each line is searched for markers
+    with a single pattern. Files without any marker are skipped before they
+    are decoded.
+    """
+
+    def __init__(self, versions: List[ArtifactVersions]) -> None:
+        self.versions = {
+            av.module: {"current": str(av.current), "released": str(av.released)}
+            for av in versions
+        }
+
+    def _version(self, module_name: str, version_type: str) -> str:
+        if module_name not in self.versions:
+            raise ValueError("module not found in version.txt: {}".format(module_name))
+        if version_type not in ("current", "released"):
+            raise ValueError("invalid version type: {}".format(version_type))
+        return self.versions[module_name][version_type]
+
+    def rewrite(self, text: str) -> str:
+        """Returns `text` with its annotated versions replaced."""
+        lines = text.split("\n")
+        repl_open = False
+        version = None
+        for index, line in enumerate(lines):
             repl_thisline = repl_open
-            match = VERSION_UPDATE_MARKER.search(line)
-            if match:
-                module_name, version_type = match.group(1), match.group(2)
-                repl_thisline = True
-            else:
-                match = VERSION_UPDATE_START_MARKER.search(line)
+            if _MARKER_TEXT in line:
+                # A line marking a single version takes precedence over one
+                # opening a block, which takes precedence over one closing it.
+                markers: Dict[str, Match[str]] = {}
+                for match in VERSION_UPDATE_MARKERS.finditer(line):
+                    markers.setdefault(match.lastgroup, match)
+                match = markers.get("line") or markers.get("start")
                 if match:
-                    module_name, version_type = match.group(1), match.group(2)
-                    repl_open, repl_thisline = True, True
-                else:
-                    match = VERSION_UPDATE_END_MARKER.search(line)
-                    if match:
-                        repl_open, repl_thisline = False, False
+                    module_name, version_type = match.group(
+                        match.lastindex + 1, match.lastindex + 2
+                    )
+                    version = self._version(module_name, version_type)
+                    repl_thisline = True
+                    if match.lastgroup == "start":
+                        repl_open = True
+                elif "end" in markers:
+                    repl_open, repl_thisline = False, False
 
             if repl_thisline:
-                if module_name not in version_map:
-                    raise ValueError(
-                        "module not found in version.txt: {}".format(module_name)
-                    )
-                module = version_map[module_name]
-                new_version = None
-                if version_type == "current":
-                    new_version = module.current
-                elif version_type == "released":
-                    new_version = module.released
-                else:
-                    raise ValueError("invalid version type: {}".format(version_type))
-
-                newline = re.sub(VERSION_REGEX, str(new_version), line)
-                newlines.append(newline)
-            else:
-                newlines.append(line)
+                lines[index] = VERSION_REGEX.sub(version, line)
+        return "\n".join(lines)
+
+    def rewrite_file(self, target: str) -> bool:
+        """Rewrites the versions in a single file, writing it only if a
+        version in it changed. Returns whether it did."""
+        with open(target, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                if mapped.find(_MARKER_BYTES) == -1:
+                    return False
+                data = mapped[:]
+
+        text = data.decode("utf-8", "surrogateescape")
+        rewritten = self.rewrite(text)
+        if rewritten == text:
+            return False
 
-            if not repl_open:
-                module_name, version_type = "", ""
+        with open(target, "wb") as f:
+            f.write(rewritten.encode("utf-8", "surrogateescape"))
+        return True
 
-    with open(target, "w") as f:
-        for line in newlines:
-            f.write(line)
+
+def replace_version_in_file(versions: List[ArtifactVersions], target: str) -> bool:
+    """Replaces all annotated versions in a single file.
+
+    The file is only written if a version in it changed. Returns whether it
+    was.
+    """
+    return VersionRewriter(versions).rewrite_file(target)
 
 
 def determine_package_name(ctx: Context) -> None:
@@ -270,8 +366,12 @@ def determine_package_name(ctx: Context) -> None:
 
 def determine_last_release(ctx: Context) -> None:
     click.secho("> Figuring out what the last release was.", fg="cyan")
-    tags = releasetool.git.list_tags()
-    candidates = [tag for tag in tags if RELEASE_TAG_REGEX.match(tag)]
+    # Tags look like v1.2.3 or 1.2.3, highest version first. Only releases
+    # made from the branch being released count, so a maintenance branch
+    # doesn't start from a newer release.
+    candidates = releasetool.git.tag_versions(
+        "", merged=f"{ctx.upstream_name}/{ctx.source_branch}"
+    )
 
     if candidates:
         ctx.last_release_committish = candidates[0]
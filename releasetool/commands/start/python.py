@@ -88,7 +88,14 @@ def find_last_release_tag(
 
 def determine_last_release(ctx: Context) -> None:
     click.secho("> Figuring out what the last release was.", fg="cyan")
-    tags = releasetool.git.list_tags()
+    if ctx.monorepo:
+        # tags look like storage-1.2.3
+        package_names = [ctx.package_name, ctx.package_name.replace("_", "-")]
+        prefixes = [f"{name}-" for name in package_names]
+    else:
+        prefixes = [""]
+    # Only releases made from the branch being released count.
+    tags = releasetool.git.tag_versions(*prefixes, merged=f"{ctx.upstream_name}/master")
 
     candidate = find_last_release_tag(tags, ctx.package_name, ctx.monorepo)
     if candidate is not None:
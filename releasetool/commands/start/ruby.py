@@ -60,15 +60,17 @@ def determine_package_name(ctx: Context) -> None:
 
 def gather_tags(ctx: Context) -> None:
     click.secho("> Figuring out what the last release was.", fg="cyan")
-    ctx.tags = releasetool.git.list_tags()
+    # Tags look like google-cloud-storage/v1.2.3, highest version first. Only
+    # releases made from the branch being released count.
+    merged = f"{ctx.upstream_name}/master"
+    ctx.tags = releasetool.git.tag_versions(f"{ctx.package_name}/", merged=merged)
+    if not ctx.tags and "google-cloud" not in ctx.package_name:
+        # Repositories with a single gem may tag releases as v1.2.3.
+        ctx.tags = releasetool.git.tag_versions("", merged=merged)
 
 
 def determine_last_release(ctx: Context) -> None:
-    candidates = [tag for tag in ctx.tags if tag.startswith(ctx.package_name + "/")]
-    if candidates and ctx.package_name in candidates[0]:
-        ctx.last_release_committish = candidates[0]
-        ctx.last_release_version = candidates[0].rsplit("/").pop().lstrip("v")
-    elif ("google-cloud" not in ctx.package_name) and ctx.tags:
+    if ctx.tags:
         ctx.last_release_committish = ctx.tags[0]
         ctx.last_release_version = ctx.tags[0].rsplit("/")[-1].lstrip("v")
     else:
@@ -87,17 +89,20 @@ def determine_last_release(ctx: Context) -> None:
 
 def gather_changes(ctx: Context) -> None:
     click.secho(f"> Gathering changes since {ctx.last_release_version}", fg="cyan")
-    ctx.changes = releasetool.git.summary_log(
-        from_=ctx.last_release_committish,
-        to=f"{ctx.upstream_name}/master",
-        format="%s%n%b%n",
-    )
+    ctx.changes = [
+        f"{commit.subject}\n{commit.body}"
+        for commit in releasetool.git.iter_log(
+            from_=ctx.last_release_committish, to=f"{ctx.upstream_name}/master"
+        )
+    ]
     click.secho(f"Cool, {len(ctx.changes)} changes found.")
 
 
 def edit_release_notes(ctx: Context) -> None:
     click.secho("> Opening your editor to finalize release notes.", fg="cyan")
-    release_notes = "\n".join(change.strip() for change in ctx.changes)
+    # Keep a blank line between commits, so one commit's trailers don't run
+    # into the next commit's subject.
+    release_notes = "\n\n".join(change.strip() for change in ctx.changes)
     ctx.release_notes = releasetool.filehelpers.open_editor_with_tempfile(
         release_notes, "release-notes.md"
     ).strip()
@@ -18,6 +18,7 @@ from typing import List, Union
 
 import click
 
+import releasetool.changelog
 import releasetool.circleci
 import releasetool.git
 import releasetool.github
@@ -83,23 +84,18 @@ def get_release_notes(ctx: TagContext) -> None:
     click.secho("> Grabbing the release notes.")
 
     changelog_path = "CHANGELOG.md"
-    changelog = ctx.github.get_contents(
-        ctx.upstream_repo, changelog_path, ref=ctx.release_pr["merge_commit_sha"]
-    ).decode("utf-8")
-
-    _get_latest_release_notes(ctx, changelog)
+    ctx.release_notes = releasetool.changelog.release_notes(
+        ctx.github,
+        ctx.upstream_repo,
+        changelog_path,
+        ref=ctx.release_pr["merge_commit_sha"],
+        version=ctx.release_version,
+    )
 
 
 def _get_latest_release_notes(ctx: TagContext, changelog: str):
-    match = re.search(
-        rf"## v?\[?{ctx.release_version}[^\n]*\n(?P<notes>.+?)(\n##\s|\n### \[?[0-9]+\.|\Z)",
-        changelog,
-        re.DOTALL | re.MULTILINE,
-    )
-    if match is not None:
-        ctx.release_notes = match.group("notes").strip()
-    else:
-        ctx.release_notes = ""
+    index = releasetool.changelog.ChangelogIndex(changelog)
+    ctx.release_notes = index.release_notes(ctx.release_version)
 
 
 def create_release(ctx: TagContext) -> None:
@@ -13,11 +13,11 @@
 # limitations under the License.
 
 import getpass
-import re
 from typing import Union
 
 import click
 
+import releasetool.changelog
 import releasetool.commands.common
 from releasetool.commands.common import TagContext
 from releasetool.commands.tag import python
@@ -25,19 +25,13 @@ from releasetool.commands.tag import python
 
 def get_release_notes(ctx: TagContext) -> None:
     click.secho("> Grabbing the release notes.")
-    changelog = ctx.github.get_contents(
-        ctx.upstream_repo, "CHANGELOG.md", ref=ctx.release_pr["merge_commit_sha"]
-    ).decode("utf-8")
-
-    match = re.search(
-        rf"## {ctx.release_version}\n(?P<notes>.+?)(\n##\s|\Z)",
-        changelog,
-        re.DOTALL | re.MULTILINE,
+    ctx.release_notes = releasetool.changelog.release_notes(
+        ctx.github,
+        ctx.upstream_repo,
+        "CHANGELOG.md",
+        ref=ctx.release_pr["merge_commit_sha"],
+        version=ctx.release_version,
     )
-    if match is not None:
-        ctx.release_notes = match.group("notes").strip()
-    else:
-        ctx.release_notes = ""
 
 
 def create_release(ctx: TagContext) -> None:
@@ -19,6 +19,7 @@ from typing import Union
 import click
 from requests import HTTPError
 
+import releasetool.changelog
 import releasetool.circleci
 import releasetool.git
 import releasetool.github
@@ -132,26 +133,14 @@ def get_release_notes(ctx: TagContext) -> None:
     for name in RUBY_MONO_REPOS:
         if name == repo_name:
             changelog_file = f"{ctx.package_name}/CHANGELOG.md"
-    changelog = ctx.github.get_contents(
-        ctx.upstream_repo, changelog_file, ref=ctx.release_pr["merge_commit_sha"]
-    ).decode("utf-8")
-
-    match = re.search(
-        rf"^### {ctx.release_version} \/ \d\d\d\d-\d\d-\d\d\n(?P<notes>.+?)(\n###\s|\Z)",
-        changelog,
-        re.DOTALL | re.MULTILINE,
+    # Headings look like "### 1.2.3 / 2019-05-11" or "### 1.2.3 (2022-12-08)".
+    ctx.release_notes = releasetool.changelog.release_notes(
+        ctx.github,
+        ctx.upstream_repo,
+        changelog_file,
+        ref=ctx.release_pr["merge_commit_sha"],
+        version=ctx.release_version,
     )
-    v13_match = re.search(
-        rf"^### {ctx.release_version} \(\d\d\d\d-\d\d-\d\d\)\n(?P<notes>.+?)(\n###\s|\Z)",
-        changelog,
-        re.DOTALL | re.MULTILINE,
-    )
-    if match is not None:
-        ctx.release_notes = match.group("notes").strip()
-    elif v13_match is not None:
-        ctx.release_notes = v13_match.group("notes").strip()
-    else:
-        ctx.release_notes = ""
 
     click.secho(f"Here's the release notes:\n\n{ctx.release_notes}\n")
 
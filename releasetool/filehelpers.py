@@ -12,13 +12,20 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import contextlib
+import itertools
+import mmap
 import os
 import re
+import shutil
 import tempfile
-from typing import Optional
+from typing import Iterable, Iterator, Optional, Pattern, Union
 
 import click
 
+# Edited files are copied to their replacement this many bytes at a time.
+_CHUNK_SIZE = 1024 * 1024
+
 
 def open_editor(filename: str, return_contents: bool = False) -> Optional[str]:
     click.edit(filename=filename)
@@ -50,36 +57,103 @@ def open_editor_with_tempfile(contents: str, suffix: str = ".txt") -> Optional[s
     return content
 
 
+@contextlib.contextmanager
+def _mapped(filename: str) -> Iterator[Union[mmap.mmap, bytes]]:
+    """Maps a file into memory, read only, for searching it as bytes."""
+    with open(filename, "rb") as fh:
+        if os.fstat(fh.fileno()).st_size == 0:
+            # Empty files can't be mapped.
+            yield b""
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+def _span(
+    content: Union[mmap.mmap, bytes], start: int, end: int = None
+) -> Iterator[bytes]:
+    """Yields part of the content in pieces of at most _CHUNK_SIZE bytes."""
+    end = len(content) if end is None else end
+    for position in range(start, end, _CHUNK_SIZE):
+        stop = min(position + _CHUNK_SIZE, end)
+        yield content[position:stop]
+
+
+def _write_temporary(filename: str, chunks: Iterable[bytes]) -> str:
+    """Streams chunks into a temporary file next to `filename`, returning its
+    path. Renaming it over `filename` makes the edit atomic."""
+    directory = os.path.dirname(os.path.abspath(filename))
+    handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as fh:
+            for chunk in chunks:
+                fh.write(chunk)
+        shutil.copymode(filename, temp_path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+
 def insert_before(
     filename: str, new_content: str, expr: str, separator: str = "\n"
 ) -> None:
-    with open(filename, "r+") as fh:
-        if not new_content.endswith(separator):
-            new_content += separator
+    """Inserts `new_content` before the first match of `expr`.
 
-        content = fh.read()
-        match = re.search(expr, content, re.MULTILINE)
+    The file is searched as UTF-8 bytes without being read into a string, and
+    left untouched if nothing matches.
+    """
+    if not new_content.endswith(separator):
+        new_content += separator
+
+    with _mapped(filename) as content:
+        match = re.search(expr.encode("utf-8"), content, re.MULTILINE)
 
         if not match:
             return
 
         position = match.start()
 
-        output = content[:position] + new_content + content[position:]
+        temp_path = _write_temporary(
+            filename,
+            itertools.chain(
+                _span(content, 0, position),
+                [new_content.encode("utf-8")],
+                _span(content, position),
+            ),
+        )
 
-        fh.seek(0)
-        fh.write(output)
+    # The file has to be unmapped before it can be replaced on Windows.
+    os.replace(temp_path, filename)
+
+
+def _substitute(
+    content: Union[mmap.mmap, bytes], pattern: Pattern[bytes], replacement: bytes
+) -> Iterator[bytes]:
+    position = 0
+    for match in pattern.finditer(content):
+        yield from _span(content, position, match.start())
+        yield match.expand(replacement)
+        position = match.end()
+    yield from _span(content, position)
 
 
 def replace(filename: str, expr: str, replacement: str) -> None:
-    with open(filename, "r+") as fh:
-        content = fh.read()
+    """Replaces every match of `expr`, like `re.sub`.
+
+    The file is left untouched if nothing matches.
+    """
+    pattern = re.compile(expr.encode("utf-8"))
+
+    with _mapped(filename) as content:
+        if not pattern.search(content):
+            return
 
-        content = re.sub(expr, replacement, content)
+        temp_path = _write_temporary(
+            filename, _substitute(content, pattern, replacement.encode("utf-8"))
+        )
 
-        fh.seek(0)
-        fh.write(content)
-        fh.truncate()
+    os.replace(temp_path, filename)
 
 
 def extract(filename: str, expr: str) -> str:
@@ -12,56 +12,338 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import atexit
+import codecs
+import os
 import re
 import subprocess
-from typing import Dict, Sequence
+import threading
+from typing import Dict, Generator, List, Optional, Sequence, Tuple, Union
+
+import attr
+
+# Streamed log records start with an ASCII record separator and their fields
+# end with NUL, which can't appear in commit messages or paths.
+_LOG_RECORD_START = "\x1e"
+_LOG_FORMAT = "%x1e%H%x00%s%x00%b%x00%(trailers:only,unfold)%x00"
+_LOG_CHUNK_SIZE = 64 * 1024
+
+
+class GitSession:
+    """Long-lived git plumbing for one working directory.
+
+    Object and ref lookups go through `git cat-file --batch-check` and
+    `git cat-file --batch` processes that stay open for the life of the
+    session, instead of forking git for each one. The config and the current
+    branch are memoized until a command that can change them runs.
+    """
+
+    def __init__(self, cwd: str = None) -> None:
+        self.cwd = cwd or os.getcwd()
+        self._lock = threading.Lock()
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._config: Optional[Dict[str, str]] = None
+        self._current_branch: Optional[str] = None
+        self.tags = TagIndex(self)
+
+    def run(self, *args: str) -> str:
+        return subprocess.check_output(["git", *args], cwd=self.cwd).decode("utf-8")
+
+    def _process(self, mode: str) -> subprocess.Popen:
+        process = self._processes.get(mode)
+        if process is not None and process.poll() is not None:
+            process.stdin.close()
+            process.stdout.close()
+            process = None
+        if process is None:
+            process = subprocess.Popen(
+                ["git", "cat-file", mode],
+                cwd=self.cwd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+            self._processes[mode] = process
+        return process
+
+    def _request(self, mode: str, rev: str) -> Tuple[subprocess.Popen, list]:
+        process = self._process(mode)
+        process.stdin.write(rev.encode("utf-8") + b"\n")
+        process.stdin.flush()
+        return process, process.stdout.readline().decode("utf-8").split()
+
+    def resolve(self, rev: str) -> Optional[str]:
+        """Returns the object name `rev` refers to, or None if there is none."""
+        if "\n" in rev:
+            return None
+        with self._lock:
+            _, header = self._request("--batch-check", rev)
+        # Missing objects come back as "<rev> missing" or "<rev> ambiguous".
+        if len(header) != 3:
+            return None
+        return header[0]
+
+    def read_object(self, rev: str) -> Optional[Tuple[str, bytes]]:
+        """Returns the type and contents of the object `rev` refers to."""
+        if "\n" in rev:
+            return None
+        with self._lock:
+            process, header = self._request("--batch", rev)
+            if len(header) != 3:
+                return None
+            size = int(header[2])
+            data = process.stdout.read(size + 1)[:size]
+        return header[1], data
+
+    def config(self) -> Dict[str, str]:
+        if self._config is None:
+            output = self.run("config", "--list")
+            lines = [line for line in output.split("\n") if line]
+            pairs = [line.split("=", 1) for line in lines]
+            self._config = {key: value for key, value in pairs}
+        return self._config
+
+    def current_branch(self) -> str:
+        if self._current_branch is None:
+            self._current_branch = self.run("rev-parse", "--abbrev-ref", "HEAD").strip()
+        return self._current_branch
+
+    def invalidate(self) -> None:
+        """Forgets the memoized config and branch, after git changed them."""
+        self._config = None
+        self._current_branch = None
+
+    def close(self) -> None:
+        with self._lock:
+            for process in self._processes.values():
+                process.stdin.close()
+                process.wait()
+                process.stdout.close()
+            self._processes = {}
+
+
+def _version_key(version: str) -> Optional[Tuple]:
+    """Sorts versions like 1.2.3 and v1.2.3-beta, putting releases after their
+    pre-releases. Returns None for anything that isn't a version."""
+    match = re.match(r"v?(\d+)\.(\d+)\.(\d+)(.*)$", version)
+    if not match:
+        return None
+    suffix = match[4]
+    return (int(match[1]), int(match[2]), int(match[3]), suffix == "", suffix)
+
+
+class TagIndex:
+    """The tags of a repository, looked up by prefix.
+
+    Tags are fetched from the remotes once, on first use. `git fetch --tags`
+    only transfers tags that are new, and each prefix is then listed with a
+    `git for-each-ref` pattern, so only the matching tags are read and sorted.
+    """
+
+    def __init__(self, git_session: GitSession) -> None:
+        self._session = git_session
+        self._fetched = False
+        self._by_prefix: Dict[Tuple[str, Optional[str]], List[str]] = {}
+
+    def fetch(self) -> None:
+        """Fetches new tags from the remote and forgets the listed ones."""
+        self._session.run("fetch", "--tags")
+        self._fetched = True
+        self._by_prefix = {}
+
+    def _list(self, prefix: str, merged: str = None) -> List[str]:
+        if not self._fetched:
+            self.fetch()
+        key = (prefix, merged)
+        if key not in self._by_prefix:
+            args = [
+                "for-each-ref",
+                "--sort=-creatordate",
+                "--format=%(refname:strip=2)",
+            ]
+            if merged:
+                args.append(f"--merged={merged}")
+            args.append(f"refs/tags/{prefix}*" if prefix else "refs/tags")
+            output = self._session.run(*args)
+            self._by_prefix[key] = [
+                tag for tag in output.split("\n") if tag.startswith(prefix) and tag
+            ]
+        return self._by_prefix[key]
+
+    def all(self) -> List[str]:
+        """Returns every tag, newest first."""
+        return list(self._list(""))
+
+    def versions(self, *prefixes: str, merged: str = None) -> List[str]:
+        """Returns the tags made of a prefix and a version, highest first.
+
+        Tags with the same version stay newest first. With `merged`, only the
+        tags reachable from that commit are returned, so a maintenance branch
+        doesn't pick up releases made on newer branches.
+        """
+        keyed = []
+        for prefix in dict.fromkeys(prefixes or ("",)):
+            skip = len(prefix)
+            for tag in self._list(prefix, merged):
+                key = _version_key(tag[skip:])
+                if key is not None:
+                    keyed.append((key, tag))
+        keyed.sort(key=lambda item: item[0], reverse=True)
+        return [tag for _, tag in keyed]
+
+
+_sessions: Dict[str, GitSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def session() -> GitSession:
+    """Returns the session for the current working directory."""
+    cwd = os.getcwd()
+    with _sessions_lock:
+        if cwd not in _sessions:
+            _sessions[cwd] = GitSession(cwd)
+        return _sessions[cwd]
+
+
+@atexit.register
+def _close_sessions() -> None:
+    with _sessions_lock:
+        for git_session in _sessions.values():
+            git_session.close()
+        _sessions.clear()
 
 
 def list_tags() -> Sequence[str]:
-    subprocess.check_output(["git", "fetch", "--tags"])
-    output = subprocess.check_output(
-        ["git", "tag", "--list", "--sort=-creatordate"]
-    ).decode("utf-8")
-    tags = output.split("\n")
+    """Returns every tag, newest first."""
+    return session().tags.all()
 
-    return tags
+
+def tag_versions(*prefixes: str, merged: str = None) -> List[str]:
+    """Returns the tags made of one of `prefixes` and a version, such as
+    `storage-1.2.3` for the prefix `storage-`, highest version first.
+
+    With `merged`, only tags that are ancestors of that commit are returned.
+    """
+    return session().tags.versions(*prefixes, merged=merged)
 
 
 def get_latest_commit(branch: str) -> str:
-    commit = subprocess.check_output(
-        ["git", "log", "-1", branch, "--pretty=%H"]
-    ).decode("utf-8")
-    return commit
+    commit = session().resolve(f"{branch}^{{commit}}")
+    if commit:
+        return f"{commit}\n"
+    # Let git report why the branch can't be found.
+    return session().run("log", "-1", branch, "--pretty=%H")
+
+
+@attr.s(auto_attribs=True, slots=True)
+class Commit:
+    sha: str
+    subject: str
+    body: str
+    trailers: Dict[str, List[str]] = attr.Factory(dict)
+    paths: List[str] = attr.Factory(list)
+
+
+def _parse_trailers(text: str) -> Dict[str, List[str]]:
+    trailers: Dict[str, List[str]] = {}
+    for line in text.split("\n"):
+        key, separator, value = line.partition(":")
+        if separator:
+            trailers.setdefault(key.strip(), []).append(value.strip())
+    return trailers
+
+
+def _parse_log_record(record: str) -> Commit:
+    fields = record.split("\0")
+    sha, subject, body, trailers = fields[:4]
+    # With --name-only, git puts a newline before the first path.
+    paths = [path.lstrip("\n") for path in fields[4:]]
+    return Commit(
+        sha=sha,
+        subject=subject,
+        body=body.strip(),
+        trailers=_parse_trailers(trailers),
+        paths=[path for path in paths if path],
+    )
+
+
+def iter_log(
+    from_: str,
+    to: str = "master",
+    where: Union[str, Sequence[str]] = ".",
+    paths: bool = False,
+) -> Generator[Commit, None, None]:
+    """Yields the commits in `from_..to` that touch `where`, newest first.
+
+    Commits are parsed as git produces them, so memory use doesn't grow with
+    the size of the range. With `paths`, each commit lists the files it
+    touched. Closing the generator early stops git.
+    """
+    where = [where] if isinstance(where, str) else list(where)
+    args = ["git", "log", "-z", f"--format={_LOG_FORMAT}"]
+    if paths:
+        args.append("--name-only")
+    args += [f"{from_}..{to}", "--", *where]
+
+    process = subprocess.Popen(args, cwd=session().cwd, stdout=subprocess.PIPE)
+    # Chunks can end in the middle of a multi-byte character.
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    try:
+        pending = ""
+        while True:
+            chunk = process.stdout.read(_LOG_CHUNK_SIZE)
+            if not chunk:
+                break
+            pending += decoder.decode(chunk)
+            records = pending.split(_LOG_RECORD_START)
+            pending = records.pop()
+            for record in records:
+                if record:
+                    yield _parse_log_record(record)
+        if pending:
+            yield _parse_log_record(pending)
+    finally:
+        if process.poll() is None:
+            process.kill()
+        process.stdout.close()
+        returncode = process.wait()
+
+    if returncode:
+        raise subprocess.CalledProcessError(returncode, args)
 
 
 def summary_log(
     from_: str, to: str = "master", where: str = ".", format: str = "%s"
 ) -> Sequence[str]:
-    output = subprocess.check_output(
-        ["git", "log", f"--format={format}", f"{from_}..{to}", where]
-    ).decode("utf-8")
+    output = session().run("log", f"--format={format}", f"{from_}..{to}", where)
     commits = output.strip().split("\n")
     return commits
 
 
 def log(from_: str, to: str = "master", where: str = ".") -> Sequence[str]:
-    return subprocess.check_output(["git", "log", f"{from_}..{to}", where]).decode(
-        "utf-8"
-    )
+    return session().run("log", f"{from_}..{to}", where)
 
 
 def diff(from_: str, to: str = "master", where: str = ".") -> Sequence[str]:
-    return subprocess.check_output(
-        ["git", "diff", f"{from_}..{to}", "--", where]
-    ).decode("utf-8")
+    return session().run("diff", f"{from_}..{to}", "--", where)
+
+
+def ls_files(where: str = ".") -> List[str]:
+    """Returns the tracked and untracked files under `where`, leaving out the
+    ones git ignores, relative to the working directory."""
+    output = session().run(
+        "ls-files", "-z", "--cached", "--others", "--exclude-standard", "--", where
+    )
+    return [path for path in output.split("\0") if path]
 
 
 def checkout_create_branch(branch_name: str, base: str = "master") -> None:
     subprocess.check_output(["git", "checkout", "-b", branch_name, base])
+    session().invalidate()
 
 
 def checkout_branch(branch_name: str) -> None:
     subprocess.check_output(["git", "checkout", branch_name])
+    session().invalidate()
 
 
 def commit(files: Sequence[str], message: str) -> None:
@@ -73,16 +355,12 @@ def commit(files: Sequence[str], message: str) -> None:
 def push(branch: str, remote: str = "origin") -> None:
     """Push the release branch to the remote."""
     subprocess.check_output(["git", "push", "-u", remote, branch])
+    # Pushing with -u records the upstream branch in the config.
+    session().invalidate()
 
 
 def get_config() -> Dict[str, str]:
-    output = subprocess.check_output(["git", "config", "--list"]).decode("utf-8")
-
-    lines = [line for line in output.split("\n") if line]
-    pairs = [line.split("=", 1) for line in lines]
-    config = {key: value for key, value in pairs}
-
-    return config
+    return dict(session().config())
 
 
 def get_remotes() -> Dict[str, str]:
@@ -125,8 +403,4 @@ def get_github_remotes() -> Dict[str, str]:
 
 def current_branch() -> str:
     """Returns the name of the current working branch."""
-    return (
-        subprocess.check_output(["git", "rev-parse", "--abbrev-ref", "HEAD"])
-        .strip()
-        .decode("utf-8")
-    )
+    return session().current_branch()
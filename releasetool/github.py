@@ -13,18 +13,21 @@
 # limitations under the License.
 
 import base64
+import functools
 import json
 import os
 import re
 import time
 
-from typing import cast, List, Sequence, Union
+from typing import cast, Dict, Generator, List, Optional, Sequence, Union
 
 import jwt
 import requests
 
 from cryptography.hazmat.primitives import serialization
 
+from releasetool import http_cache, rate_limit, token_cache
+
 
 _GITHUB_ROOT: str = "https://api.github.com"
 _GITHUB_UI_ROOT: str = "https://github.com"
@@ -37,6 +40,15 @@ _GITHUB_UI_ROOT: str = "https://github.com"
 _MAGIC_GITHUB_PROXY_ROOT: str = (
     "https://magic-github-proxy.endpoints.devrel-prod.cloud.goog"
 )
+# Directory for the conditional request cache, used when no cache_dir is given.
+_HTTP_CACHE_DIR_ENV: str = "RELEASETOOL_HTTP_CACHE_DIR"
+# How many tags to resolve in a single GraphQL query.
+_GRAPHQL_REFS_PER_QUERY: int = 50
+# What a tag points at, followed through one annotated tag to its commit.
+_GRAPHQL_TAG_TARGET: str = (
+    "{ target { ...TargetFields ... on Tag { target { ...TargetFields } } } }"
+)
+_GRAPHQL_TARGET_FIELDS: str = "fragment TargetFields on GitObject { __typename oid }\n"
 
 
 def _find_devrel_api_key() -> str:
@@ -89,46 +101,66 @@ class GitHubToken:
         return GitHubToken(access_token, "token")
 
 
+@functools.lru_cache(maxsize=8)
+def _load_private_key(private_key_str: str):
+    """Parses a PEM private key, which is slow enough to be worth reusing."""
+    return serialization.load_pem_private_key(
+        private_key_str.encode(), None, unsafe_skip_rsa_key_validation=False
+    )
+
+
 def get_installation_access_token(
-    app_id: str, installation_id: str, private_key_str: str
+    app_id: str,
+    installation_id: str,
+    private_key_str: str,
+    cache: token_cache.TokenCache = None,
 ) -> str:
     """Use GitHub API to exchange app_id, installation_id, and private_key
     for an installation-specific access_token, see:
     https://developer.github.com/apps/building-github-apps/authenticating-with-github-apps/#authenticating-as-a-github-app
+
+    Tokens are reused until shortly before they expire. Without a cache, the
+    process-wide one from `token_cache.default_cache` is used.
     """
-    time_since_epoch_in_seconds = int(time.time())
-    payload = {
-        "iat": time_since_epoch_in_seconds,
-        "exp": time_since_epoch_in_seconds + (10 * 60),
-        "iss": app_id,
-    }
-
-    private_key_bytes = private_key_str.encode()
-    private_key = serialization.load_pem_private_key(
-        private_key_bytes, None, unsafe_skip_rsa_key_validation=False
-    )
-    app_jwt = jwt.encode(payload, private_key, algorithm="RS256")
-
-    headers = {
-        "Authorization": "Bearer {}".format(app_jwt),
-        "Accept": "application/vnd.github.machine-man-preview+json",
-    }
-
-    resp = requests.post(
-        "https://api.github.com/app/installations/{}/access_tokens".format(
-            installation_id
-        ),
-        headers=headers,
-    )
 
-    if resp.status_code != 201:
-        raise Exception("Could exchange certificate for JWT.")
-    return json.loads(resp.content.decode())["token"]
+    def create_access_token() -> dict:
+        time_since_epoch_in_seconds = int(time.time())
+        payload = {
+            "iat": time_since_epoch_in_seconds,
+            "exp": time_since_epoch_in_seconds + (10 * 60),
+            "iss": app_id,
+        }
+
+        private_key = _load_private_key(private_key_str)
+        app_jwt = jwt.encode(payload, private_key, algorithm="RS256")
+
+        headers = {
+            "Authorization": "Bearer {}".format(app_jwt),
+            "Accept": "application/vnd.github.machine-man-preview+json",
+        }
+
+        resp = requests.post(
+            "https://api.github.com/app/installations/{}/access_tokens".format(
+                installation_id
+            ),
+            headers=headers,
+        )
+
+        if resp.status_code != 201:
+            raise Exception("Could exchange certificate for JWT.")
+        return json.loads(resp.content.decode())
+
+    if cache is None:
+        cache = token_cache.default_cache()
+    return cache.get(app_id, installation_id, create_access_token)
 
 
 class GitHub:
     def __init__(
-        self, maybe_token: Union[GitHubToken, str], use_proxy: bool = False
+        self,
+        maybe_token: Union[GitHubToken, str],
+        use_proxy: bool = False,
+        cache_dir: str = None,
     ) -> None:
         if type(maybe_token) is str:
             token = GitHubToken(cast(str, maybe_token), "Bearer")
@@ -148,6 +180,17 @@ class GitHub:
             # To use the proxy, we need an api key for the magic github proxy.
             self.session.params = {"key": _find_devrel_api_key()}
 
+        self.rate_limiter = rate_limit.for_token(token.get_token())
+        adapter: requests.adapters.BaseAdapter = rate_limit.RateLimitAdapter(
+            self.rate_limiter
+        )
+        self.cache_dir = cache_dir or os.environ.get(_HTTP_CACHE_DIR_ENV)
+        if self.cache_dir:
+            adapter = http_cache.CachingAdapter(
+                http_cache.HttpCache(self.cache_dir), adapter
+            )
+        self.session.mount("https://", adapter)
+
     def list_pull_requests(
         self, repository: str, state: str = None, merged: bool = True
     ) -> Sequence[dict]:
@@ -200,6 +243,28 @@ class GitHub:
         response.raise_for_status()
         return base64.b64decode(response.json()["content"])
 
+    def stream_contents(
+        self,
+        repository: str,
+        path: str,
+        ref: str = None,
+        chunk_size: int = 16 * 1024,
+    ) -> Generator[bytes, None, None]:
+        """Yields a file's raw contents as they arrive.
+
+        Closing the generator early stops the download, so callers that only
+        need the start of a file don't pay for the rest of it.
+        """
+        url = f"{self.GITHUB_ROOT}/repos/{repository}/contents/{path}"
+        with self.session.get(
+            url,
+            params={"ref": ref},
+            headers={"Accept": "application/vnd.github.raw"},
+            stream=True,
+        ) as response:
+            response.raise_for_status()
+            yield from response.iter_content(chunk_size)
+
     def create_release(
         self,
         repository: str,
@@ -273,16 +338,75 @@ class GitHub:
         response.raise_for_status()
         return response.json()
 
-    def get_tag_sha(self, repository: str, tag_name: str) -> str:
-        url = f"{self.GITHUB_ROOT}/repos/{repository}/tags"
+    def get_tag_sha(self, repository: str, tag_name: str) -> Optional[str]:
+        """Returns the sha of the commit a tag points at, or None if there is
+        no such tag. Annotated tags are followed to their commit."""
+        url = f"{self.GITHUB_ROOT}/repos/{repository}/git/ref/tags/{tag_name}"
         response = self.session.get(url)
+        if response.status_code == 404:
+            return None
         response.raise_for_status()
 
-        for tag in response.json():
-            if tag["name"] == tag_name:
-                return tag["commit"]["sha"]
+        target = response.json()["object"]
+        while target["type"] == "tag":
+            url = f"{self.GITHUB_ROOT}/repos/{repository}/git/tags/{target['sha']}"
+            response = self.session.get(url)
+            response.raise_for_status()
+            target = response.json()["object"]
+
+        return target["sha"]
+
+    def get_tag_shas(
+        self, repository: str, tag_names: Sequence[str]
+    ) -> Dict[str, Optional[str]]:
+        """Looks up many tags at once, like `get_tag_sha`.
+
+        Tags are resolved with one GraphQL query per _GRAPHQL_REFS_PER_QUERY of
+        them, so checking every package of a monorepo release is one request.
+
+        Returns:
+            Dict[str, Optional[str]]: Map of tag name to the sha of the commit
+                it points at, or None if there is no such tag.
+        """
+        owner, name = repository.split("/", 1)
+        shas: Dict[str, Optional[str]] = {}
+        for start in range(0, len(tag_names), _GRAPHQL_REFS_PER_QUERY):
+            stop = start + _GRAPHQL_REFS_PER_QUERY
+            chunk = tag_names[start:stop]
+            aliases = [
+                f"tag{index}: ref(qualifiedName: {json.dumps('refs/tags/' + tag)}) "
+                + _GRAPHQL_TAG_TARGET
+                for index, tag in enumerate(chunk)
+            ]
+            query = (
+                f"query {{ repository(owner: {json.dumps(owner)}, "
+                f"name: {json.dumps(name)}) {{\n"
+                + "\n".join(aliases)
+                + "\n} }\n"
+                + _GRAPHQL_TARGET_FIELDS
+            )
 
-        return None
+            response = self.session.post(
+                f"{self.GITHUB_ROOT}/graphql", json={"query": query}
+            )
+            response.raise_for_status()
+            data = (response.json().get("data") or {}).get("repository") or {}
+
+            for index, tag in enumerate(chunk):
+                ref = data.get(f"tag{index}")
+                if ref is None:
+                    shas[tag] = None
+                    continue
+                target = ref["target"]
+                if target["__typename"] == "Tag":
+                    target = target["target"]
+                if target["__typename"] == "Commit":
+                    shas[tag] = target["oid"]
+                else:
+                    # A tag of a tag, follow the chain the slow way.
+                    shas[tag] = self.get_tag_sha(repository, tag)
+
+        return shas
 
     def delete_branch(self, repository: str, branch: str):
         url = f"{_GITHUB_ROOT}/repos/{repository}/git/refs/heads/{branch}"
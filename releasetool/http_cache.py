@@ -0,0 +1,192 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""An on-disk cache for conditional GitHub GET requests.
+
+GitHub does not count 304 Not Modified responses against the primary rate
+limit, so replaying the ETag / Last-Modified validators of a previous
+response is much cheaper than fetching the same resource again.
+"""
+
+import base64
+import collections
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+_DEFAULT_MAX_BYTES: int = 256 * 1024 * 1024
+
+
+class HttpCache:
+    """Stores GET responses on disk, keyed by method, URL and Accept header.
+
+    The cache holds at most `max_bytes` of responses. Reading an entry marks it
+    as recently used, and the least recently used entries are evicted first.
+    The directory is listed once, on first use, and entry sizes are tracked in
+    memory after that.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = _DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Entry sizes by key, least recently used first.
+        self._sizes: Optional["collections.OrderedDict[str, int]"] = None
+        self._total_bytes = 0
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        accept = request.headers.get("Accept", "")
+        raw = f"{request.method} {request.url} {accept}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+            # Bump the modification time, which orders the entries the next
+            # time the directory is listed.
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        with self._lock:
+            sizes = self._load_sizes()
+            if key in sizes:
+                sizes.move_to_end(key)
+        return entry
+
+    def put(self, key: str, response: requests.Response) -> None:
+        entry = {
+            "url": response.url,
+            "status_code": response.status_code,
+            "headers": dict(response.headers),
+            "content": base64.b64encode(response.content).decode("utf-8"),
+        }
+        data = json.dumps(entry).encode("utf-8")
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as fh:
+                fh.write(data)
+            os.replace(temp_path, self._path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+
+        with self._lock:
+            sizes = self._load_sizes()
+            self._total_bytes += len(data) - sizes.pop(key, 0)
+            sizes[key] = len(data)
+            self._evict(sizes)
+
+    def _load_sizes(self) -> "collections.OrderedDict[str, int]":
+        """Lists the entries already on disk, oldest first. Must be called
+        with the lock held."""
+        if self._sizes is not None:
+            return self._sizes
+
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, os.path.splitext(name)[0], stat.st_size))
+
+        entries.sort()
+        self._sizes = collections.OrderedDict((key, size) for _, key, size in entries)
+        self._total_bytes = sum(self._sizes.values())
+        return self._sizes
+
+    def _evict(self, sizes: "collections.OrderedDict[str, int]") -> None:
+        while self._total_bytes > self.max_bytes and sizes:
+            key, size = sizes.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+
+def _response_from_entry(
+    entry: dict, request: requests.PreparedRequest, not_modified: requests.Response
+) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status_code"]
+    response.reason = "OK"
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    # Keep the fresh rate limit headers from the 304 response.
+    response.headers.update(not_modified.headers)
+    response._content = base64.b64decode(entry["content"])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.url = entry["url"]
+    response.request = request
+    response.connection = not_modified.connection
+    return response
+
+
+class CachingAdapter(requests.adapters.BaseAdapter):
+    """A transport adapter that sends conditional requests for cached GETs.
+
+    Other methods, streamed requests and responses without validators are
+    passed straight through to the wrapped adapter.
+    """
+
+    def __init__(
+        self, cache: HttpCache, adapter: requests.adapters.BaseAdapter = None
+    ) -> None:
+        super().__init__()
+        self.cache = cache
+        self.adapter = adapter or requests.adapters.HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        if request.method != "GET" or kwargs.get("stream"):
+            return self.adapter.send(request, **kwargs)
+
+        key = self.cache.key(request)
+        entry = self.cache.get(key)
+        if entry:
+            headers = CaseInsensitiveDict(entry["headers"])
+            if "ETag" in headers:
+                request.headers["If-None-Match"] = headers["ETag"]
+            if "Last-Modified" in headers:
+                request.headers["If-Modified-Since"] = headers["Last-Modified"]
+
+        response = self.adapter.send(request, **kwargs)
+
+        if response.status_code == 304 and entry:
+            return _response_from_entry(entry, request, response)
+
+        if response.status_code == 200 and (
+            "ETag" in response.headers or "Last-Modified" in response.headers
+        ):
+            self.cache.put(key, response)
+
+        return response
+
+    def close(self) -> None:
+        self.adapter.close()
@@ -0,0 +1,253 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Paces GitHub requests using the rate limit headers of earlier responses.
+
+GitHub keeps a separate budget for each resource ("core", "search",
+"graphql", ...). Every response reports the budget it was charged against in
+X-RateLimit-Resource, along with X-RateLimit-Remaining and X-RateLimit-Reset.
+Each budget is tracked as a token bucket that refills when its window resets.
+Once a bucket runs low, the remaining tokens are spread over the rest of the
+window rather than spent in a burst. Secondary rate limits, which are
+reported as a 403 or 429 with Retry-After, pause the whole bucket and the
+request is retried.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+
+# Budgets used before GitHub has reported the real ones.
+_DEFAULT_LIMITS: Dict[str, int] = {"search": 30}
+_DEFAULT_WINDOW: float = 60.0
+# Start spreading requests out once this fraction of the budget is left.
+_DEFAULT_RESERVE: float = 0.1
+# GitHub asks clients to wait at least a minute after a secondary rate limit
+# that comes without a Retry-After header.
+_SECONDARY_LIMIT_WAIT: float = 60.0
+_DEFAULT_MAX_RETRIES: int = 3
+
+
+class _Bucket:
+    def __init__(self, limit: Optional[int], window: float, now: float) -> None:
+        self.limit = limit
+        self.remaining: Optional[float] = limit
+        self.reset = now + window if limit is not None else None
+        self.window = window
+        self.paused_until = 0.0
+        self.next_request = 0.0
+        self.throttled = 0
+        self.waited = 0.0
+
+    def refill(self, now: float) -> None:
+        if self.reset is not None and now >= self.reset:
+            self.remaining = self.limit
+            self.reset = now + self.window
+
+    def delay(self, now: float, reserve: float) -> float:
+        """Returns how long to wait before the next request may be sent."""
+        self.refill(now)
+        delay = max(self.paused_until, self.next_request) - now
+        if self.remaining is None or self.reset is None:
+            return max(delay, 0.0)
+
+        if self.remaining < 1:
+            return max(delay, self.reset - now)
+        return max(delay, 0.0)
+
+    def take(self, now: float, reserve: float) -> None:
+        """Takes a token for a request that is about to be sent."""
+        if self.remaining is None or self.reset is None:
+            return
+
+        if self.limit and self.remaining < self.limit * reserve:
+            # Spread the rest of the budget over the rest of the window.
+            self.next_request = now + (self.reset - now) / self.remaining
+        self.remaining -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "remaining": None if self.remaining is None else int(self.remaining),
+            "reset": self.reset,
+            "throttled": self.throttled,
+            "waited": self.waited,
+        }
+
+
+class RateLimiter:
+    """Tracks the rate limit budgets of one GitHub token.
+
+    The limiter is thread safe, and can be shared by every client and thread
+    that uses the same token. See `for_token`.
+    """
+
+    def __init__(
+        self,
+        reserve: float = _DEFAULT_RESERVE,
+        max_retries: int = _DEFAULT_MAX_RETRIES,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.reserve = reserve
+        self.max_retries = max_retries
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, _Bucket] = {}
+
+    @staticmethod
+    def resource_for(url: str) -> str:
+        """Guesses which budget a request will be charged against."""
+        path = requests.utils.urlparse(url).path
+        if path.startswith("/search/"):
+            return "search"
+        if path == "/graphql":
+            return "graphql"
+        return "core"
+
+    def _bucket(self, resource: str) -> _Bucket:
+        if resource not in self._buckets:
+            self._buckets[resource] = _Bucket(
+                _DEFAULT_LIMITS.get(resource), _DEFAULT_WINDOW, self._clock()
+            )
+        return self._buckets[resource]
+
+    def acquire(self, resource: str) -> None:
+        """Blocks until a request may be sent, then takes a token for it."""
+        while True:
+            with self._lock:
+                bucket = self._bucket(resource)
+                now = self._clock()
+                delay = bucket.delay(now, self.reserve)
+                if delay <= 0:
+                    bucket.take(now, self.reserve)
+                    return
+                bucket.throttled += 1
+                bucket.waited += delay
+            self._sleep(delay)
+
+    def update(self, resource: str, response: requests.Response) -> str:
+        """Updates a budget from the rate limit headers of a response.
+
+        Returns the resource GitHub actually charged, which may differ from
+        the guess that was passed in.
+        """
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return resource
+
+        with self._lock:
+            bucket = self._bucket(resource)
+            bucket.limit = limit
+            # Responses can arrive out of order, so never raise the budget
+            # within the same window.
+            if bucket.reset != reset or bucket.remaining is None:
+                bucket.remaining = remaining
+            else:
+                bucket.remaining = min(bucket.remaining, remaining)
+            bucket.reset = reset
+        return resource
+
+    def retry_delay(
+        self, resource: str, response: requests.Response, attempt: int
+    ) -> Optional[float]:
+        """Returns how long to wait before retrying a rate limited request.
+
+        Returns None if the response was not rate limited, or if the request
+        has been retried too many times already.
+        """
+        if response.status_code not in (403, 429) or attempt >= self.max_retries:
+            return None
+
+        now = self._clock()
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                delay = _SECONDARY_LIMIT_WAIT
+        elif response.headers.get("X-RateLimit-Remaining") == "0":
+            reset = float(response.headers.get("X-RateLimit-Reset", now))
+            delay = max(reset - now, 0.0) + 1.0
+        elif "secondary rate limit" in response.text.lower():
+            delay = _SECONDARY_LIMIT_WAIT * (2**attempt)
+        else:
+            # A 403 for some other reason, such as missing permissions.
+            return None
+
+        with self._lock:
+            bucket = self._bucket(resource)
+            bucket.paused_until = max(bucket.paused_until, now + delay)
+        return delay
+
+    def stats(self) -> Dict[str, dict]:
+        """Returns the remaining budget and the time spent waiting per resource."""
+        with self._lock:
+            return {
+                resource: bucket.stats() for resource, bucket in self._buckets.items()
+            }
+
+
+class RateLimitAdapter(requests.adapters.BaseAdapter):
+    """A transport adapter that paces requests through a RateLimiter."""
+
+    def __init__(
+        self, limiter: RateLimiter, adapter: requests.adapters.BaseAdapter = None
+    ) -> None:
+        super().__init__()
+        self.limiter = limiter
+        self.adapter = adapter or requests.adapters.HTTPAdapter()
+
+    def send(self, request: requests.PreparedRequest, **kwargs) -> requests.Response:
+        resource = self.limiter.resource_for(request.url)
+        attempt = 0
+        while True:
+            self.limiter.acquire(resource)
+            response = self.adapter.send(request, **kwargs)
+            resource = self.limiter.update(resource, response)
+
+            delay = self.limiter.retry_delay(resource, response, attempt)
+            if delay is None:
+                return response
+            response.close()
+            attempt += 1
+
+    def close(self) -> None:
+        self.adapter.close()
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def for_token(token: str) -> RateLimiter:
+    """Returns the process wide limiter for a GitHub token.
+
+    Rate limits are charged per token, so every client that uses the same
+    token shares one limiter.
+    """
+    key = hashlib.sha256((token or "").encode("utf-8")).hexdigest()
+    with _limiters_lock:
+        if key not in _limiters:
+            _limiters[key] = RateLimiter()
+        return _limiters[key]
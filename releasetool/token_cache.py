@@ -0,0 +1,134 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""A cache for GitHub App installation access tokens.
+
+Installation tokens are valid for an hour, so exchanging a fresh JWT for one
+on every call wastes a signing operation and a round trip. Tokens are kept in
+memory and, when a path is given, in a JSON file only readable by its owner,
+so that separate processes of the same job can share them.
+"""
+
+import calendar
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# File for sharing tokens between processes, used when no path is given.
+TOKEN_CACHE_FILE_ENV: str = "RELEASETOOL_TOKEN_CACHE_FILE"
+
+# Tokens are replaced this many seconds before they expire, so that a token
+# handed out is still good for the requests made with it.
+_REFRESH_MARGIN: int = 5 * 60
+
+# GitHub documents installation tokens as lasting an hour.
+_DEFAULT_LIFETIME: int = 60 * 60
+
+
+def parse_expires_at(expires_at: Optional[str]) -> float:
+    """Converts GitHub's `expires_at`, like 2016-07-11T22:14:10Z, to epoch
+    seconds. Tokens without one are assumed to last the default hour."""
+    if not expires_at:
+        return time.time() + _DEFAULT_LIFETIME
+    return float(calendar.timegm(time.strptime(expires_at, "%Y-%m-%dT%H:%M:%SZ")))
+
+
+class TokenCache:
+    """Remembers installation access tokens by app and installation id."""
+
+    def __init__(self, path: str = None, refresh_margin: int = _REFRESH_MARGIN):
+        self.path = path
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._tokens: Dict[str, dict] = {}
+
+    @staticmethod
+    def key(app_id: str, installation_id: str) -> str:
+        return f"{app_id}/{installation_id}"
+
+    def _load(self) -> Dict[str, dict]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            # A missing or corrupt cache is just a cold cache.
+            return {}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # mkstemp creates the file readable and writable by its owner only.
+        handle, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "w", encoding="utf-8") as fh:
+                json.dump(self._tokens, fh)
+            os.replace(temp_path, self.path)
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _fresh(self, entry: Optional[dict]) -> bool:
+        return bool(entry) and entry["expires_at"] - self.refresh_margin > time.time()
+
+    def get(
+        self,
+        app_id: str,
+        installation_id: str,
+        fetch: Callable[[], dict],
+    ) -> str:
+        """Returns a cached token, calling `fetch` for a new one if needed.
+
+        `fetch` returns GitHub's response to creating an installation access
+        token, with `token` and `expires_at` keys.
+        """
+        key = self.key(app_id, installation_id)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if not self._fresh(entry):
+                entry = self._load().get(key)
+                if self._fresh(entry):
+                    self._tokens[key] = entry
+            if self._fresh(entry):
+                return entry["token"]
+
+            response = fetch()
+            entry = {
+                "token": response["token"],
+                "expires_at": parse_expires_at(response.get("expires_at")),
+            }
+            if self.path:
+                # Keep tokens other processes have added in the meantime.
+                self._tokens = dict(self._load(), **self._tokens)
+            self._tokens[key] = entry
+            if self.path:
+                self._save()
+            return entry["token"]
+
+
+_default_cache: Optional[TokenCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def default_cache() -> TokenCache:
+    """Returns the process-wide cache, persisted if the environment says so."""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = TokenCache(os.environ.get(TOKEN_CACHE_FILE_ENV))
+        return _default_cache
@@ -0,0 +1,121 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import subprocess
+
+import pytest
+
+from releasetool import git
+
+
+@pytest.fixture
+def mut():
+    from releasetool.commands.start import java
+
+    return java
+
+
+POM = """<project>
+  <version>1.2.3</version><!-- {x-version-update:google-cloud-foo:current} -->
+  <dependency>
+    <version>0.9.0</version>
+  </dependency>
+</project>
+"""
+
+
+def test_replace_version_in_file(mut, tmpdir):
+    versions = [mut.ArtifactVersions("google-cloud-foo:1.2.3:1.3.0")]
+    pom = tmpdir.join("pom.xml")
+    pom.write(POM)
+    untouched = tmpdir.join("README.md")
+    untouched.write("No markers here 1.2.3\n")
+    os.utime(str(untouched), (0, 0))
+
+    assert mut.replace_version_in_file(versions, str(pom))
+    assert "<version>1.3.0</version>" in pom.read()
+    assert "<version>0.9.0</version>" in pom.read()
+
+    assert not mut.replace_version_in_file(versions, str(untouched))
+    assert os.stat(str(untouched)).st_mtime == 0
+
+
+def test_version_rewriter_blocks(mut):
+    rewriter = mut.VersionRewriter(
+        [
+            mut.ArtifactVersions("google-cloud-foo:1.2.3:1.3.0-SNAPSHOT"),
+            mut.ArtifactVersions("google-cloud-bar:0.4.0-beta:0.4.1-beta-SNAPSHOT"),
+        ]
+    )
+    text = (
+        "<!-- {x-version-update-start:google-cloud-foo:released} -->\r\n"
+        "implementation 'com.google.cloud:google-cloud-foo:1.0.0'\r\n"
+        "compile 'com.google.cloud:google-cloud-foo:1.0.0'\r\n"
+        "<!-- {x-version-update-end} -->\r\n"
+        "version = 1.0.0\r\n"
+        "version = 0.1.0-beta // {x-version-update:google-cloud-bar:current}\r\n"
+    )
+
+    assert mut.VersionRewriter([]).rewrite("nothing to see 1.0.0\n") == (
+        "nothing to see 1.0.0\n"
+    )
+    assert rewriter.rewrite(text) == (
+        "<!-- {x-version-update-start:google-cloud-foo:released} -->\r\n"
+        "implementation 'com.google.cloud:google-cloud-foo:1.2.3'\r\n"
+        "compile 'com.google.cloud:google-cloud-foo:1.2.3'\r\n"
+        "<!-- {x-version-update-end} -->\r\n"
+        "version = 1.0.0\r\n"
+        "version = 0.4.1-beta-SNAPSHOT // {x-version-update:google-cloud-bar:current}"
+        "\r\n"
+    )
+
+
+def test_version_rewriter_unknown_module(mut):
+    rewriter = mut.VersionRewriter([])
+
+    with pytest.raises(ValueError):
+        rewriter.rewrite("1.0.0 {x-version-update:google-cloud-foo:current}\n")
+
+
+def test_find_version_files(mut, tmpdir):
+    def run(*args):
+        subprocess.check_output(["git", *args], cwd=str(tmpdir))
+
+    run("init", "-q")
+    tmpdir.join(".gitignore").write("target/\n")
+    tmpdir.join("pom.xml").write(POM)
+    tmpdir.mkdir("module").join("pom.xml").write(POM)
+    tmpdir.mkdir("target").join("pom.xml").write(POM)
+    tmpdir.join("module", "Foo.java").write("class Foo {}\n")
+
+    with tmpdir.as_cwd():
+        assert sorted(mut.find_version_files()) == ["module/pom.xml", "pom.xml"]
+    git._close_sessions()
+
+
+def test_replace_versions_in_files_parallel(mut, tmpdir):
+    versions = [mut.ArtifactVersions("google-cloud-foo:1.2.3:1.3.0")]
+    targets = []
+    for index in range(mut._PARALLEL_THRESHOLD + 1):
+        pom = tmpdir.mkdir(f"module{index}").join("pom.xml")
+        pom.write(POM if index % 2 else "<project />\n")
+        targets.append(str(pom))
+
+    updated = mut.replace_versions_in_files(versions, targets, workers=2)
+
+    assert updated == targets[1::2]
+    for target in updated:
+        with open(target) as fh:
+            assert "<version>1.3.0</version>" in fh.read()
@@ -12,8 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from unittest import mock
-
 import pytest
 
 
@@ -32,17 +30,17 @@ def mut():
     ],
 )
 def test_update_setup_py_sets_version(
-    mut, setup_py_contents, release_version, expected
+    mut, tmpdir, setup_py_contents, release_version, expected
 ):
     context = mut.Context()
     context.release_version = release_version
+    setup_py = tmpdir.join("setup.py")
+    setup_py.write(setup_py_contents)
 
-    with mock.patch(
-        "builtins.open", mock.mock_open(read_data=setup_py_contents)
-    ) as mock_open:
+    with tmpdir.as_cwd():
         mut.update_setup_py(context)
-        mock_file = mock_open()
-        mock_file.write.assert_called_once_with(expected)
+
+    assert setup_py.read() == expected
 
 
 @pytest.mark.parametrize(
@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+from unittest import mock
+
 import pytest
 
 
@@ -24,9 +26,47 @@ def mut():
 
 def test_determine_last_release(mut):
     context = mut.Context()
-    context.tags = ["google-cloud-spanner/v1.1.1", "google-cloud/v2.2.2"]
+    context.upstream_name = "upstream"
     context.package_name = "google-cloud"
 
+    with mock.patch("releasetool.git.tag_versions") as tag_versions:
+        tag_versions.return_value = ["google-cloud/v2.2.2", "google-cloud/v2.2.1"]
+        mut.gather_tags(context)
+    tag_versions.assert_called_once_with("google-cloud/", merged="upstream/master")
+
     mut.determine_last_release(context)
     assert context.last_release_committish == "google-cloud/v2.2.2"
     assert context.last_release_version == "2.2.2"
+
+
+def test_determine_last_release_falls_back_to_version_tags(mut):
+    context = mut.Context()
+    context.upstream_name = "upstream"
+    context.package_name = "gapic-generator"
+
+    with mock.patch("releasetool.git.tag_versions") as tag_versions:
+        tag_versions.side_effect = [[], ["v0.3.0", "v0.2.0"]]
+        mut.gather_tags(context)
+    tag_versions.assert_called_with("", merged="upstream/master")
+
+    mut.determine_last_release(context)
+    assert context.last_release_committish == "v0.3.0"
+    assert context.last_release_version == "0.3.0"
+
+
+def test_edit_release_notes_separates_commits(mut):
+    context = mut.Context()
+    context.changes = [
+        "feat: add a thing\nSigned-off-by: A <a@example.com>\n",
+        "fix: fix a thing\n",
+    ]
+
+    with mock.patch(
+        "releasetool.filehelpers.open_editor_with_tempfile"
+    ) as open_editor_with_tempfile:
+        open_editor_with_tempfile.side_effect = lambda content, name: content
+        mut.edit_release_notes(context)
+
+    assert context.release_notes == (
+        "feat: add a thing\nSigned-off-by: A <a@example.com>\n\nfix: fix a thing"
+    )
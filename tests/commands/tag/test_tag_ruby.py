@@ -68,13 +68,15 @@ def test_get_release_notes_monorepo():
     ctx.github = mock.Mock(autospec=GitHub)
 
     contents = "### 1.2.3 (2022-12-08)\n\n#### Features\n\n* something\n"
-    ctx.github.get_contents.return_value = contents.encode("utf-8")
+    ctx.github.stream_contents.return_value = (
+        chunk for chunk in [contents.encode("utf-8")]
+    )
 
     get_release_notes(ctx)
 
     assert ctx.release_notes == "#### Features\n\n* something"
 
-    ctx.github.get_contents.assert_called_once_with(
+    ctx.github.stream_contents.assert_called_once_with(
         "googleapis/ruby-spanner", "google-cloud-spanner/CHANGELOG.md", ref="abc123"
     )
 
@@ -89,12 +91,14 @@ def test_get_release_notes_non_monorepo():
     ctx.github = mock.Mock(autospec=GitHub)
 
     contents = "### 1.2.3 (2022-12-08)\n\n#### Features\n\n* something\n"
-    ctx.github.get_contents.return_value = contents.encode("utf-8")
+    ctx.github.stream_contents.return_value = (
+        chunk for chunk in [contents.encode("utf-8")]
+    )
 
     get_release_notes(ctx)
 
     assert ctx.release_notes == "#### Features\n\n* something"
 
-    ctx.github.get_contents.assert_called_once_with(
+    ctx.github.stream_contents.assert_called_once_with(
         "googleapis/ruby-spanner-activerecord", "CHANGELOG.md", ref="abc123"
     )
@@ -0,0 +1,137 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from autorelease.common import (
+    LanguageCache,
+    Shard,
+    get_pull,
+    guess_language,
+    load_pulls,
+)
+
+
+def test_guess_language_memoizes_languages():
+    gh = Mock()
+    gh.get_languages.return_value = {"Shell": 500, "Java": 100}
+    cache = LanguageCache()
+
+    assert guess_language(gh, "googleapis/sdk-platform", cache=cache) == "java"
+    assert guess_language(gh, "googleapis/sdk-platform", cache=cache) == "java"
+    gh.get_languages.assert_called_once_with("googleapis/sdk-platform")
+
+
+def test_language_cache_persists_between_runs(tmpdir):
+    path = str(tmpdir / "languages.json")
+    gh = Mock()
+    gh.get_languages.return_value = {"Python": 100}
+
+    cache = LanguageCache(path)
+    assert guess_language(gh, "googleapis/sdk-platform", cache=cache) == "python"
+    cache.save()
+
+    cache = LanguageCache(path)
+    assert guess_language(gh, "googleapis/sdk-platform", cache=cache) == "python"
+    gh.get_languages.assert_called_once()
+
+
+def test_language_cache_expires_entries(tmpdir):
+    path = tmpdir / "languages.json"
+    path.write_text(
+        json.dumps(
+            {"googleapis/sdk-platform": {"languages": {"Ruby": 1}, "fetched_at": 0}}
+        ),
+        encoding="utf-8",
+    )
+    gh = Mock()
+    gh.get_languages.return_value = {"Python": 100}
+
+    cache = LanguageCache(str(path))
+    assert guess_language(gh, "googleapis/sdk-platform", cache=cache) == "python"
+
+
+def test_language_cache_refresh_ignores_persisted_entries(tmpdir):
+    path = str(tmpdir / "languages.json")
+    gh = Mock()
+    gh.get_languages.return_value = {"Ruby": 100}
+    cache = LanguageCache(path)
+    cache.get_languages(gh, "googleapis/sdk-platform")
+    cache.save()
+
+    gh.get_languages.return_value = {"Python": 100}
+    cache = LanguageCache(path, refresh=True)
+    assert guess_language(gh, "googleapis/sdk-platform", cache=cache) == "python"
+    assert gh.get_languages.call_count == 2
+
+
+def test_load_pulls_falls_back_to_rest_on_error():
+    gh = Mock()
+    gh.get_pulls.side_effect = ValueError("graphql is down")
+    gh.get_url.return_value = {"number": 5}
+    issue = {"pull_request": {"url": "https://api.github.com/pulls/5"}}
+    result = Mock()
+
+    pulls = load_pulls(gh, [issue], result)
+
+    assert pulls == {}
+    result.print.assert_called_once()
+    assert get_pull(gh, issue, pulls) == {"number": 5}
+    gh.get_url.assert_called_once_with("https://api.github.com/pulls/5")
+
+
+def test_get_pull_prefers_bulk_loaded_pulls():
+    gh = Mock()
+    issue = {"pull_request": {"url": "https://api.github.com/pulls/5"}}
+
+    pull = get_pull(gh, issue, {"https://api.github.com/pulls/5": {"number": 5}})
+
+    assert pull == {"number": 5}
+    gh.get_url.assert_not_called()
+
+
+def _issue(repo, number):
+    return {
+        "title": f"chore: release {number}",
+        "pull_request": {"html_url": f"https://github.com/{repo}/pull/{number}"},
+    }
+
+
+def test_shards_split_issues_by_repository():
+    issues = [
+        _issue(f"googleapis/repo-{repo}", number)
+        for repo in range(20)
+        for number in range(3)
+    ]
+    shards = [Shard.parse(f"{index}/3") for index in range(3)]
+
+    selected = [shard.select(issues) for shard in shards]
+
+    assert sorted(sum(selected, []), key=issues.index) == issues
+    for shard_issues in selected:
+        assert shard_issues
+        for issue in shard_issues:
+            for other in selected:
+                if other is not shard_issues:
+                    assert issue not in other
+
+
+def test_shard_parse_rejects_invalid_shards():
+    assert str(Shard.parse("1/4")) == "1/4"
+    for spec in ["4/4", "1", "-1/2", "0/0"]:
+        with pytest.raises(ValueError):
+            Shard.parse(spec)
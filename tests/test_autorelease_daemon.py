@@ -0,0 +1,180 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import hashlib
+import hmac
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+import requests
+
+from autorelease import daemon
+
+
+def _payload(label, merged=True, action="closed", owner="googleapis"):
+    return {
+        "action": action,
+        "label": {"name": label},
+        "pull_request": {
+            "url": f"https://api.github.com/repos/{owner}/java-asset/pulls/1",
+            "html_url": f"https://github.com/{owner}/java-asset/pull/1",
+            "number": 1,
+            "title": "chore: release 1.2.3",
+            "state": "closed",
+            "merged_at": "2021-01-01T09:00:00Z" if merged else None,
+            "closed_at": "2021-01-01T09:00:00Z",
+            "labels": [{"name": label}],
+            "base": {
+                "repo": {
+                    "full_name": f"{owner}/java-asset",
+                    "owner": {"login": owner},
+                }
+            },
+        },
+    }
+
+
+def _fetch_payload_pull(service, payload):
+    """Has GitHub return the pull request the payload describes."""
+    return patch.object(service.gh, "get_url", return_value=payload["pull_request"])
+
+
+@patch("autorelease.kokoro.make_authorized_session")
+def _make_daemon(make_authorized_session):
+    return daemon.Daemon("github-token", "kokoro-credentials")
+
+
+@patch("autorelease.trigger.process_pull_request")
+@patch("autorelease.tag.process_issue_and_record")
+def test_handle_event_routes_by_label(process_issue_and_record, process_pull_request):
+    service = _make_daemon()
+
+    payload = _payload("autorelease: pending")
+    with _fetch_payload_pull(service, payload) as get_url:
+        assert service.handle_event("pull_request", payload)
+    get_url.assert_called_once_with(
+        "https://api.github.com/repos/googleapis/java-asset/pulls/1"
+    )
+    process_issue_and_record.assert_called_once()
+    _, _, issue, _ = process_issue_and_record.call_args.args
+    assert issue["pull_request"]["html_url"].endswith("/java-asset/pull/1")
+    pulls = process_issue_and_record.call_args.kwargs["pulls"]
+    assert list(pulls) == [issue["pull_request"]["url"]]
+
+    payload = _payload("autorelease: tagged", action="labeled")
+    with _fetch_payload_pull(service, payload):
+        assert service.handle_event("pull_request", payload)
+    process_pull_request.assert_called_once()
+
+
+@patch("autorelease.trigger.process_pull_request")
+@patch("autorelease.tag.process_issue_and_record")
+def test_handle_event_uses_pull_from_github(
+    process_issue_and_record, process_pull_request
+):
+    service = _make_daemon()
+    forged = _payload("autorelease: pending")
+    actual = _payload("autorelease: pending", merged=False)
+
+    with _fetch_payload_pull(service, actual):
+        assert service.handle_event("pull_request", forged) is None
+
+    forged["pull_request"]["base"]["repo"]["full_name"] = "evil.example/../x"
+    with _fetch_payload_pull(service, forged) as get_url:
+        assert service.handle_event("pull_request", forged) is None
+    get_url.assert_not_called()
+
+    process_issue_and_record.assert_not_called()
+    process_pull_request.assert_not_called()
+
+
+@patch("autorelease.trigger.process_pull_request")
+@patch("autorelease.tag.process_issue_and_record")
+def test_handle_event_ignores_other_events(
+    process_issue_and_record, process_pull_request
+):
+    service = _make_daemon()
+
+    for event, payload in [
+        ("issues", _payload("autorelease: pending")),
+        ("pull_request", _payload("autorelease: pending", merged=False)),
+        ("pull_request", _payload("autorelease: pending", action="opened")),
+        ("pull_request", _payload("autorelease: triggered", action="labeled")),
+        ("pull_request", _payload("autorelease: pending", owner="someone-else")),
+    ]:
+        with _fetch_payload_pull(service, payload):
+            assert service.handle_event(event, payload) is None
+
+    process_issue_and_record.assert_not_called()
+    process_pull_request.assert_not_called()
+
+
+def test_webhook_server_requires_secret():
+    service = _make_daemon()
+
+    with pytest.raises(ValueError):
+        daemon.WebhookServer(service, port=0)
+
+
+def test_webhook_server_checks_signatures():
+    service = _make_daemon()
+    server = daemon.WebhookServer(service, port=0, secret="s3cret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://localhost:{server.server_address[1]}/"
+    body = json.dumps(_payload("autorelease: pending")).encode("utf-8")
+    signature = "sha256=" + hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+
+    try:
+        response = requests.post(
+            url, data=body, headers={"X-GitHub-Event": "pull_request"}
+        )
+        assert response.status_code == 401
+
+        response = requests.post(
+            url,
+            data=body,
+            headers={
+                "X-GitHub-Event": "pull_request",
+                "X-Hub-Signature-256": signature,
+            },
+        )
+        assert response.status_code == 202
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert service._queue.get_nowait() == ("pull_request", json.loads(body))
+    assert service._queue.empty()
+
+
+def test_follow_event_file(tmpdir):
+    service = _make_daemon()
+    path = tmpdir.join("events.jsonl")
+    path.write(
+        json.dumps({"event": "pull_request", "payload": {"action": "closed"}})
+        + "\nnot json\n"
+        + '{"event": "pull_request", "payload": {"action": "lab'
+    )
+
+    def stop_after_first_poll(timeout):
+        service._stopped.set()
+
+    with patch.object(service._stopped, "wait", stop_after_first_poll):
+        daemon.follow_event_file(service, str(path))
+
+    assert service._queue.get_nowait() == ("pull_request", {"action": "closed"})
+    assert service._queue.empty()
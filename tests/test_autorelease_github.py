@@ -0,0 +1,153 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest.mock import patch
+
+import requests_mock
+
+from autorelease import github
+
+
+def _pull_node(number):
+    return {
+        "number": number,
+        "title": f"chore: release {number}",
+        "body": "",
+        "url": f"https://github.com/googleapis/java-asset/pull/{number}",
+        "mergedAt": "2021-01-01T09:00:00Z",
+        "mergeCommit": {"oid": "abc123"},
+        "headRefName": "release-v1.2.3",
+        "baseRefName": "main",
+        "labels": {"nodes": [{"name": "autorelease: pending"}]},
+        "baseRepository": {
+            "name": "java-asset",
+            "nameWithOwner": "googleapis/java-asset",
+            "owner": {"login": "googleapis"},
+        },
+    }
+
+
+def test_get_pulls_reshapes_graphql_response():
+    gh = github.GitHub("token")
+    url = "https://api.github.com/repos/googleapis/java-asset/pulls/5"
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://api.github.com/graphql",
+            json={"data": {"pr0": {"pullRequest": _pull_node(5)}}},
+        )
+        pulls = gh.get_pulls([url])
+
+    pull = pulls[url]
+    assert pull["url"] == url
+    assert pull["html_url"] == "https://github.com/googleapis/java-asset/pull/5"
+    assert pull["merged_at"] == "2021-01-01T09:00:00Z"
+    assert pull["merge_commit_sha"] == "abc123"
+    assert pull["labels"] == [{"name": "autorelease: pending"}]
+    assert pull["head"]["ref"] == "release-v1.2.3"
+    assert pull["base"]["ref"] == "main"
+    assert pull["base"]["repo"]["full_name"] == "googleapis/java-asset"
+    assert pull["base"]["repo"]["owner"]["login"] == "googleapis"
+
+
+@patch("autorelease.github._GRAPHQL_PULLS_PER_QUERY", 2)
+def test_get_pulls_chunks_queries_and_skips_missing_pulls():
+    gh = github.GitHub("token")
+    urls = [
+        f"https://api.github.com/repos/googleapis/java-asset/pulls/{number}"
+        for number in range(1, 4)
+    ]
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://api.github.com/graphql",
+            [
+                {
+                    "json": {
+                        "data": {
+                            "pr0": {"pullRequest": _pull_node(1)},
+                            "pr1": None,
+                        },
+                        "errors": [{"message": "Could not resolve"}],
+                    }
+                },
+                {"json": {"data": {"pr0": {"pullRequest": _pull_node(3)}}}},
+            ],
+        )
+        pulls = gh.get_pulls(urls + ["https://example.com/not-a-pull"])
+
+    assert m.call_count == 2
+    assert sorted(pulls) == [urls[0], urls[2]]
+
+
+def test_list_org_issues_prefetches_pages_in_order():
+    gh = github.GitHub("fake-token", prefetch_pages=2)
+    url = "https://api.github.com/search/issues"
+    with requests_mock.Mocker() as m:
+        m.get(
+            url,
+            [
+                {
+                    "json": {"total_count": 4, "items": [{"number": 1}]},
+                    "headers": {
+                        "Link": f'<{url}?q=org%3Agoogleapis&page=2>; rel="next", '
+                        f'<{url}?q=org%3Agoogleapis&page=4>; rel="last"'
+                    },
+                },
+            ],
+        )
+        for page in [2, 3, 4]:
+            m.get(
+                f"{url}?q=org%3Agoogleapis&page={page}",
+                json={"total_count": 4, "items": [{"number": page}]},
+                complete_qs=True,
+            )
+
+        issues = list(gh.list_org_issues("googleapis", state="closed"))
+
+    assert [issue["number"] for issue in issues] == [1, 2, 3, 4]
+    assert m.call_count == 4
+
+
+def test_list_org_issues_uses_total_count_without_last_link():
+    gh = github.GitHub("fake-token")
+    url = "https://api.github.com/search/issues"
+    with requests_mock.Mocker() as m:
+        m.get(
+            url,
+            json={"total_count": 3, "items": [{"number": 1}, {"number": 2}]},
+            headers={"Link": f'<{url}?q=org%3Agoogleapis&page=2>; rel="next"'},
+        )
+        m.get(
+            f"{url}?q=org%3Agoogleapis&page=2",
+            json={"total_count": 3, "items": [{"number": 3}]},
+            complete_qs=True,
+        )
+
+        issues = list(gh.list_org_issues("googleapis", state="closed"))
+
+    assert [issue["number"] for issue in issues] == [1, 2, 3]
+
+
+def test_list_org_repos_follows_next_links_without_page_numbers():
+    gh = github.GitHub("fake-token")
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://api.github.com/orgs/googleapis/repos",
+            json=[{"name": "python-asset"}],
+            headers={"Link": '<https://api.github.com/cursor/abc>; rel="next"'},
+        )
+        m.get("https://api.github.com/cursor/abc", json=[{"name": "java-asset"}])
+
+        repos = list(gh.list_org_repos("googleapis"))
+
+    assert [repo["name"] for repo in repos] == ["python-asset", "java-asset"]
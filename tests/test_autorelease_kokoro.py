@@ -0,0 +1,138 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import base64
+import concurrent.futures
+from unittest.mock import patch, Mock
+
+import requests
+import requests_mock
+
+from autorelease import kokoro, reporter, trigger
+
+_PUBLISH_URL = (
+    "https://pubsub.googleapis.com/v1/"
+    "projects/google.com:devrel-library-tracker-prod/topics/kokoro:publish"
+)
+
+
+def _published_data(request):
+    return [
+        base64.b64decode(message["data"]).decode("utf-8")
+        for message in request.json()["messages"]
+    ]
+
+
+def test_batch_publisher_flushes_by_count():
+    with requests_mock.Mocker() as m:
+        m.post(
+            _PUBLISH_URL,
+            [{"json": {"messageIds": ["1", "2"]}}, {"json": {"messageIds": ["3"]}}],
+        )
+        publisher = kokoro.BatchPublisher(
+            requests.Session(), max_messages=2, max_latency=60
+        )
+
+        first = publisher.publish("one")
+        assert not first.done()
+        second = publisher.publish("two")
+        third = publisher.publish("three")
+        assert m.call_count == 1
+        publisher.flush()
+
+        assert m.call_count == 2
+        assert _published_data(m.request_history[0]) == ["one", "two"]
+        assert _published_data(m.request_history[1]) == ["three"]
+        assert [first.result(), second.result(), third.result()] == ["1", "2", "3"]
+
+
+def test_batch_publisher_flushes_by_size():
+    with requests_mock.Mocker() as m:
+        m.post(_PUBLISH_URL, json={"messageIds": ["1"]})
+        publisher = kokoro.BatchPublisher(
+            requests.Session(), max_bytes=10, max_latency=60
+        )
+
+        publisher.publish("a" * 6)
+        publisher.publish("b" * 6)
+
+        assert m.call_count == 1
+        assert _published_data(m.request_history[0]) == ["a" * 6]
+
+
+def test_batch_publisher_fails_every_message_in_batch():
+    with requests_mock.Mocker() as m:
+        m.post(_PUBLISH_URL, status_code=500)
+        publisher = kokoro.BatchPublisher(requests.Session(), max_latency=60)
+
+        futures = [publisher.publish("one"), publisher.publish("two")]
+        publisher.flush()
+
+        for future in futures:
+            assert isinstance(future.exception(), requests.HTTPError)
+
+
+@patch("autorelease.trigger.LANGUAGE_ALLOWLIST", ["java"])
+def test_trigger_with_publisher_reports_failed_publish():
+    github = Mock()
+    github.get_url.return_value = {
+        "merged_at": "2021-01-01T09:00:00.000Z",
+        "merge_commit_sha": "abcd1234",
+        "base": {"repo": {"full_name": "googleapis/java-asset", "name": "java-asset"}},
+        "html_url": "https://github.com/googleapis/java-asset/pulls/5",
+    }
+    issue = {
+        "pull_request": {"url": "https://api.github.com/googleapis/java-asset/pull/5"}
+    }
+    future = concurrent.futures.Future()
+    publisher = Mock()
+    publisher.publish.return_value = future
+    result = reporter.Result("java-asset")
+
+    trigger.trigger_kokoro_build_for_pull_request(
+        Mock(), github, issue, result, publisher=publisher
+    )
+    publisher.publish.assert_called_once()
+    github.update_pull_labels.assert_not_called()
+
+    future.set_exception(RuntimeError("publish failed"))
+    assert result.error
+    assert "publish failed" in result.output
+    github.update_pull_labels.assert_not_called()
+
+
+@patch("autorelease.trigger.LANGUAGE_ALLOWLIST", ["java"])
+def test_trigger_with_publisher_labels_after_publish():
+    github = Mock()
+    github.get_url.return_value = {
+        "merged_at": "2021-01-01T09:00:00.000Z",
+        "merge_commit_sha": "abcd1234",
+        "base": {"repo": {"full_name": "googleapis/java-asset", "name": "java-asset"}},
+        "html_url": "https://github.com/googleapis/java-asset/pulls/5",
+    }
+    issue = {
+        "pull_request": {"url": "https://api.github.com/googleapis/java-asset/pull/5"}
+    }
+    future = concurrent.futures.Future()
+    publisher = Mock()
+    publisher.publish.return_value = future
+    result = reporter.Result("java-asset")
+
+    trigger.trigger_kokoro_build_for_pull_request(
+        Mock(), github, issue, result, publisher=publisher
+    )
+    future.set_result("1")
+
+    assert not result.error
+    github.update_pull_labels.assert_called_once()
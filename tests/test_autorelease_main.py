@@ -0,0 +1,60 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+import pytest
+
+from autorelease import __main__, kokoro, reporter
+
+
+def test_import_does_not_load_heavy_modules(imported_modules):
+    modules = imported_modules("import autorelease.__main__")
+
+    lazy_modules = [
+        "autorelease.daemon",
+        "autorelease.tag",
+        "autorelease.trigger",
+        "google.auth",
+        "google.oauth2",
+        "jinja2",
+        "protos.kokoro_api_pb2",
+    ]
+    assert [name for name in lazy_modules if name in modules] == []
+
+
+def test_kokoro_import_does_not_load_google_auth(imported_modules):
+    modules = imported_modules("import autorelease.kokoro")
+
+    assert "google.auth" not in modules
+    assert "protos.kokoro_api_pb2" not in modules
+
+
+def test_build_request_and_report_still_render():
+    build_request = kokoro._make_build_request("job", "abc123")
+    assert 'full_job_name: "job"' in build_request
+
+    report = reporter.Reporter("autorelease.trigger")
+    report.add(reporter.Result("chore: release 1.0.0"))
+    assert '<testsuites name="autorelease.trigger"' in report.render()
+
+
+def test_only_merge_reports_takes_reports(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["autorelease", "tag", "shard-0.xml"])
+
+    with pytest.raises(SystemExit) as exc_info:
+        __main__.main()
+
+    assert exc_info.value.code == 2
+    assert "unrecognized arguments: shard-0.xml" in capsys.readouterr().err
@@ -0,0 +1,47 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from autorelease import reporter
+
+
+def _shard_report(tmpdir, index, error):
+    report = reporter.Reporter("autorelease.tag")
+    result = reporter.Result(f'chore: release {index} "<a & b>"', error=error)
+    result.print(f"output <{index}> & more")
+    report.add(result)
+    skipped = reporter.Result(f"skipped {index}", skipped=True)
+    report.add(skipped)
+
+    path = str(tmpdir.join(f"shard-{index}.xml"))
+    report.write(path)
+    return path
+
+
+def test_merge_shard_reports(tmpdir):
+    paths = [_shard_report(tmpdir, 0, False), _shard_report(tmpdir, 1, True)]
+
+    merged = reporter.Reporter.merge(
+        "autorelease.tag", [reporter.Reporter.load(path) for path in paths]
+    )
+
+    assert [result.name for result in merged.results] == [
+        'chore: release 0 "<a & b>"',
+        "skipped 0",
+        'chore: release 1 "<a & b>"',
+        "skipped 1",
+    ]
+    assert merged.failures == 1
+    assert merged.skips == 2
+    assert merged.results[2].output == "output <1> & more\n"
+    assert 'failures="1"' in merged.render()
@@ -0,0 +1,162 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import concurrent.futures
+import json
+from unittest.mock import patch
+
+from autorelease import reporter, state, trigger
+
+
+def _issue(number, updated_at="2026-01-01T00:00:00Z"):
+    return {
+        "title": f"chore: release {number}.0.0",
+        "updated_at": updated_at,
+        "pull_request": {
+            "url": f"https://api.github.com/repos/googleapis/java-asset/pulls/{number}",
+            "html_url": f"https://github.com/googleapis/java-asset/pull/{number}",
+        },
+    }
+
+
+def test_scan_state_round_trip(tmpdir):
+    path = str(tmpdir / "state.json")
+    scan_state = state.ScanState(path, "autorelease.trigger")
+    assert scan_state.watermark is None
+
+    issues = [_issue(1), _issue(2)]
+    results = [reporter.Result("one"), reporter.Result("two", error=True)]
+    scan_state.record(issues, results)
+    scan_state.save("2026-01-01T00:00:00Z")
+
+    scan_state = state.ScanState(path, "autorelease.trigger")
+    # The next search overlaps the previous one in case the index lagged.
+    assert scan_state.watermark == "2025-12-31T23:50:00Z"
+    # The processed issue is dropped and the failed one is retried even if
+    # the search no longer returns it.
+    assert scan_state.working_set([_issue(1), _issue(3)]) == [_issue(3), _issue(2)]
+
+
+def test_scan_state_processes_updated_issues_again(tmpdir):
+    path = str(tmpdir / "state.json")
+    scan_state = state.ScanState(path, "autorelease.tag")
+    scan_state.record([_issue(1)], [reporter.Result("one")])
+    scan_state.save()
+
+    scan_state = state.ScanState(path, "autorelease.tag")
+    relabeled = _issue(1, updated_at="2026-01-03T00:00:00Z")
+    assert scan_state.working_set([_issue(1)]) == []
+    assert scan_state.working_set([relabeled]) == [relabeled]
+
+
+def test_scan_state_drops_unlabeled_retries(tmpdir):
+    path = str(tmpdir / "state.json")
+    scan_state = state.ScanState(path, "autorelease.tag")
+    results = [reporter.Result(name, error=True) for name in ["one", "two", "three"]]
+    scan_state.record([_issue(1), _issue(2), _issue(3)], results)
+    scan_state.save()
+
+    pulls = {
+        _issue(2)["pull_request"]["url"]: {
+            "labels": [{"name": "autorelease: pending"}]
+        },
+        _issue(3)["pull_request"]["url"]: {"labels": []},
+    }
+    scan_state = state.ScanState(path, "autorelease.tag")
+    issues = scan_state.working_set([_issue(1)])
+    issues = scan_state.drop_unlabeled_retries(
+        issues,
+        "autorelease: pending",
+        lambda issue: pulls[issue["pull_request"]["url"]],
+    )
+
+    # The searched issue has the label, and the one nobody relabeled is dropped.
+    assert issues == [_issue(1), _issue(2)]
+
+
+def test_scan_state_keeps_other_sections(tmpdir):
+    path = str(tmpdir / "state.json")
+    state.ScanState(path, "autorelease.tag").save("2026-01-01T00:00:00Z")
+    state.ScanState(path, "autorelease.trigger").save("2026-02-01T00:00:00Z")
+
+    with open(path, "r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    assert data["autorelease.tag"]["watermark"] == "2025-12-31T23:50:00Z"
+    assert data["autorelease.trigger"]["watermark"] == "2026-01-31T23:50:00Z"
+
+
+def test_scan_state_shards_save_concurrently(tmpdir):
+    path = str(tmpdir / "state.json")
+    names = [f"autorelease.tag (shard {index}/8)" for index in range(8)]
+    scan_states = [state.ScanState(path, name) for name in names]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+        futures = [executor.submit(scan_state.save) for scan_state in scan_states]
+        for future in futures:
+            future.result()
+
+    with open(path, "r", encoding="utf-8") as fh:
+        assert sorted(json.load(fh)) == sorted(names)
+
+
+def test_scan_state_reads_processed_list(tmpdir):
+    path = tmpdir / "state.json"
+    key = _issue(1)["pull_request"]["html_url"]
+    path.write(json.dumps({"autorelease.tag": {"processed": [key]}}))
+
+    # Without a recorded update time the issue is processed again.
+    scan_state = state.ScanState(str(path), "autorelease.tag")
+    assert scan_state.working_set([_issue(1)]) == [_issue(1)]
+
+
+@patch("autorelease.trigger.ORGANIZATIONS_TO_SCAN", ["googleapis"])
+@patch("autorelease.state.now")
+@patch("autorelease.trigger.trigger_kokoro_build_for_pull_request")
+@patch("autorelease.github.GitHub.get_pulls")
+@patch("autorelease.github.GitHub.list_org_issues")
+@patch("autorelease.kokoro.make_authorized_session")
+def test_trigger_scans_incrementally(
+    make_authorized_session,
+    list_org_issues,
+    get_pulls,
+    trigger_kokoro_build_for_pull_request,
+    now,
+    tmpdir,
+):
+    path = str(tmpdir / "state.json")
+
+    def fail_second_release(kokoro_session, gh, issue, result, **kwargs):
+        if issue["title"] == "chore: release 2.0.0":
+            raise ValueError("boom")
+
+    trigger_kokoro_build_for_pull_request.side_effect = fail_second_release
+    get_pulls.side_effect = lambda urls: {
+        url: {"labels": [{"name": "autorelease: tagged"}]} for url in urls
+    }
+    list_org_issues.return_value = [_issue(1), _issue(2)]
+    now.return_value = "2026-01-01T00:00:00Z"
+    trigger.main("github-token", "kokoro-credentials", state_file=path)
+    assert "updated_after" not in list_org_issues.call_args.kwargs
+
+    list_org_issues.return_value = [_issue(3)]
+    now.return_value = "2026-01-02T00:00:00Z"
+    report = trigger.main("github-token", "kokoro-credentials", state_file=path)
+
+    assert list_org_issues.call_args.kwargs["updated_after"] == "2025-12-31T23:50:00Z"
+    assert [result.name for result in report.results[1:]] == [
+        "chore: release 3.0.0",
+        "chore: release 2.0.0",
+    ]
+    assert state.ScanState(path, "autorelease.trigger").watermark == (
+        "2026-01-01T23:50:00Z"
+    )
@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pytest
 import requests_mock
 from unittest.mock import patch, Mock
 
@@ -54,10 +55,58 @@ def test_processes_issues(make_authorized_session, list_org_issues, process_issu
     assert process_issue.call_count == 2
 
 
+@pytest.mark.parametrize("workers", [1, 4])
+@patch("autorelease.tag.ORGANIZATIONS_TO_SCAN", ["googleapis"])
+@patch("autorelease.tag.process_issue")
+@patch("autorelease.github.GitHub.list_org_issues")
+@patch("autorelease.kokoro.make_authorized_session")
+def test_processes_issues_in_merge_order(
+    make_authorized_session, list_org_issues, process_issue, workers
+):
+    def make_issue(repo, version, closed_at):
+        return {
+            "pull_request": {
+                "html_url": f"https://github.com/googleapis/{repo}/pull/{version}"
+            },
+            "title": f"chore: release {repo} {version}",
+            "closed_at": closed_at,
+        }
+
+    issues = [
+        make_issue("java-asset", "1.2.0", "2021-01-02T00:00:00Z"),
+        make_issue("nodejs-container", "1.0.0", "2021-01-01T00:00:00Z"),
+        make_issue("java-asset", "1.1.0", "2021-01-01T00:00:00Z"),
+        make_issue("java-asset", "1.3.0", "2021-01-03T00:00:00Z"),
+    ]
+    list_org_issues.return_value = issues
+
+    processed = []
+
+    def record(kokoro_session, gh, issue, result, **kwargs):
+        processed.append(issue["title"])
+
+    process_issue.side_effect = record
+    report = tag.main("github-token", "kokoro-credentials", workers=workers)
+
+    assert process_issue.call_count == 4
+    # Pull requests for the same repository are tagged in merge order.
+    java_asset = [title for title in processed if "java-asset" in title]
+    assert java_asset == [
+        "chore: release java-asset 1.1.0",
+        "chore: release java-asset 1.2.0",
+        "chore: release java-asset 1.3.0",
+    ]
+    # The report keeps the working set order.
+    assert [result.name for result in report.results[1:]] == [
+        issue["title"] for issue in issues
+    ]
+
+
 @patch("releasetool.commands.tag.java.tag")
 def test_run_releasetool_tag_delegates(tag_mock):
     github = Mock()
     github.token = "github-token"
+    github.cache_dir = None
     context = Mock()
     tag_mock.return_value = context
     pull = {"base": {"ref": "abc123", "repo": {"full_name": "googleapis/java-asset"}}}
@@ -14,7 +14,7 @@
 
 from unittest.mock import patch, Mock
 
-from autorelease import trigger
+from autorelease import common, trigger
 
 
 @patch("autorelease.trigger.trigger_kokoro_build_for_pull_request")
@@ -83,6 +83,40 @@ def test_processes_issues(
     assert trigger_kokoro_build_for_pull_request.call_count == 2
 
 
+@patch("autorelease.trigger.ORGANIZATIONS_TO_SCAN", ["googleapis"])
+@patch("autorelease.trigger.trigger_kokoro_build_for_pull_request")
+@patch("autorelease.github.GitHub.list_org_issues")
+@patch("autorelease.kokoro.make_authorized_session")
+def test_processes_issues_with_workers(
+    make_authorized_session, list_org_issues, trigger_kokoro_build_for_pull_request
+):
+    issues = [
+        {
+            "pull_request": {"html_url": f"https://github.com/googleapis/repo-{n}"},
+            "title": f"chore: release {n}.0.0",
+        }
+        for n in range(10)
+    ]
+    list_org_issues.return_value = issues
+
+    def fail_odd_releases(kokoro_session, gh, issue, result, **kwargs):
+        if int(issue["title"][-5]) % 2:
+            raise ValueError("boom")
+
+    trigger_kokoro_build_for_pull_request.side_effect = fail_odd_releases
+    report = trigger.main("github-token", "kokoro-credentials", workers=4)
+
+    assert trigger_kokoro_build_for_pull_request.call_count == 10
+    # The first result is the "list issues" checkpoint.
+    assert [result.name for result in report.results[1:]] == [
+        issue["title"] for issue in issues
+    ]
+    assert [result.error for result in report.results[1:]] == [
+        bool(n % 2) for n in range(10)
+    ]
+    assert "boom" in report.results[2].output
+
+
 @patch("autorelease.kokoro.trigger_build")
 def test_trigger_kokoro_build_for_pull_request_skips_non_merged(trigger_build):
     github = Mock()
@@ -466,3 +500,36 @@ def test_trigger_multi_scm(
         },
         multi_scm_name="functions-framework-java",
     )
+
+
+@patch("autorelease.trigger.trigger_kokoro_build_for_pull_request")
+@patch("autorelease.github.GitHub.list_org_issues")
+@patch("autorelease.kokoro.make_authorized_session")
+def test_shards_process_disjoint_issues(
+    make_authorized_session, list_org_issues, trigger_kokoro_build_for_pull_request
+):
+    issues = [
+        {
+            "pull_request": {
+                "html_url": f"https://github.com/googleapis/repo-{index}/pull/1"
+            },
+            "title": f"chore: release {index}",
+        }
+        for index in range(10)
+    ]
+
+    def list_org_issues_side_effect(org, **kwargs):
+        return issues if org == "googleapis" else []
+
+    list_org_issues.side_effect = list_org_issues_side_effect
+
+    processed = []
+    for index in range(2):
+        report = trigger.main(
+            "github-token", "kokoro-credentials", shard=common.Shard(index, 2)
+        )
+        assert report.results[0].name == f"list issues (shard {index}/2)"
+        processed.extend(result.name for result in report.results[1:])
+
+    assert sorted(processed) == sorted(issue["title"] for issue in issues)
+    assert trigger_kokoro_build_for_pull_request.call_count == 10
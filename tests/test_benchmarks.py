@@ -0,0 +1,68 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from benchmarks import harness
+from benchmarks.__main__ import compare
+
+_OPTIONS = harness.Options(orgs=1, repos_per_org=2, pulls_per_repo=2)
+
+
+def test_autorelease_tag_against_fake_github():
+    measurement = harness.run("autorelease-tag", _OPTIONS)
+
+    assert measurement.pulls == 4
+    assert measurement.releases == 4
+    assert measurement.empty_release_notes == 0
+    assert measurement.requests["search issues"] >= 1
+    assert "not found" not in measurement.requests
+    assert measurement.peak_memory > 0
+
+
+def test_releasetool_tag_finds_release_notes():
+    measurement = harness.run("releasetool-tag", _OPTIONS)
+
+    assert measurement.releases == 4
+    assert measurement.empty_release_notes == 0
+
+
+def test_autorelease_trigger_against_fake_pubsub():
+    measurement = harness.run("autorelease-trigger", _OPTIONS)
+
+    assert measurement.pulls == 4
+    assert measurement.published == 4
+    assert measurement.requests["pubsub publish"] >= 1
+
+
+def test_compare_reports_regressions():
+    measurement = harness.Measurement(
+        command="autorelease-tag",
+        pulls=4,
+        wall_time=2.0,
+        peak_memory=1000,
+        requests={"search issues": 3},
+        published=0,
+        releases=4,
+    )
+    baseline = {
+        "autorelease-tag": {
+            "wall_time": 1.0,
+            "peak_memory": 1000,
+            "requests": {"search issues": 2},
+        }
+    }
+
+    regressions = compare([measurement], baseline, tolerance=0.2)
+
+    assert len(regressions) == 2
+    assert compare([measurement], {}, tolerance=0.2) == []
@@ -0,0 +1,104 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+
+from releasetool import changelog
+
+
+RUBY_CHANGELOG = """# Release History
+
+### 1.2.30 (2022-12-08)
+
+#### Features
+
+* thirty
+
+### 1.2.3 / 2019-05-11
+
+#### Bug Fixes
+
+* three
+
+## Older releases
+
+See the wiki.
+"""
+
+
+def test_index_ruby_formats():
+    index = changelog.ChangelogIndex(RUBY_CHANGELOG)
+
+    assert index.release_notes("1.2.30") == "#### Features\n\n* thirty"
+    assert index.release_notes("v1.2.3") == "#### Bug Fixes\n\n* three"
+    assert index.section("1.2.4") is None
+    assert index.release_notes("1.2.4") == ""
+
+
+def test_load_caches_by_ref():
+    github = mock.Mock()
+    github.get_contents.return_value = RUBY_CHANGELOG.encode("utf-8")
+
+    first = changelog.load(github, "googleapis/cache-test", "CHANGELOG.md", "abc")
+    second = changelog.load(github, "googleapis/cache-test", "CHANGELOG.md", "abc")
+    changelog.load(github, "googleapis/cache-test", "CHANGELOG.md", "def")
+
+    assert first is second
+    assert github.get_contents.call_count == 2
+    github.get_contents.assert_called_with(
+        "googleapis/cache-test", "CHANGELOG.md", ref="def"
+    )
+
+
+def _stream(chunks, consumed):
+    for chunk in chunks:
+        consumed.append(chunk)
+        yield chunk
+
+
+def test_release_notes_stops_reading_after_section():
+    github = mock.Mock()
+    consumed = []
+    chunks = [
+        b"# Release History\n\n### 2.0.0 (2022-12-08)\n\n* new\n\n### 1.",
+        b"9.0 / 2019-05-11\n\n* old\n",
+        b"### 1.8.0 / 2019-01-01\n",
+    ]
+    github.stream_contents.return_value = _stream(chunks, consumed)
+
+    notes = changelog.release_notes(
+        github, "googleapis/stream-test", "CHANGELOG.md", "abc", "2.0.0"
+    )
+
+    assert notes == "* new"
+    assert consumed == chunks[:2]
+
+
+def test_release_notes_reads_whole_file_when_not_near_top():
+    github = mock.Mock()
+    consumed = []
+    chunks = [b"### 2.0.0 (2022-12-08)\n\n" + b"* filler\n" * 10000]
+    chunks.append(b"### 1.0.0 / 2019-05-11\n\n* \xe2\x9a")
+    chunks.append(b"\xa0 first\n")
+    github.stream_contents.return_value = _stream(chunks, consumed)
+
+    notes = changelog.release_notes(
+        github, "googleapis/stream-test", "CHANGELOG.md", "def", "1.0.0"
+    )
+
+    assert notes == "* ⚠ first"
+    assert consumed == chunks
+    # The whole file was read, so it is indexed for later lookups.
+    index = changelog.load(github, "googleapis/stream-test", "CHANGELOG.md", "def")
+    assert index.release_notes("2.0.0").startswith("* filler")
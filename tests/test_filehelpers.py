@@ -0,0 +1,79 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import mock
+
+import pytest
+
+from releasetool import filehelpers
+
+
+CHANGELOG = """# Changelog
+
+## 1.0.0
+
+* First release.
+"""
+
+
+@pytest.mark.parametrize(
+    "contents,expected",
+    [
+        (
+            CHANGELOG,
+            "# Changelog\n\n## 1.1.0\n\n* Second release.\n## 1.0.0\n\n"
+            "* First release.\n",
+        ),
+        ("", "## 1.1.0\n\n* Second release.\n"),
+    ],
+)
+def test_insert_before(tmpdir, contents, expected):
+    changelog = tmpdir.join("CHANGELOG.md")
+    changelog.write(contents)
+
+    filehelpers.insert_before(
+        str(changelog), "## 1.1.0\n\n* Second release.", r"^## (.+)$|\Z"
+    )
+
+    assert changelog.read() == expected
+    assert tmpdir.listdir() == [changelog]
+
+
+def test_replace(tmpdir):
+    setup_py = tmpdir.join("setup.py")
+    setup_py.write("name = 'foo'\r\nversion = '1.0.0'\r\n")
+    setup_py.chmod(0o755)
+
+    # Small chunks exercise copying the file in pieces.
+    with mock.patch.object(filehelpers, "_CHUNK_SIZE", 4):
+        filehelpers.replace(
+            str(setup_py),
+            r"version\s*=\s*(['\"])(.+?)['\"]",
+            "version = \\g<1>1.1.0\\g<1>",
+        )
+
+    assert setup_py.read_binary() == b"name = 'foo'\r\nversion = '1.1.0'\r\n"
+    assert os.stat(str(setup_py)).st_mode & 0o777 == 0o755
+
+
+def test_replace_no_match(tmpdir):
+    setup_py = tmpdir.join("setup.py")
+    setup_py.write("name = 'foo'\n")
+    os.utime(str(setup_py), (0, 0))
+
+    filehelpers.replace(str(setup_py), r"version = '(.+?)'", "version = '1.1.0'")
+
+    assert setup_py.read() == "name = 'foo'\n"
+    assert os.stat(str(setup_py)).st_mtime == 0
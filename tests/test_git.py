@@ -0,0 +1,157 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+from unittest import mock
+
+import pytest
+
+from releasetool import git
+
+
+@pytest.fixture
+def repo(tmpdir):
+    def run(*args):
+        return subprocess.check_output(["git", *args], cwd=str(tmpdir)).decode()
+
+    run("init", "-q", "-b", "main")
+    run("config", "user.email", "releasetool@example.com")
+    run("config", "user.name", "releasetool")
+    run("remote", "add", "origin", "git@github.com:googleapis/releasetool.git")
+    tmpdir.join("README.md").write("hello\n")
+    run("add", "README.md")
+    run("commit", "-q", "-m", "first")
+
+    with tmpdir.as_cwd():
+        yield run
+    git._close_sessions()
+
+
+def test_get_latest_commit_uses_batch_session(repo):
+    expected = repo("rev-parse", "main")
+
+    with mock.patch("subprocess.check_output") as check_output:
+        assert git.get_latest_commit("main") == expected
+        assert git.get_latest_commit("main") == expected
+    check_output.assert_not_called()
+
+
+def test_get_latest_commit_reports_missing_branches(repo):
+    with pytest.raises(subprocess.CalledProcessError):
+        git.get_latest_commit("no-such-branch")
+
+
+def test_read_object(repo):
+    object_type, data = git.session().read_object("HEAD:README.md")
+
+    assert object_type == "blob"
+    assert data == b"hello\n"
+    assert git.session().read_object("HEAD:missing.md") is None
+
+
+def test_config_is_memoized_until_invalidated(repo):
+    assert git.get_github_remotes() == {"origin": "googleapis/releasetool"}
+
+    with mock.patch("subprocess.check_output") as check_output:
+        git.get_github_remotes()
+        git.get_config()
+    check_output.assert_not_called()
+
+    git.checkout_create_branch("release-v1.0.0", base="main")
+    assert git.current_branch() == "release-v1.0.0"
+    git.checkout_branch("main")
+    assert git.current_branch() == "main"
+
+
+def test_tag_versions_sorts_by_version(repo):
+    for tag in [
+        "storage-1.10.0",
+        "storage-1.9.0",
+        "storage-2.0.0-beta",
+        "storage-2.0.0",
+        "storage_admin-3.0.0",
+        "v0.1.0",
+        "bonustag",
+    ]:
+        repo("tag", tag)
+
+    tags = git.session().tags
+    with mock.patch.object(tags, "fetch") as fetch:
+        tags._fetched = True
+        assert git.tag_versions("storage-") == [
+            "storage-2.0.0",
+            "storage-2.0.0-beta",
+            "storage-1.10.0",
+            "storage-1.9.0",
+        ]
+        assert git.tag_versions("storage-", "storage_admin-")[0] == (
+            "storage_admin-3.0.0"
+        )
+        assert git.tag_versions() == ["v0.1.0"]
+        assert len(git.list_tags()) == 7
+    fetch.assert_not_called()
+
+
+def test_tag_versions_only_merged(repo, tmpdir):
+    repo("tag", "v1.0.0")
+    repo("checkout", "-q", "-b", "next")
+    tmpdir.join("README.md").write("next\n")
+    repo("commit", "-q", "-am", "next")
+    repo("tag", "v2.0.0")
+    repo("checkout", "-q", "main")
+
+    tags = git.session().tags
+    with mock.patch.object(tags, "fetch"):
+        tags._fetched = True
+        assert git.tag_versions("v", merged="main") == ["v1.0.0"]
+        assert git.tag_versions("v", merged="next") == ["v2.0.0", "v1.0.0"]
+
+
+def test_iter_log_streams_commits(repo, tmpdir):
+    base = repo("rev-parse", "HEAD").strip()
+    tmpdir.mkdir("lib").join("a.rb").write("a\n")
+    tmpdir.join("notes.md").write("ünïcode\n")
+    repo("add", ".")
+    repo(
+        "commit",
+        "-q",
+        "-m",
+        "feat: add lib",
+        "-m",
+        "Some details.\n\nReleased-As: 1.0.0\nSource-Link: ünïcode",
+    )
+    tmpdir.join("README.md").write("goodbye\n")
+    repo("commit", "-q", "-a", "-m", "docs: update readme")
+
+    commits = list(git.iter_log(base, "HEAD", paths=True))
+
+    assert [commit.subject for commit in commits] == [
+        "docs: update readme",
+        "feat: add lib",
+    ]
+    assert commits[0].paths == ["README.md"]
+    assert commits[0].body == ""
+    assert commits[1].paths == ["lib/a.rb", "notes.md"]
+    assert commits[1].body.startswith("Some details.")
+    assert commits[1].trailers == {
+        "Released-As": ["1.0.0"],
+        "Source-Link": ["ünïcode"],
+    }
+
+    lib_commits = list(git.iter_log(base, "HEAD", where="lib"))
+    assert [commit.subject for commit in lib_commits] == ["feat: add lib"]
+
+    log = git.iter_log(base, "HEAD")
+    assert next(log).subject == "docs: update readme"
+    log.close()
@@ -13,7 +13,8 @@
 # limitations under the License.
 
 
-from releasetool import github
+import os
+from releasetool import github, token_cache
 import pathlib
 import requests_mock
 
@@ -35,3 +36,121 @@ def test_app_credentials():
             "my-app-id", "my-installation-id", private_key
         )
         assert token == "remote-access-token"
+
+
+def _private_key():
+    path = pathlib.Path(__file__).parent / "testdata" / "fake-private-key.pem"
+    return path.read_text()
+
+
+def _token_response(token):
+    return {
+        "status_code": 201,
+        "json": {"token": token, "expires_at": "2100-01-01T00:00:00Z"},
+    }
+
+
+def test_app_credentials_are_cached_until_near_expiry(tmpdir):
+    url = "https://api.github.com/app/installations/my-installation-id/access_tokens"
+    path = str(tmpdir.join("tokens.json"))
+    with requests_mock.Mocker() as m:
+        m.post(
+            url,
+            [_token_response("first-token"), _token_response("second-token")],
+        )
+
+        cache = token_cache.TokenCache(path)
+        for _ in range(2):
+            token = github.get_installation_access_token(
+                "my-app-id", "my-installation-id", _private_key(), cache=cache
+            )
+            assert token == "first-token"
+        assert m.call_count == 1
+
+        # Another process reads the token from disk.
+        token = github.get_installation_access_token(
+            "my-app-id",
+            "my-installation-id",
+            _private_key(),
+            cache=token_cache.TokenCache(path),
+        )
+        assert token == "first-token"
+        assert m.call_count == 1
+        assert os.stat(path).st_mode & 0o077 == 0
+
+        # Tokens within the refresh margin of expiring are replaced.
+        cache = token_cache.TokenCache(path, refresh_margin=200 * 365 * 24 * 3600)
+        token = github.get_installation_access_token(
+            "my-app-id", "my-installation-id", _private_key(), cache=cache
+        )
+        assert token == "second-token"
+        assert m.call_count == 2
+
+
+def test_stream_contents():
+    with requests_mock.Mocker() as m:
+        m.get(
+            "https://api.github.com/repos/googleapis/foo/contents/CHANGELOG.md",
+            content=b"# Changelog\n\n## 1.0.0\n",
+        )
+
+        gh = github.GitHub("token")
+        chunks = list(
+            gh.stream_contents(
+                "googleapis/foo", "CHANGELOG.md", ref="abc123", chunk_size=8
+            )
+        )
+
+        assert b"".join(chunks) == b"# Changelog\n\n## 1.0.0\n"
+        assert len(chunks) == 3
+        assert m.last_request.qs == {"ref": ["abc123"]}
+        assert m.last_request.headers["Accept"] == "application/vnd.github.raw"
+
+
+def _commit(sha):
+    return {"type": "commit", "sha": sha}
+
+
+def test_get_tag_sha():
+    root = "https://api.github.com/repos/googleapis/foo/git"
+    with requests_mock.Mocker() as m:
+        m.get(f"{root}/ref/tags/v1.0.0", json={"object": _commit("c1")})
+        m.get(f"{root}/ref/tags/v2.0.0", json={"object": {"type": "tag", "sha": "t2"}})
+        m.get(f"{root}/tags/t2", json={"object": _commit("c2")})
+        m.get(f"{root}/ref/tags/v3.0.0", status_code=404)
+
+        gh = github.GitHub("token")
+        assert gh.get_tag_sha("googleapis/foo", "v1.0.0") == "c1"
+        assert gh.get_tag_sha("googleapis/foo", "v2.0.0") == "c2"
+        assert gh.get_tag_sha("googleapis/foo", "v3.0.0") is None
+
+
+def test_get_tag_shas():
+    with requests_mock.Mocker() as m:
+        m.post(
+            "https://api.github.com/graphql",
+            json={
+                "data": {
+                    "repository": {
+                        "tag0": {"target": {"__typename": "Commit", "oid": "c1"}},
+                        "tag1": {
+                            "target": {
+                                "__typename": "Tag",
+                                "oid": "t2",
+                                "target": {"__typename": "Commit", "oid": "c2"},
+                            }
+                        },
+                        "tag2": None,
+                    }
+                }
+            },
+        )
+
+        gh = github.GitHub("token")
+        shas = gh.get_tag_shas(
+            "googleapis/foo", ["foo/v1.0.0", "bar/v2.0.0", "baz/v3.0.0"]
+        )
+
+        assert shas == {"foo/v1.0.0": "c1", "bar/v2.0.0": "c2", "baz/v3.0.0": None}
+        assert m.call_count == 1
+        assert '"refs/tags/bar/v2.0.0"' in m.last_request.json()["query"]
@@ -0,0 +1,109 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import requests
+import requests_mock
+
+from releasetool import http_cache
+
+
+def _make_session(tmpdir, max_bytes=1024 * 1024):
+    transport = requests_mock.Adapter()
+    cache = http_cache.HttpCache(str(tmpdir), max_bytes=max_bytes)
+    session = requests.Session()
+    session.mount("https://", http_cache.CachingAdapter(cache, transport))
+    return session, transport
+
+
+def test_replays_cached_response_on_not_modified(tmpdir):
+    session, transport = _make_session(tmpdir)
+    url = "https://api.github.com/repos/googleapis/java-asset/languages"
+    transport.register_uri(
+        "GET",
+        url,
+        [
+            {"json": {"Java": 100}, "headers": {"ETag": '"abc"'}},
+            {"status_code": 304, "headers": {"X-RateLimit-Remaining": "4999"}},
+        ],
+    )
+
+    assert session.get(url).json() == {"Java": 100}
+    response = session.get(url)
+
+    assert response.status_code == 200
+    assert response.json() == {"Java": 100}
+    assert response.headers["X-RateLimit-Remaining"] == "4999"
+    assert "If-None-Match" not in transport.request_history[0].headers
+    assert transport.request_history[1].headers["If-None-Match"] == '"abc"'
+
+
+def test_does_not_cache_without_validators(tmpdir):
+    session, transport = _make_session(tmpdir)
+    url = "https://api.github.com/repos/googleapis/java-asset/pulls/1"
+    transport.register_uri("GET", url, json={"number": 1})
+
+    session.get(url)
+    session.get(url)
+
+    assert "If-None-Match" not in transport.request_history[1].headers
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_does_not_cache_other_methods(tmpdir):
+    session, transport = _make_session(tmpdir)
+    url = "https://api.github.com/repos/googleapis/java-asset/releases"
+    transport.register_uri("POST", url, json={}, headers={"ETag": '"abc"'})
+
+    session.post(url, json={})
+
+    assert os.listdir(str(tmpdir)) == []
+
+
+def test_evicts_least_recently_used(tmpdir):
+    session, transport = _make_session(tmpdir)
+    urls = [f"https://api.github.com/repos/googleapis/repo-{n}" for n in range(3)]
+    for n, url in enumerate(urls):
+        transport.register_uri("GET", url, json={}, headers={"ETag": f'"{n}"'})
+
+    session.get(urls[0])
+    # Every entry is the same size, so make room for two of them.
+    entry_size = os.path.getsize(os.path.join(str(tmpdir), os.listdir(str(tmpdir))[0]))
+    session.get_adapter(urls[0]).cache.max_bytes = entry_size * 2
+    session.get(urls[1])
+    # Use the first entry again so that the second one is the least recently
+    # used.
+    session.get(urls[0])
+    session.get(urls[2])
+
+    cache = http_cache.HttpCache(str(tmpdir))
+    remaining = set(os.listdir(str(tmpdir)))
+    assert len(remaining) == 2
+    assert f"{cache.key(transport.request_history[0])}.json" in remaining
+    assert f"{cache.key(transport.request_history[1])}.json" not in remaining
+
+
+def test_github_clients_use_cache_dir(tmpdir, monkeypatch):
+    from autorelease import github as autorelease_github
+    from releasetool import github as releasetool_github
+
+    gh = autorelease_github.GitHub("fake-token", cache_dir=str(tmpdir))
+    adapter = gh.session.get_adapter("https://api.github.com/repos")
+    assert isinstance(adapter, http_cache.CachingAdapter)
+
+    monkeypatch.setenv("RELEASETOOL_HTTP_CACHE_DIR", str(tmpdir))
+    gh = releasetool_github.GitHub("fake-token")
+    adapter = gh.session.get_adapter("https://api.github.com/repos")
+    assert isinstance(adapter, http_cache.CachingAdapter)
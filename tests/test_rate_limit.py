@@ -0,0 +1,143 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import requests
+import requests_mock
+
+from releasetool import rate_limit
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _make_session(clock, **kwargs):
+    transport = requests_mock.Adapter()
+    limiter = rate_limit.RateLimiter(clock=clock.time, sleep=clock.sleep, **kwargs)
+    session = requests.Session()
+    session.mount("https://", rate_limit.RateLimitAdapter(limiter, transport))
+    return session, transport, limiter
+
+
+def _headers(remaining, reset, limit=5000, resource="core"):
+    return {
+        "X-RateLimit-Limit": str(limit),
+        "X-RateLimit-Remaining": str(remaining),
+        "X-RateLimit-Reset": str(reset),
+        "X-RateLimit-Resource": resource,
+    }
+
+
+def test_retries_after_secondary_rate_limit():
+    clock = FakeClock()
+    session, transport, limiter = _make_session(clock)
+    url = "https://api.github.com/repos/googleapis/java-asset/pulls/1"
+    transport.register_uri(
+        "GET",
+        url,
+        [
+            {"status_code": 403, "headers": {"Retry-After": "30"}},
+            {"json": {"number": 1}},
+        ],
+    )
+
+    response = session.get(url)
+
+    assert response.json() == {"number": 1}
+    assert transport.call_count == 2
+    assert clock.sleeps == [30.0]
+    assert limiter.stats()["core"]["throttled"] == 1
+
+
+def test_does_not_retry_other_forbidden_responses():
+    clock = FakeClock()
+    session, transport, _ = _make_session(clock)
+    url = "https://api.github.com/repos/googleapis/java-asset/pulls/1"
+    transport.register_uri("GET", url, status_code=403, text="Resource not accessible")
+
+    assert session.get(url).status_code == 403
+    assert transport.call_count == 1
+    assert clock.sleeps == []
+
+
+def test_gives_up_after_max_retries():
+    clock = FakeClock()
+    session, transport, _ = _make_session(clock, max_retries=2)
+    url = "https://api.github.com/repos/googleapis/java-asset/pulls/1"
+    transport.register_uri(
+        "GET", url, status_code=429, headers={"Retry-After": "1"}, text="slow down"
+    )
+
+    assert session.get(url).status_code == 429
+    assert transport.call_count == 3
+
+
+def test_waits_for_reset_when_budget_is_exhausted():
+    clock = FakeClock()
+    session, transport, limiter = _make_session(clock)
+    url = "https://api.github.com/repos/googleapis/java-asset/languages"
+    transport.register_uri("GET", url, json={}, headers=_headers(0, 1100))
+
+    session.get(url)
+    assert limiter.stats()["core"]["remaining"] == 0
+    session.get(url)
+
+    assert clock.sleeps == [100.0]
+
+
+def test_spreads_out_the_last_of_the_budget():
+    clock = FakeClock()
+    session, transport, _ = _make_session(clock)
+    url = "https://api.github.com/repos/googleapis/java-asset/languages"
+    transport.register_uri("GET", url, json={}, headers=_headers(10, 1100))
+
+    session.get(url)
+    session.get(url)
+    session.get(url)
+
+    # 10 requests are left for the next 100 seconds.
+    assert clock.sleeps == [10.0]
+
+
+def test_search_has_its_own_budget():
+    clock = FakeClock()
+    session, transport, limiter = _make_session(clock)
+    search_url = "https://api.github.com/search/issues"
+    repo_url = "https://api.github.com/repos/googleapis/java-asset"
+    transport.register_uri(
+        "GET", search_url, json={}, headers=_headers(0, 1060, 30, "search")
+    )
+    transport.register_uri("GET", repo_url, json={}, headers=_headers(4000, 2000))
+
+    session.get(search_url)
+    session.get(repo_url)
+
+    stats = limiter.stats()
+    assert stats["search"]["remaining"] == 0
+    assert stats["core"]["remaining"] == 4000
+    assert clock.sleeps == []
+
+
+def test_for_token_shares_limiters():
+    assert rate_limit.for_token("a") is rate_limit.for_token("a")
+    assert rate_limit.for_token("a") is not rate_limit.for_token("b")
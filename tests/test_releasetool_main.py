@@ -0,0 +1,61 @@
+# Copyright 2026 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from click.testing import CliRunner
+
+from releasetool import __main__
+
+# Modules that are only needed once a command that uses them is dispatched.
+_LAZY_MODULES = [
+    "cryptography",
+    "dateutil",
+    "jwt",
+    "keyring",
+    "pyperclip",
+    "requests",
+    "releasetool.commands.publish_reporter",
+    "releasetool.commands.start.python",
+    "releasetool.commands.tag.python",
+    "releasetool.github",
+]
+
+
+def test_import_does_not_load_commands(imported_modules):
+    modules = imported_modules("import releasetool.__main__")
+
+    assert [name for name in _LAZY_MODULES if name in modules] == []
+
+
+def test_publish_reporter_script_stays_light(imported_modules):
+    modules = imported_modules(
+        "from releasetool.__main__ import main\n"
+        "try:\n"
+        "    main(['publish-reporter-script'])\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+
+    assert "releasetool.commands.publish_reporter" in modules
+    heavy_modules = ["jwt", "cryptography", "requests"]
+    assert [name for name in heavy_modules if name in modules] == []
+
+
+def test_tag_dispatches_to_language_module(monkeypatch):
+    calls = []
+    monkeypatch.setattr("releasetool.commands.tag.php.tag", lambda: calls.append("php"))
+
+    result = CliRunner().invoke(__main__.main, ["tag", "--language", "php"])
+
+    assert result.exit_code == 0, result.output
+    assert calls == ["php"]